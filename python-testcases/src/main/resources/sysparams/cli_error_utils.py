@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Parses the error output of the litp CLI, a path line followed
+            by the error lines of that path, into CliError records, and
+            indexes them by path and error type so that expected errors can
+            be matched in any order in one pass over the output.
+'''
+
+from collections import Counter, namedtuple
+import re
+
+CliError = namedtuple('CliError',
+                      ['path', 'error_type', 'property', 'message'])
+
+# Lines the CLI prints the model path of the following errors on
+PATH_LINE_RE = re.compile(r'^/\S*$')
+# e.g. 'ValidationError in property: "value"    Invalid value \'\'.'
+ERROR_LINE_RE = re.compile(
+    r'^(?P<error_type>\w+Error)'
+    r'(?: in property: "(?P<property>[^"]*)")?\s{2,}(?P<message>.*)$')
+
+
+def parse_error_line(line, path=None):
+    """
+    Description:
+        Parses a single error line.
+    Args:
+        line (str): error line, e.g.
+            'ValidationError    Create plan failed: Duplicate sysparam key'
+        path (str): path the error is reported on, if any
+    Returns:
+        CliError. error_type and property are None for a line that is not
+        a CLI error, its message is then the whole line
+    """
+    line = line.strip()
+    match = ERROR_LINE_RE.match(line)
+    if not match:
+        return CliError(path, None, None, line)
+    return CliError(path, match.group('error_type'),
+                    match.group('property'), match.group('message'))
+
+
+def parse_cli_errors(lines):
+    """
+    Description:
+        Parses the error output of a litp command.
+    Args:
+        lines (list): stderr lines
+    Returns:
+        list. CliError of each error line, in the order printed; path is
+        None for errors printed before any path line
+    """
+    errors = []
+    path = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if PATH_LINE_RE.match(line):
+            path = line
+        else:
+            errors.append(parse_error_line(line, path))
+    return errors
+
+
+class CliErrorIndex(object):
+    """
+    CliError records looked up by path and by (path, error type).
+    """
+
+    def __init__(self, errors):
+        """
+        Args:
+            errors (iterable): CliError records, see parse_cli_errors
+        """
+        self.errors = list(errors)
+        self._by_path = {}
+        self._by_type = {}
+        for error in self.errors:
+            self._by_path.setdefault(error.path, []).append(error)
+            self._by_type.setdefault((error.path, error.error_type),
+                                     []).append(error)
+
+    def __len__(self):
+        return len(self.errors)
+
+    def find(self, path, error_type=None):
+        """
+        Description:
+            Returns the errors reported on a path.
+        Args:
+            path (str): model path, None for errors printed without one
+            error_type (str): only errors of this type, e.g.
+                'ValidationError'
+        Returns:
+            list. CliError records, in the order printed
+        """
+        if error_type is None:
+            return list(self._by_path.get(path, []))
+        return list(self._by_type.get((path, error_type), []))
+
+    def paths(self, error_type=None):
+        """
+        Returns the paths with errors of error_type, or with any error.
+        """
+        if error_type is None:
+            return [path for path in self._by_path if path is not None]
+        return [path for path, type_ in self._by_type
+                if type_ == error_type and path is not None]
+
+    def unmatched(self, expected):
+        """
+        Description:
+            Matches expected errors against the reported ones, in any
+            order; each reported error matches at most one expected error.
+        Args:
+            expected (iterable): CliError records
+        Returns:
+            list. The expected errors that were not reported
+        """
+        remaining = Counter(self.errors)
+        missing = []
+        for error in expected:
+            if remaining[error] > 0:
+                remaining[error] -= 1
+            else:
+                missing.append(error)
+        return missing
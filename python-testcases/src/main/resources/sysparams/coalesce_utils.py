@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Coalesces the model changes of several positive scenarios into
+            as few plans as possible. Each scenario is a list of steps;
+            a step is the model changes to plan followed by the sysctl
+            and model checks to verify once the plan is done. Steps of
+            different scenarios share a plan unless they touch the same
+            item or the same key on the same node, in which case the
+            later scenario waits for the earlier one, and the checks of a
+            shared plan are attributed back to the scenario that owns the
+            key.
+'''
+
+from collections import namedtuple
+
+from sysctl_utils import to_dotted_key
+
+# action is CREATE, UPDATE or REMOVE; props is a dict of the sysparam
+# properties, e.g. {'key': 'kernel.msgmnb', 'value': '65535'}
+ModelChange = namedtuple('ModelChange', ['action', 'node', 'sysparam_config',
+                                         'item_id', 'props'])
+CREATE = 'create'
+UPDATE = 'update'
+REMOVE = 'remove'
+
+# Expects node to have a sysparam with key in the model, with value; value
+# None expects no sysparam with the key
+ModelCheck = namedtuple('ModelCheck', ['node', 'key', 'value'])
+
+# checks are sysctl_utils.SysctlCheck tuples, model_checks ModelCheck tuples
+CoalescedStep = namedtuple('CoalescedStep', ['owner', 'changes', 'checks',
+                                             'model_checks'])
+
+
+def step_claims(step):
+    """
+    Description:
+        Returns what a step touches: the sysparam items it changes and
+        the (node, dotted key) pairs it changes or checks.
+    Args:
+        step (CoalescedStep): the step
+    Returns:
+        set. ('item', path) and ('key', node, dotted key) tuples
+    """
+    claims = set()
+    for change in step.changes:
+        claims.add(('item', '{0}/params/{1}'.format(change.sysparam_config,
+                                                    change.item_id)))
+        if change.props.get('key'):
+            claims.add(('key', change.node,
+                        to_dotted_key(change.props['key'])))
+    for check in list(step.checks) + list(step.model_checks):
+        claims.add(('key', check.node, to_dotted_key(check.key)))
+    return claims
+
+
+class PlanCoalescer(object):
+    """
+    Groups the steps of several scenarios into batches, each applied with
+    a single plan.
+    """
+
+    def __init__(self):
+        self.steps = []
+
+    def add(self, owner, changes, checks, model_checks=()):
+        """
+        Description:
+            Adds the next step of a scenario. Steps of one owner always
+            go to successive batches, in the order they were added.
+        Args:
+            owner (str): name of the scenario the step belongs to
+            changes (list): ModelChange tuples to plan
+            checks (list): SysctlCheck tuples to verify after the plan
+            model_checks (list): ModelCheck tuples to verify after the
+                plan
+        """
+        self.steps.append(CoalescedStep(owner, list(changes), list(checks),
+                                        list(model_checks)))
+
+    def batches(self):
+        """
+        Description:
+            Places the steps of each scenario, in the order the scenarios
+            were first added, each in the earliest batch after the
+            previous step of its owner that no other step of the batch
+            conflicts with. A scenario that touches an item or key an
+            earlier scenario touches only starts once that scenario is
+            done, as the earlier items stay in the model until then.
+        Returns:
+            list. Lists of CoalescedStep, in the order to plan them
+        """
+        owners = []
+        lifetime_claims = {}
+        for step in self.steps:
+            if step.owner not in lifetime_claims:
+                owners.append(step.owner)
+                lifetime_claims[step.owner] = set()
+            lifetime_claims[step.owner] |= step_claims(step)
+        batches = []
+        batch_claims = []
+        last_batch = {}
+        for owner in owners:
+            index = max([last_batch[other] + 1 for other in last_batch
+                         if lifetime_claims[owner] &
+                         lifetime_claims[other]] + [0])
+            for step in self.steps:
+                if step.owner != owner:
+                    continue
+                claims = step_claims(step)
+                while index < len(batches) and claims & batch_claims[index]:
+                    index += 1
+                if index == len(batches):
+                    batches.append([])
+                    batch_claims.append(set())
+                batches[index].append(step)
+                batch_claims[index] |= claims
+                last_batch[owner] = index
+                index += 1
+        return batches
+
+    @staticmethod
+    def attribute(batch, results):
+        """
+        Description:
+            Attributes the failed checks of a batch to the owner of each
+            key.
+        Args:
+            batch (list): CoalescedStep of the batch
+            results (list): sysctl_utils.CheckResult of the checks of the
+                batch, in step and check order
+        Returns:
+            dict. owner -> failed CheckResults, only owners with failures
+        """
+        owners = {}
+        for step in batch:
+            for check in step.checks:
+                owners[(check.node, to_dotted_key(check.key))] = step.owner
+        failures = {}
+        for result in results:
+            if not result.passed:
+                owner = owners[(result.node, to_dotted_key(result.key))]
+                failures.setdefault(owner, []).append(result)
+        return failures
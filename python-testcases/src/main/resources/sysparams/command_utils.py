@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Runs several commands on a node in one round trip. A
+            CommandBatch wraps the commands, e.g. those RHCmdUtils builds,
+            in a one-line shell script that prints the stdout, stderr and
+            return code of each command between marker lines, and splits
+            that output back into one (stdout, stderr, rc) per command.
+'''
+
+from collections import namedtuple
+from pipes import quote
+import re
+import uuid
+
+# Unpacks like the (stdout, stderr, rc) tuple run_command returns
+CommandResult = namedtuple('CommandResult', ['stdout', 'stderr', 'rc'])
+
+# Per-command step of a batch script, unicode for non-ASCII commands
+COMMAND_STEP = (u'( {cmd} ) >"$B/out" 2>"$B/err"; '
+                'echo "{marker} {index} $?"; awk 1 "$B/out"; '
+                'echo "{marker} {index} stderr"; awk 1 "$B/err"')
+COMMAND_STEP_RE = re.compile(
+    r'(?:^|(?<=; ))\( (?P<cmd>.*?) \) >"\$B/out" 2>"\$B/err"; '
+    r'echo "(?P<marker>\S+) (?P<index>\d+) \$\?"; ')
+
+# Steps of a parallel batch script: every command is started in the
+# background, and once all are done their outputs are printed in order
+PARALLEL_COMMAND_STEP = (u'{{ ( {cmd} ) >"$B/{index}.out" '
+                         '2>"$B/{index}.err"; echo $? >"$B/{index}.rc"; }} &')
+PARALLEL_OUTPUT_STEP = ('echo "{marker} {index} $(cat "$B/{index}.rc")"; '
+                        'awk 1 "$B/{index}.out"; '
+                        'echo "{marker} {index} stderr"; '
+                        'awk 1 "$B/{index}.err"')
+PARALLEL_COMMAND_STEP_RE = re.compile(
+    r'(?:^|(?<=[;&] ))\{ \( (?P<cmd>.*?) \) >"\$B/(?P<index>\d+)\.out" '
+    r'2>"\$B/(?P=index)\.err"; echo \$\? >"\$B/(?P=index)\.rc"; \} &')
+PARALLEL_OUTPUT_STEP_RE = re.compile(
+    r'(?:^|(?<=; ))echo "(?P<marker>\S+) \d+ \$\(cat ')
+
+
+def _join_steps(steps):
+    """
+    Joins the steps of a script into a single line: su_root runs it in
+    an interactive shell, where a newline would get a continuation
+    prompt into the output.
+    """
+    line = ''
+    for step in steps:
+        if line:
+            line += ' ' if line.endswith('&') else '; '
+        line += step
+    return line
+
+
+class CommandBatch(object):
+    """
+    Commands to run on one node with a single run_command. Every command
+    runs in a subshell of its own, whether or not the others failed:
+    in order, or all at the same time for a parallel batch.
+    """
+
+    def __init__(self, marker=None, parallel=False):
+        """
+        Args:
+            marker (str): prefix of the marker lines, unique per batch by
+                default so it cannot clash with the output of a command
+            parallel (bool): run the commands concurrently; their outputs
+                are still returned in the order the commands were added
+        """
+        self.marker = marker or '@@sysparams-batch-' + uuid.uuid4().hex[:12]
+        self.parallel = parallel
+        self.commands = []
+
+    def __len__(self):
+        return len(self.commands)
+
+    def add(self, cmd):
+        """
+        Description:
+            Adds a command to the batch.
+        Args:
+            cmd (str): command line, on a single line
+        Returns:
+            int. Position of the command's result in parse()
+        Raises:
+            ValueError if cmd spans several lines
+        """
+        if '\n' in cmd or '\r' in cmd:
+            raise ValueError('Batched commands must be single lines: ' +
+                             repr(cmd))
+        self.commands.append(cmd)
+        return len(self.commands) - 1
+
+    def script(self):
+        """
+        Returns the shell script that runs the commands, on a single line.
+        """
+        steps = ['B=$(mktemp -d) || exit 1']
+        if self.parallel:
+            steps.extend(PARALLEL_COMMAND_STEP.format(cmd=cmd, index=index)
+                         for index, cmd in enumerate(self.commands))
+            steps.append('wait')
+            steps.extend(PARALLEL_OUTPUT_STEP.format(marker=self.marker,
+                                                     index=index)
+                         for index in range(len(self.commands)))
+        else:
+            steps.extend(COMMAND_STEP.format(cmd=cmd, marker=self.marker,
+                                             index=index)
+                         for index, cmd in enumerate(self.commands))
+        steps.append('rm -rf "$B"')
+        return _join_steps(steps)
+
+    def command(self):
+        """
+        Returns the command line that runs the script, for run_command.
+        """
+        return '/bin/sh -c ' + quote(self.script())
+
+    def parse(self, stdout):
+        """
+        Description:
+            Splits the output of the script into the output of each
+            command.
+        Args:
+            stdout (list): stdout lines of the script
+        Returns:
+            list. CommandResult of each command, in the order added
+        Raises:
+            ValueError if the output of a command is missing
+        """
+        return parse_batch_output(self.marker, len(self.commands), stdout)
+
+
+def parse_batch_output(marker, count, stdout):
+    """
+    Description:
+        Splits the output of a batch script into the output of each
+        command.
+    Args:
+        marker (str): prefix of the marker lines
+        count (int): number of commands in the batch
+        stdout (list): stdout lines of the script
+    Returns:
+        list. CommandResult of each command
+    Raises:
+        ValueError if the output of a command is missing
+    """
+    results = []
+    prefix = marker + ' '
+    out, err, rc, target = None, None, None, None
+    for line in stdout:
+        if not line.startswith(prefix):
+            if target is None:
+                raise ValueError('Output before the first command of the '
+                                 'batch: ' + line)
+            target.append(line)
+            continue
+        index, what = line[len(prefix):].split(' ', 1)
+        if what == 'stderr':
+            target = err
+            continue
+        if out is not None:
+            results.append(CommandResult(out, err, rc))
+            out = None
+        if int(index) != len(results):
+            break
+        out, err, rc = [], [], int(what)
+        target = out
+    if out is not None:
+        results.append(CommandResult(out, err, rc))
+    if len(results) != count:
+        raise ValueError('Output of command {0} of the batch is '
+                         'missing'.format(len(results)))
+    return results
+
+
+def split_batch_script(script):
+    """
+    Description:
+        Reads the commands back from a batch script, e.g. for a simulated
+        node to run them.
+    Args:
+        script (str): script made by CommandBatch.script
+    Returns:
+        tuple. (marker, list of commands), or None if script is not a
+        batch script
+    """
+    if '\n' in script:
+        return None
+    if PARALLEL_OUTPUT_STEP_RE.search(script):
+        commands = [match.group('cmd') for match
+                    in PARALLEL_COMMAND_STEP_RE.finditer(script)]
+        marker = PARALLEL_OUTPUT_STEP_RE.search(script).group('marker')
+        return marker, commands
+    matches = list(COMMAND_STEP_RE.finditer(script))
+    if not matches:
+        return None
+    return (matches[0].group('marker'),
+            [match.group('cmd') for match in matches])
+
+
+def format_batch_output(marker, results):
+    """
+    Description:
+        Prints the results of a batch the way its script does.
+    Args:
+        marker (str): prefix of the marker lines
+        results (list): (stdout, stderr, rc) of each command
+    Returns:
+        list. The stdout lines of the script
+    """
+    lines = []
+    for index, (stdout, stderr, rc) in enumerate(results):
+        lines.append('{0} {1} {2}'.format(marker, index, rc))
+        lines.extend(stdout)
+        lines.append('{0} {1} stderr'.format(marker, index))
+        lines.extend(stderr)
+    return lines
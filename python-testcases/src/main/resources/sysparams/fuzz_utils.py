@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Generates sysparam property sets around the validation
+            boundaries of the sysparam item type: separators, unicode,
+            very long values, slash and dot keys, whitespace, missing and
+            extra properties. A case the MS and sysparam_validator
+            disagree on is shrunk to a minimal reproducer.
+'''
+
+from collections import namedtuple
+from pipes import quote
+import random
+
+# Parts keys are built from
+KEY_WORDS = ('kernel', 'net', 'ipv4', 'conf', 'fs', 'vm', 'sem', 'x', '0',
+             'tcp_rmem', 'file-max')
+KEY_SEPARATORS = ('.', '/')
+
+# Characters the key or value property types may treat specially
+BOUNDARY_CHARS = (',', '=', ' ', '\t', '.', '/', '-', '_', ':', '"', "'",
+                  '\\', '$', ';', '*', '#', u'é', u'ß', u'☃',
+                  u'中', u' ')
+
+VALUE_TOKENS = ('0', '1', '65535', '-1', '4096 87380 4194304', 'abc',
+                '/var/coredumps/core.%h.%e.pid%p')
+
+# Lengths of the very long values
+LONG_VALUE_LENGTHS = (255, 256, 1024, 4096, 10000)
+
+
+class FuzzCase(namedtuple('FuzzCase', ['key', 'value', 'extra'])):
+    """
+    A sysparam property set; key or value is None when the property is
+    left out, extra holds (name, value) pairs of other properties.
+    """
+    __slots__ = ()
+
+    def properties(self):
+        """
+        Returns the properties as a list of (name, value) pairs.
+        """
+        props = []
+        if self.key is not None:
+            props.append(('key', self.key))
+        if self.value is not None:
+            props.append(('value', self.value))
+        props.extend(self.extra)
+        return props
+
+    def cli_props(self):
+        """
+        Returns the properties as "litp create -o" arguments, each quoted
+        for the shell.
+        """
+        return ' '.join(quote(u'{0}={1}'.format(name, value))
+                        for name, value in self.properties())
+
+
+def _random_text(rng, length):
+    """
+    Returns length characters of mostly digits and letters.
+    """
+    return u''.join(rng.choice(u'0123456789abcdefghijklmnopqrstuvwxyz')
+                    for _ in range(length))
+
+
+def _sprinkle(rng, text):
+    """
+    Inserts a boundary character at a random position of text.
+    """
+    position = rng.randint(0, len(text))
+    return text[:position] + rng.choice(BOUNDARY_CHARS) + text[position:]
+
+
+def generate_key(rng):
+    """
+    Returns a random key, valid or not.
+    """
+    kind = rng.random()
+    if kind < 0.05:
+        return u''
+    words = [rng.choice(KEY_WORDS) for _ in range(rng.randint(1, 5))]
+    separator = rng.choice(KEY_SEPARATORS)
+    key = u''
+    for word in words:
+        if key:
+            # Keys mixing dots and slashes
+            key += separator if rng.random() < 0.9 else \
+                rng.choice(KEY_SEPARATORS)
+        key += word
+    if kind < 0.5:
+        key = _sprinkle(rng, key)
+    elif kind < 0.6:
+        key = rng.choice((u' ', u'\t')) + key + rng.choice((u'', u' '))
+    elif kind < 0.65:
+        key = _random_text(rng, rng.choice(LONG_VALUE_LENGTHS))
+    return key
+
+
+def generate_value(rng):
+    """
+    Returns a random value, valid or not.
+    """
+    kind = rng.random()
+    if kind < 0.05:
+        return u''
+    if kind < 0.15:
+        return _random_text(rng, rng.choice(LONG_VALUE_LENGTHS))
+    if kind < 0.25:
+        return rng.choice((u' ', u'\t', u'  '))
+    value = rng.choice(VALUE_TOKENS)
+    if kind < 0.6:
+        value = _sprinkle(rng, value)
+    elif kind < 0.7:
+        value = rng.choice((u' ', u'\t')) + value + rng.choice((u'', u' '))
+    return value
+
+
+def generate_cases(count, seed=0):
+    """
+    Description:
+        Generates random sysparam property sets, lazily.
+    Args:
+        count (int): number of cases
+        seed (int): seed; the same seed gives the same cases on the same
+            Python version
+    Returns:
+        generator. FuzzCase tuples
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        key = generate_key(rng)
+        value = generate_value(rng)
+        extra = ()
+        kind = rng.random()
+        if kind < 0.05:
+            key = None
+        elif kind < 0.1:
+            value = None
+        elif kind < 0.15:
+            extra = ((rng.choice((u'name', u'Key', u'values', u'')),
+                      _random_text(rng, 4)),)
+        yield FuzzCase(key, value, extra)
+
+
+def shrink_candidates(case):
+    """
+    Description:
+        Returns the cases one step simpler than case: without a
+        property, with half a key or value, with a character less, or with a
+        character replaced by a plain letter.
+    Args:
+        case (FuzzCase): case to simplify
+    Returns:
+        list. Simpler FuzzCase tuples, the simplest first
+    """
+    candidates = []
+    if case.extra:
+        candidates.append(case._replace(extra=()))
+    candidates.extend(case._replace(**{field: None})
+                      for field in ('key', 'value')
+                      if getattr(case, field) is not None)
+    for field in ('key', 'value'):
+        text = getattr(case, field)
+        if not text:
+            continue
+        half = len(text) // 2
+        if half:
+            candidates.append(case._replace(**{field: text[:half]}))
+            candidates.append(case._replace(**{field: text[half:]}))
+        if len(text) <= 16:
+            candidates.extend(
+                case._replace(**{field: text[:index] + text[index + 1:]})
+                for index in range(len(text)))
+            candidates.extend(
+                case._replace(**{field: text[:index] + u'a' +
+                                 text[index + 1:]})
+                for index, char in enumerate(text)
+                if not char.isalnum() or ord(char) > 127)
+    seen = set()
+    unique = []
+    for candidate in candidates:
+        if candidate != case and candidate not in seen:
+            seen.add(candidate)
+            unique.append(candidate)
+    return unique
+
+
+def shrink(case, first_failing, max_rounds=20):
+    """
+    Description:
+        Shrinks a failing case, one step at a time, to a case no simpler
+        variant of which fails.
+    Args:
+        case (FuzzCase): failing case
+        first_failing (callable): called with a list of candidate cases,
+            returns the index of the first one that still fails or None;
+            all candidates of a round can be tried in one batch
+        max_rounds (int): most shrinking steps to take
+    Returns:
+        tuple. (smallest failing case found, rounds taken)
+    """
+    for rounds in range(max_rounds):
+        candidates = shrink_candidates(case)
+        index = first_failing(candidates) if candidates else None
+        if index is None:
+            return case, rounds
+        case = candidates[index]
+    return case, max_rounds
@@ -0,0 +1,820 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   In-process stand-in for a LITP management server, so that the
+            sysparams testsets can be run without a deployment.
+            FakeLitpModel models the /deployments tree, item states and
+            the create_plan validations of the sysparams plugin.
+            OfflineGenericTest serves the GenericTest methods used by the
+            testsets from it, and the node commands from one
+            SimulatedNode per managed node.
+            Run a testset offline with:
+                python offline_litp.py testset_story2327_5774 [-v]
+'''
+
+from collections import OrderedDict
+import atexit
+import logging
+import sys
+import unittest
+import xml.etree.ElementTree as ET
+from nose.plugins.attrib import attr
+from command_utils import format_batch_output, split_batch_script
+from offline_node import SimulatedNode, split_words
+from pipes import quote
+from sysparam_xml_utils import LITP_NS, XSI_NS, SCHEMA_LOCATION, \
+    parse_cli_props
+import sysparam_validator
+import test_constants
+
+INITIAL = 'Initial'
+UPDATED = 'Updated'
+APPLIED = 'Applied'
+FOR_REMOVAL = 'ForRemoval'
+
+# Properties of the item types that carry any
+ITEM_PROPERTIES = {
+    'node': ('hostname',),
+    'sysparam': ('key', 'value'),
+}
+
+# Item types of the collections that can be created by "litp load"
+COLLECTION_TYPES = {
+    'configs': 'collection-of-node-config',
+    'params': 'collection-of-sysparam',
+}
+
+
+class LitpItem(object):
+    """
+    An item of the model tree.
+    """
+
+    def __init__(self, path, item_type, properties=None, state=INITIAL):
+        self.path = path
+        self.item_type = item_type
+        self.properties = dict(properties or {})
+        self.applied_properties = {}
+        self.state = state
+
+    @property
+    def item_id(self):
+        """
+        The last element of the item path.
+        """
+        return self.path.rsplit('/', 1)[1]
+
+
+class FakeLitpModel(object):
+    """
+    Model of a deployment with one cluster of nodes, each with a
+    sysparam-node-config, and of the plan lifecycle.
+    """
+
+    def __init__(self, nodes=('node1', 'node2')):
+        """
+        Args:
+            nodes (tuple): hostnames of the managed nodes
+        """
+        self.items = OrderedDict()
+        self.plan = None
+        self.files = {}
+        self._add('/deployments', 'collection-of-deployment', APPLIED)
+        self._add('/deployments/d1', 'deployment', APPLIED)
+        self._add('/deployments/d1/clusters', 'collection-of-cluster',
+                  APPLIED)
+        self._add('/deployments/d1/clusters/c1', 'cluster', APPLIED)
+        self._add('/deployments/d1/clusters/c1/nodes', 'collection-of-node',
+                  APPLIED)
+        for index, hostname in enumerate(nodes):
+            node_url = '/deployments/d1/clusters/c1/nodes/n{0}'.format(
+                index + 1)
+            self._add(node_url, 'node', APPLIED, {'hostname': hostname})
+            self._add(node_url + '/configs', 'collection-of-node-config',
+                      APPLIED)
+            self._add(node_url + '/configs/sysctl', 'sysparam-node-config',
+                      APPLIED)
+            self._add(node_url + '/configs/sysctl/params',
+                      'collection-of-sysparam', APPLIED)
+
+    def _add(self, path, item_type, state=INITIAL, properties=None):
+        """
+        Adds an item to the tree.
+        """
+        item = LitpItem(path, item_type, properties, state)
+        if state == APPLIED:
+            item.applied_properties = dict(item.properties)
+        self.items[path] = item
+        return item
+
+    def _children(self, path):
+        """
+        Returns the items directly below path.
+        """
+        return [item for item in self.items.values()
+                if item.path.rsplit('/', 1)[0] == path]
+
+    def _descendants(self, path):
+        """
+        Returns the items below path, path itself excluded.
+        """
+        return [item for item in self.items.values()
+                if item.path.startswith(path + '/')]
+
+    def _delete(self, path):
+        """
+        Deletes an item and everything below it.
+        """
+        for item in self._descendants(path) + [self.items[path]]:
+            del self.items[item.path]
+
+    def node_of(self, path):
+        """
+        Returns the hostname of the node that path belongs to, or None.
+        """
+        for item in self.items.values():
+            if item.item_type == 'node' and \
+                    (path == item.path or path.startswith(item.path + '/')):
+                return item.properties['hostname']
+        return None
+
+    @staticmethod
+    def parse_properties(props):
+        """
+        Description:
+            Parses CLI properties, e.g. 'key="a b" value=1'.
+        Args:
+            props (str): properties as passed to litp create/update -o
+        Returns:
+            OrderedDict. property name -> value
+        """
+        return parse_cli_props(props)
+
+    @staticmethod
+    def validate_properties(item_type, properties):
+        """
+        Description:
+            Validates the properties of an item.
+        Args:
+            item_type (str): item type
+            properties (dict): property name -> value
+        Returns:
+            list. CLI error lines, empty when the properties are valid
+        """
+        return sysparam_validator.validate_properties(
+            properties, item_type, ITEM_PROPERTIES.get(item_type, ()))
+
+    def find(self, path, item_type, rtn_type_children=True):
+        """
+        Description:
+            Finds the items of a type below path.
+        Args:
+            path (str): where to search from
+            item_type (str): item type searched for
+            rtn_type_children (bool): return the items when True, the
+                collections holding them when False
+        Returns:
+            list. Item paths
+        """
+        if not rtn_type_children:
+            item_type = 'collection-of-' + item_type
+        return [item.path for item in self._descendants(path)
+                if item.item_type == item_type]
+
+    def create(self, path, item_type, props=''):
+        """
+        Description:
+            Runs "litp create".
+        Returns:
+            list. CLI error lines, empty on success
+        """
+        parent = path.rsplit('/', 1)[0]
+        if parent not in self.items:
+            return [parent, 'InvalidLocationError    Path not found']
+        properties = self.parse_properties(props)
+        errors = self.validate_properties(item_type, properties)
+        if errors:
+            return errors
+        existing = self.items.get(path)
+        if existing is not None:
+            if existing.state != FOR_REMOVAL:
+                return [path, 'ItemExistsError    Item {0} already exists'
+                        .format(existing.item_id)]
+            existing.properties = dict(properties)
+            self._refresh_state(existing)
+            return []
+        self._add(path, item_type, INITIAL, properties)
+        return []
+
+    def update(self, path, props, action_del=False):
+        """
+        Description:
+            Runs "litp update", deleting properties when action_del.
+        Returns:
+            list. CLI error lines, empty on success
+        """
+        item = self.items.get(path)
+        if item is None:
+            return [path, 'InvalidLocationError    Path not found']
+        properties, errors = sysparam_validator.validate_update(
+            item.properties, props, action_del, item.item_type,
+            ITEM_PROPERTIES.get(item.item_type, ()))
+        if errors:
+            return errors
+        item.properties = properties
+        self._refresh_state(item)
+        return []
+
+    @staticmethod
+    def _refresh_state(item):
+        """
+        Sets the state of an item after its properties changed.
+        """
+        if item.state == INITIAL:
+            return
+        if item.properties == item.applied_properties:
+            item.state = APPLIED
+        else:
+            item.state = UPDATED
+
+    def remove(self, path):
+        """
+        Description:
+            Runs "litp remove".
+        Returns:
+            list. CLI error lines, empty on success
+        """
+        if path not in self.items:
+            return [path, 'InvalidLocationError    Path not found']
+        for item in [self.items[path]] + self._descendants(path):
+            if item.path not in self.items:
+                continue
+            if item.state == INITIAL:
+                self._delete(item.path)
+            else:
+                item.state = FOR_REMOVAL
+        return []
+
+    def show(self, path, name):
+        """
+        Description:
+            Returns a property of an item, or its state for "state".
+        """
+        item = self.items[path]
+        if name == 'state':
+            return item.state
+        return item.properties.get(name)
+
+    def is_all_applied(self):
+        """
+        Returns True if every item is Applied.
+        """
+        return all(item.state == APPLIED for item in self.items.values())
+
+    def _pending(self):
+        """
+        Returns the items the next plan has to act on.
+        """
+        return [item for item in self.items.values()
+                if item.state in (INITIAL, UPDATED, FOR_REMOVAL)]
+
+    def validate_plan(self):
+        """
+        Description:
+            Runs the create_plan validations of the sysparams plugin.
+        Returns:
+            list. CLI error lines, a path followed by its message
+        """
+        errors = []
+        for config in self.find('/deployments', 'sysparam-node-config'):
+            errors.extend(sysparam_validator.validate_plan_params(
+                (item.path, item.properties['key'],
+                 item.applied_properties.get('key'))
+                for item in self._descendants(config)
+                if item.item_type == 'sysparam' and
+                item.state != FOR_REMOVAL))
+        return errors
+
+    def create_plan(self):
+        """
+        Description:
+            Runs "litp create_plan".
+        Returns:
+            list. CLI error lines, empty on success
+        """
+        errors = self.validate_plan()
+        if errors:
+            return errors
+        pending = self._pending()
+        if not pending:
+            return ['DoNothingPlanError    Create plan failed: '
+                    'no tasks were generated']
+        self.plan = {'state': test_constants.PLAN_NOT_RUNNING,
+                     'items': [item.path for item in pending],
+                     'tasks': len(pending), 'success': 0}
+        return []
+
+    def run_plan(self, executor=None):
+        """
+        Description:
+            Runs "litp run_plan". The plan is run to its end before this
+            returns.
+        Args:
+            executor (callable): called as executor(hostname, apply,
+                remove) for every node the plan changes, where apply maps
+                key -> value and remove lists keys; returns False if the
+                node failed to apply them
+        Returns:
+            list. CLI error lines, empty on success
+        """
+        if self.plan is None:
+            return ['InvalidRequestError    Plan does not exist']
+        by_node = OrderedDict()
+        for path in self.plan['items']:
+            item = self.items.get(path)
+            if item is None or item.item_type != 'sysparam':
+                continue
+            by_node.setdefault(self.node_of(path), []).append(item)
+
+        failed = False
+        for hostname, items in by_node.items():
+            apply_keys = OrderedDict(
+                (item.properties['key'], item.properties['value'])
+                for item in items if item.state != FOR_REMOVAL)
+            remove_keys = [item.applied_properties['key']
+                           for item in items if item.state == FOR_REMOVAL]
+            if executor is not None and \
+                    not executor(hostname, apply_keys, remove_keys):
+                failed = True
+                continue
+            for item in items:
+                self._applied(item)
+                self.plan['success'] += 1
+        for path in self.plan['items']:
+            item = self.items.get(path)
+            if item is not None and item.item_type != 'sysparam':
+                self._applied(item)
+                self.plan['success'] += 1
+        self.plan['state'] = test_constants.PLAN_FAILED if failed \
+            else test_constants.PLAN_COMPLETE
+        return []
+
+    def _applied(self, item):
+        """
+        Moves an item to the state it has after a successful task.
+        """
+        if item.state == FOR_REMOVAL:
+            self._delete(item.path)
+        else:
+            item.state = APPLIED
+            item.applied_properties = dict(item.properties)
+
+    def remove_plan(self):
+        """
+        Runs "litp remove_plan".
+        """
+        self.plan = None
+        return []
+
+    def plan_state(self):
+        """
+        Returns the test_constants state of the plan.
+        """
+        if self.plan is None:
+            return test_constants.PLAN_NOT_RUNNING
+        return self.plan['state']
+
+    def show_plan(self):
+        """
+        Returns the summary lines of "litp show_plan".
+        """
+        if self.plan is None:
+            return []
+        status = {test_constants.PLAN_COMPLETE: 'Successful',
+                  test_constants.PLAN_FAILED: 'Failed'}.get(
+                      self.plan['state'], 'Initial')
+        failed = self.plan['tasks'] - self.plan['success'] \
+            if status == 'Failed' else 0
+        return ['Tasks: {0} | Initial: {1} | Running: 0 | Success: {2} | '
+                'Failed: {3} | Stopped: 0'.format(
+                    self.plan['tasks'],
+                    self.plan['tasks'] - self.plan['success'] - failed,
+                    self.plan['success'], failed),
+                'Plan Status: {0}'.format(status)]
+
+    def export(self, path, filename):
+        """
+        Description:
+            Runs "litp export", keeping the XML in the MS file store.
+        Returns:
+            list. CLI error lines, empty on success
+        """
+        if path not in self.items:
+            return [path, 'InvalidLocationError    Path not found']
+        ET.register_namespace('litp', LITP_NS)
+        ET.register_namespace('xsi', XSI_NS)
+        root = self._to_element(self.items[path], None)
+        root.set('{%s}schemaLocation' % XSI_NS, SCHEMA_LOCATION)
+        self.files[filename] = ET.tostring(root)
+        return []
+
+    def _to_element(self, item, parent_type):
+        """
+        Builds the XML element of an item and its children.
+        """
+        tag = item.item_type
+        if tag.startswith('collection-of-'):
+            tag = '{0}-{1}-collection'.format(parent_type or 'root',
+                                              item.item_id)
+        element = ET.Element('{%s}%s' % (LITP_NS, tag), id=item.item_id)
+        for name in ITEM_PROPERTIES.get(item.item_type, ()):
+            if name in item.properties:
+                ET.SubElement(element, name).text = item.properties[name]
+        for child in self._children(item.path):
+            if child.state != FOR_REMOVAL:
+                element.append(self._to_element(child, item.item_type))
+        return element
+
+    def load(self, path, filename, args=''):
+        """
+        Description:
+            Runs "litp load" of a file from the MS file store into path.
+        Args:
+            path (str): parent of the item in the file
+            filename (str): file to load
+            args (str): "--merge", "--replace" or ""
+        Returns:
+            list. CLI error lines, empty on success
+        """
+        if path not in self.items:
+            return [path, 'InvalidLocationError    Path not found']
+        if filename not in self.files:
+            return ['InvalidRequestError    File {0} not found'.format(
+                filename)]
+        root = ET.fromstring(self.files[filename])
+        return self._load_element(path, root, args)
+
+    def _load_element(self, parent, element, args):
+        """
+        Loads an element, and the elements below it, under parent.
+        """
+        tag = element.tag.split('}', 1)[-1]
+        path = '{0}/{1}'.format(parent, element.get('id'))
+        if tag.endswith('-collection'):
+            item_type = self.items[path].item_type if path in self.items \
+                else COLLECTION_TYPES[element.get('id')]
+        else:
+            item_type = tag
+        properties = OrderedDict((child.tag, child.text or '')
+                                 for child in element
+                                 if not child.tag.startswith('{'))
+        existing = self.items.get(path)
+        if existing is None:
+            self._add(path, item_type, INITIAL, properties)
+        elif not args and existing.state != FOR_REMOVAL:
+            return [path, 'ItemExistsError    Item {0} already exists'
+                    .format(existing.item_id)]
+        else:
+            if properties or item_type in ITEM_PROPERTIES:
+                existing.properties = dict(properties)
+            if existing.state == FOR_REMOVAL:
+                existing.state = UPDATED
+            self._refresh_state(existing)
+
+        loaded = []
+        for child in element:
+            if child.tag.startswith('{'):
+                errors = self._load_element(path, child, args)
+                if errors:
+                    return errors
+                loaded.append('{0}/{1}'.format(path, child.get('id')))
+        if args == '--replace':
+            for child in self._children(path):
+                if child.path not in loaded and child.path in self.items:
+                    self.remove(child.path)
+        return []
+
+
+class OfflineGenericTest(unittest.TestCase):
+    """
+    Stand-in for GenericTest serving the model and plan methods used by
+    the sysparams testsets from a FakeLitpModel shared by the session.
+    """
+
+    ms_node = 'ms1'
+    managed_nodes = ('node1', 'node2')
+    model = None
+    nodes = None
+
+    def setUp(self):
+        if OfflineGenericTest.model is None:
+            OfflineGenericTest.model = FakeLitpModel(self.managed_nodes)
+            OfflineGenericTest.nodes = dict(
+                (node, SimulatedNode(node)) for node in self.managed_nodes)
+            for node in OfflineGenericTest.nodes.values():
+                atexit.register(node.cleanup)
+        self.logger = logging.getLogger(self.id())
+        self.created_items = []
+
+    def tearDown(self):
+        """
+        Removes the items the test created, as GenericTest does, running
+        a plan if any of them had been applied.
+        """
+        self.model.remove_plan()
+        for url in reversed(self.created_items):
+            if url in self.model.items:
+                self.model.remove(url)
+        if self.model.create_plan() == []:
+            self.model.run_plan(self._apply_on_node)
+        self.model.remove_plan()
+
+    def log(self, level, msg):
+        """
+        Logs msg at level, e.g. "info".
+        """
+        getattr(self.logger, level)(msg)
+
+    def _cli_result(self, errors, expect_positive):
+        """
+        Turns the error lines of a model call into a CLI result.
+        """
+        rc = 1 if errors else 0
+        if expect_positive:
+            self.assertEqual([], errors)
+        else:
+            self.assertNotEqual([], errors)
+        return [], errors, rc
+
+    def get_management_node_filename(self):
+        """
+        Returns the filename of the MS.
+        """
+        return self.ms_node
+
+    def get_managed_node_filenames(self):
+        """
+        Returns the filenames of the managed nodes.
+        """
+        return list(self.managed_nodes)
+
+    def get_node_filename_from_url(self, _, url):
+        """
+        Returns the filename of the node that url belongs to.
+        """
+        return self.model.node_of(url)
+
+    def find(self, _, path, resource, rtn_type_children=True,
+             assert_not_empty=True):
+        """
+        Runs "litp find" style lookups on the model.
+        """
+        paths = self.model.find(path, resource, rtn_type_children)
+        if assert_not_empty:
+            self.assertNotEqual([], paths)
+        return paths
+
+    def execute_cli_create_cmd(self, _, url, item_type, props='', args='',
+                               expect_positive=True, add_to_cleanup=True):
+        """
+        Runs "litp create".
+        """
+        errors = self.model.create(url, item_type, props)
+        if not errors and add_to_cleanup:
+            self.created_items.append(url)
+        return self._cli_result(errors, expect_positive)
+
+    def execute_cli_update_cmd(self, _, url, props, action_del=False,
+                               expect_positive=True):
+        """
+        Runs "litp update".
+        """
+        return self._cli_result(
+            self.model.update(url, props, action_del), expect_positive)
+
+    def execute_cli_remove_cmd(self, _, url, expect_positive=True):
+        """
+        Runs "litp remove".
+        """
+        return self._cli_result(self.model.remove(url), expect_positive)
+
+    def execute_show_data_cmd(self, _, url, name):
+        """
+        Returns a property, or the state, of an item.
+        """
+        return self.model.show(url, name)
+
+    def execute_cli_export_cmd(self, _, url, filename,
+                               expect_positive=True):
+        """
+        Runs "litp export".
+        """
+        return self._cli_result(self.model.export(url, filename),
+                                expect_positive)
+
+    def execute_cli_load_cmd(self, _, url, filename, args='',
+                             expect_positive=True):
+        """
+        Runs "litp load".
+        """
+        return self._cli_result(self.model.load(url, filename, args),
+                                expect_positive)
+
+    def copy_file_to(self, _, local_filepath, remote_filepath,
+                     root_copy=False):
+        """
+        Copies a local file into the file store of the MS.
+        """
+        with open(local_filepath) as local_file:
+            self.model.files[remote_filepath] = local_file.read()
+        return True
+
+    def download_file_from_node(self, _, remote_filepath, local_filepath,
+                                root_copy=False):
+        """
+        Copies a file from the file store of the MS.
+        """
+        if remote_filepath not in self.model.files:
+            return False
+        data = self.model.files[remote_filepath]
+        if not isinstance(data, bytes):
+            data = data.encode('utf-8')
+        with open(local_filepath, 'wb') as local_file:
+            local_file.write(data)
+        return True
+
+    def execute_cli_createplan_cmd(self, _, expect_positive=True):
+        """
+        Runs "litp create_plan".
+        """
+        return self._cli_result(self.model.create_plan(), expect_positive)
+
+    def execute_cli_runplan_cmd(self, _, expect_positive=True):
+        """
+        Runs "litp run_plan" to its end.
+        """
+        return self._cli_result(self.model.run_plan(self._apply_on_node),
+                                expect_positive)
+
+    def _apply_on_node(self, hostname, apply_keys, remove_keys):
+        """
+        Plan executor applying the sysparams of a node to its simulation.
+        """
+        return self.nodes[hostname].apply_sysparams(apply_keys, remove_keys)
+
+    def execute_cli_removeplan_cmd(self, _, expect_positive=True):
+        """
+        Runs "litp remove_plan".
+        """
+        return self._cli_result(self.model.remove_plan(), expect_positive)
+
+    def execute_cli_showplan_cmd(self, _):
+        """
+        Returns the "litp show_plan" summary.
+        """
+        return self.model.show_plan(), [], 0
+
+    def get_current_plan_state(self, _):
+        """
+        Returns the test_constants state of the plan.
+        """
+        return self.model.plan_state()
+
+    def wait_for_plan_state(self, _, state, *args, **kwargs):
+        """
+        Plans run synchronously, so the state is final already.
+        """
+        return self.model.plan_state() == state
+
+    def is_all_applied(self, _):
+        """
+        Returns True if every item of the model is Applied.
+        """
+        return self.model.is_all_applied()
+
+    def run_command(self, node, cmd, add_to_cleanup=True, su_root=False,
+                    logging=True, default_asserts=False, **kwargs):
+        """
+        Runs a command on a simulated node. On the MS only "hostname",
+        "mco puppet runonce -I <host>", "litp create" and "litp remove",
+        and command_utils batches of them, are served.
+        """
+        if node == self.ms_node:
+            stdout, stderr, rc = self._run_on_ms(cmd)
+        else:
+            stdout, stderr, rc = self.nodes[node].run(cmd)
+        if default_asserts:
+            self.assertEqual(0, rc)
+            self.assertEqual([], stderr)
+        return stdout, stderr, rc
+
+    def _run_on_ms(self, cmd):
+        """
+        Serves the MS commands used by the testsets.
+        """
+        words = split_words(cmd)
+        if words == ['hostname']:
+            return [self.ms_node], [], 0
+        if words[0].endswith('mco') and words[1:3] == ['puppet', 'runonce']:
+            self.nodes[words[words.index('-I') + 1]].run_puppet()
+            return [], [], 0
+        if words[0].endswith('sh') and words[1:2] == ['-c']:
+            batch = split_batch_script(words[2])
+            if batch is not None:
+                marker, commands = batch
+                return format_batch_output(
+                    marker, [self._run_on_ms(command)
+                             for command in commands]), [], 0
+        if words[0].endswith('litp'):
+            return self._run_litp(words[1:])
+        return [], ['{0}: command not found'.format(words[0])], 127
+
+    def _run_litp(self, args):
+        """
+        Serves "litp create -p <path> -t <type> [-o <props>...]" and
+        "litp remove -p <path>".
+        """
+        options = {'-o': []}
+        option = None
+        for arg in args[1:]:
+            if arg in ('-p', '-t', '-o'):
+                option = arg
+            elif option == '-o':
+                options['-o'].append(arg)
+            elif option:
+                options[option] = arg
+                option = None
+        if args[0] == 'create':
+            errors = self.model.create(
+                options['-p'], options['-t'],
+                ' '.join(quote(prop) for prop in options['-o']))
+        elif args[0] == 'remove':
+            errors = self.model.remove(options['-p'])
+        else:
+            return [], ['litp {0}: not supported'.format(args[0])], 1
+        return [], errors, 1 if errors else 0
+
+    def get_file_contents(self, node, filepath, su_root=False,
+                          assert_not_empty=True, **kwargs):
+        """
+        Returns the lines of a file of a simulated node.
+        """
+        lines = self.nodes[node].read_lines(filepath)
+        if assert_not_empty:
+            self.assertNotEqual([], lines)
+        return lines
+
+    def cp_file_on_node(self, node, orig_path, new_path, su_root=False,
+                        **kwargs):
+        """
+        Copies a file on a simulated node.
+        """
+        _, _, rc = self.nodes[node].run(
+            '/bin/cp -f {0} {1}'.format(orig_path, new_path))
+        return rc == 0
+
+    def wait_for_puppet_action(self, _, node, cmd, expected_rc,
+                               *args, **kwargs):
+        """
+        Runs puppet on node once, then checks the rc of cmd there.
+        """
+        self.nodes[node].run_puppet()
+        return self.nodes[node].run(cmd)[2] == expected_rc
+
+
+def load_offline(module_name):
+    """
+    Description:
+        Imports a testset with OfflineGenericTest in place of GenericTest.
+    Args:
+        module_name (str): testset module, e.g. "testset_story2327_5774"
+    Returns:
+        module. The testset module
+    """
+    offline = type(sys)('litp_generic_test')
+    offline.GenericTest = OfflineGenericTest
+    offline.attr = attr
+    real = sys.modules.get('litp_generic_test')
+    sys.modules['litp_generic_test'] = offline
+    try:
+        sys.modules.pop(module_name, None)
+        return __import__(module_name)
+    finally:
+        if real is None:
+            del sys.modules['litp_generic_test']
+        else:
+            sys.modules['litp_generic_test'] = real
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    TESTSET = load_offline(sys.argv[1])
+    unittest.main(module=TESTSET, argv=sys.argv[:1] + sys.argv[2:])
@@ -0,0 +1,635 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Simulated managed node for offline runs of the sysparams
+            testsets. A sandbox directory stands in for /etc/sysctl.conf
+            and /proc/sys, and the shell commands the testsets send with
+            run_command (sed, grep, cat, cp, md5sum, stat and sysctl,
+            joined with pipes, && or ;) are served from it locally.
+'''
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import time
+from command_utils import format_batch_output, split_batch_script
+from sysctl_utils import split_keyvalue, to_dotted_key
+
+DEFAULT_SYSCTL_CONF = [
+    '# Kernel sysctl configuration file for Red Hat Linux',
+    '#',
+    '# For binary values, 0 is disabled, 1 is enabled.  See sysctl(8) and',
+    '# sysctl.conf(5) for more details.',
+    '',
+    '# Controls IP packet forwarding',
+    'net.ipv4.ip_forward = 0',
+    '',
+    '# Controls source route verification',
+    'net.ipv4.conf.default.rp_filter = 1',
+    '',
+    '# Do not accept source routing',
+    'net.ipv4.conf.default.accept_source_route = 0',
+    '',
+    '# Controls the System Request debugging functionality of the kernel',
+    'kernel.sysrq = 0',
+    '',
+    '# Controls whether core dumps will append the PID to the core filename',
+    'kernel.core_uses_pid = 1',
+    '',
+    '# Controls the use of TCP syncookies',
+    'net.ipv4.tcp_syncookies = 1',
+    '',
+    '# Controls the default maxmimum size of a mesage queue',
+    'kernel.msgmnb = 65536',
+    '',
+    '# Controls the maximum size of a message, in bytes',
+    'kernel.msgmax = 65536',
+    '',
+    '# Controls the maximum shared segment size, in bytes',
+    'kernel.shmmax = 68719476736',
+    '',
+    '# Controls the maximum number of shared memory segments, in pages',
+    'kernel.shmall = 4294967296',
+    '',
+    '# Core dumps',
+    'fs.suid_dumpable = 0',
+    'kernel.core_pattern = /var/coredumps/core.%e.pid%p.usr%u.sig%s.tim%t',
+]
+
+# Kernel parameters known to the node that are not set in sysctl.conf
+DEFAULT_KERNEL_VALUES = {
+    'fs.file-max': '6815744',
+    'kernel.pid_max': '32768',
+    'kernel.threads-max': '62975',
+    'net.ipv4.tcp_wmem': '4096\t16384\t4194304',
+    'net.ipv4.conf.default.mc_forwarding': '0',
+}
+
+# Kernel parameters that cannot be written, even by root
+DEFAULT_READ_ONLY_KEYS = ('net.ipv4.conf.default.mc_forwarding',)
+
+SYSCTL_CONF = '/etc/sysctl.conf'
+
+
+def split_commands(cmd):
+    """
+    Description:
+        Splits a shell command line on the unquoted operators |, && and ;.
+    Args:
+        cmd (str): command line
+    Returns:
+        list. (operator preceding the command, command) tuples
+    """
+    parts = []
+    current = []
+    operator = None
+    quote = None
+    index = 0
+    while index < len(cmd):
+        char = cmd[index]
+        if quote:
+            if char == quote:
+                quote = None
+            elif char == '\\' and quote == '"' and index + 1 < len(cmd):
+                current.append(char)
+                index += 1
+                char = cmd[index]
+        elif char in '\'"':
+            quote = char
+        elif cmd.startswith('&&', index) or cmd.startswith('||', index):
+            parts.append((operator, ''.join(current).strip()))
+            operator = cmd[index:index + 2]
+            current = []
+            index += 2
+            continue
+        elif char in '|;':
+            parts.append((operator, ''.join(current).strip()))
+            operator = char
+            current = []
+            index += 1
+            continue
+        current.append(char)
+        index += 1
+    parts.append((operator, ''.join(current).strip()))
+    return [part for part in parts if part[1]]
+
+
+def split_words(cmd):
+    """
+    Description:
+        Splits one command into words the way the shell does, removing
+        quotes, e.g. a'b'"c" is the single word abc.
+    Args:
+        cmd (str): command without shell operators
+    Returns:
+        list. The words
+    """
+    words = []
+    word = []
+    in_word = False
+    quote = None
+    index = 0
+    while index < len(cmd):
+        char = cmd[index]
+        if quote == "'":
+            if char == "'":
+                quote = None
+            else:
+                word.append(char)
+        elif quote == '"':
+            if char == '"':
+                quote = None
+            elif char == '\\' and index + 1 < len(cmd) and \
+                    cmd[index + 1] in '"\\$`':
+                index += 1
+                word.append(cmd[index])
+            else:
+                word.append(char)
+        elif char in '\'"':
+            quote = char
+            in_word = True
+        elif char == '\\' and index + 1 < len(cmd):
+            index += 1
+            word.append(cmd[index])
+            in_word = True
+        elif char.isspace():
+            if in_word:
+                words.append(''.join(word))
+                word = []
+                in_word = False
+        else:
+            word.append(char)
+            in_word = True
+        index += 1
+    if in_word:
+        words.append(''.join(word))
+    return words
+
+
+def bre_to_python(pattern):
+    """
+    Description:
+        Translates a POSIX basic regular expression, as used by grep and
+        sed without -E, to a Python regular expression.
+    Args:
+        pattern (str): basic regular expression
+    Returns:
+        str. The Python regular expression
+    """
+    result = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == '\\' and index + 1 < len(pattern):
+            index += 1
+            char = pattern[index]
+            result.append(char if char in '(){}|+?' else '\\' + char)
+        elif char in '(){}|+?':
+            result.append('\\' + char)
+        else:
+            result.append(char)
+        index += 1
+    return ''.join(result)
+
+
+def parse_sed_substitution(expression):
+    """
+    Description:
+        Parses a sed s command, where "\\" followed by the delimiter stands
+        for the delimiter itself.
+    Args:
+        expression (str): s command, e.g. 's/a\\/b/c/g'
+    Returns:
+        tuple. (Python regular expression, replacement template for
+        re.sub, flags)
+    Raises:
+        ValueError if expression is not a complete s command
+    """
+    if len(expression) < 2 or expression[0] != 's':
+        raise ValueError('unknown command: `{0}\''.format(expression[:1]))
+    delimiter = expression[1]
+    # Tokens of the pattern and the replacement: a character, or a
+    # backslash and the character it escapes
+    parts = [[], []]
+    index = 2
+    for part in parts:
+        while index < len(expression) and expression[index] != delimiter:
+            token = expression[index]
+            if token == '\\' and index + 1 < len(expression):
+                index += 1
+                token = expression[index]
+                if token != delimiter or token in '.[]*^$\\':
+                    token = '\\' + token
+            part.append(token)
+            index += 1
+        if index >= len(expression):
+            raise ValueError("unterminated `s' command")
+        index += 1
+    pattern, replacement = parts
+    template = []
+    for token in replacement:
+        if token == '&':
+            template.append(r'\g<0>')
+        elif token == '\\&':
+            template.append('&')
+        elif len(token) == 2 and token[1].isdigit():
+            template.append(r'\g<{0}>'.format(token[1]))
+        elif token in ('\\\\', '\\n', '\\t'):
+            template.append(token)
+        else:
+            template.append(token[-1])
+    return (bre_to_python(''.join(pattern)), ''.join(template),
+            expression[index:])
+
+
+class SimulatedNode(object):
+    """
+    A managed node whose /etc/sysctl.conf and /proc/sys live in a sandbox
+    directory.
+    """
+
+    def __init__(self, hostname, conf_lines=None, kernel_values=None,
+                 read_only_keys=DEFAULT_READ_ONLY_KEYS):
+        """
+        Args:
+            hostname (str): hostname of the node
+            conf_lines (list): initial sysctl.conf, the RHEL default if None
+            kernel_values (dict): kernel parameters not in sysctl.conf
+            read_only_keys (tuple): kernel parameters that cannot be set
+        """
+        self.hostname = hostname
+        self.root = tempfile.mkdtemp(prefix='sysparams-{0}-'.format(hostname))
+        os.makedirs(self.path('/tmp'))
+        self.read_only_keys = set(read_only_keys)
+        # key -> value of the sysparams puppet manages on the node
+        self.managed = {}
+        self.commands_run = 0
+
+        if conf_lines is None:
+            conf_lines = DEFAULT_SYSCTL_CONF
+        if kernel_values is None:
+            kernel_values = DEFAULT_KERNEL_VALUES
+        self.write_lines(SYSCTL_CONF, conf_lines)
+        for key, value in kernel_values.items():
+            self._write_kernel(key, value)
+        for line in conf_lines:
+            keyvalue = split_keyvalue(line)
+            if keyvalue:
+                self._write_kernel(keyvalue[0], keyvalue[1])
+
+    def cleanup(self):
+        """
+        Removes the sandbox.
+        """
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def path(self, filepath):
+        """
+        Returns the sandbox path standing in for an absolute node path.
+        """
+        return os.path.join(self.root, filepath.lstrip('/'))
+
+    def read_lines(self, filepath):
+        """
+        Returns the lines of a node file.
+        """
+        with open(self.path(filepath)) as node_file:
+            return node_file.read().splitlines()
+
+    def write_lines(self, filepath, lines):
+        """
+        Writes lines to a node file.
+        """
+        sandbox_path = self.path(filepath)
+        if not os.path.isdir(os.path.dirname(sandbox_path)):
+            os.makedirs(os.path.dirname(sandbox_path))
+        with open(sandbox_path, 'w') as node_file:
+            node_file.write(''.join(line + '\n' for line in lines))
+
+    def _kernel_path(self, key):
+        """
+        Returns the sandbox path of the /proc/sys file of a key.
+        """
+        return self.path('/proc/sys/' + to_dotted_key(key).replace('.', '/'))
+
+    def _write_kernel(self, key, value):
+        """
+        Sets a kernel parameter, creating it.
+        """
+        kernel_path = self._kernel_path(key)
+        if not os.path.isdir(os.path.dirname(kernel_path)):
+            os.makedirs(os.path.dirname(kernel_path))
+        with open(kernel_path, 'w') as proc_file:
+            proc_file.write('\t'.join(value.split()) + '\n')
+
+    def kernel_value(self, key):
+        """
+        Returns the value of a kernel parameter, None if it is unknown.
+        """
+        kernel_path = self._kernel_path(key)
+        if not os.path.isfile(kernel_path):
+            return None
+        with open(kernel_path) as proc_file:
+            return proc_file.read().rstrip('\n')
+
+    def set_kernel(self, key, value):
+        """
+        Description:
+            Sets a kernel parameter as "sysctl -w" does.
+        Returns:
+            str. The error sysctl reports, None on success
+        """
+        dotted = to_dotted_key(key)
+        if self.kernel_value(key) is None:
+            return 'error: "{0}" is an unknown key'.format(dotted)
+        if dotted in self.read_only_keys:
+            return 'error: permission denied on key \'{0}\''.format(dotted)
+        self._write_kernel(key, value)
+        return None
+
+    def kernel_values(self):
+        """
+        Returns every kernel parameter as a sorted list of (key, value).
+        """
+        proc_sys = self.path('/proc/sys')
+        values = []
+        for dirpath, _, filenames in os.walk(proc_sys):
+            for filename in filenames:
+                relative = os.path.relpath(os.path.join(dirpath, filename),
+                                           proc_sys)
+                key = relative.replace(os.sep, '.')
+                values.append((key, self.kernel_value(key)))
+        return sorted(values)
+
+    def apply_sysparams(self, apply_keys, remove_keys):
+        """
+        Description:
+            Does what the puppet manifests of a plan do on the node: sets
+            each key in the kernel and, if that works, in sysctl.conf,
+            and removes the lines of removed keys from sysctl.conf.
+        Args:
+            apply_keys (dict): key -> value to set
+            remove_keys (list): keys to remove from sysctl.conf
+        Returns:
+            bool. False if a key could not be set
+        """
+        success = True
+        for key, value in apply_keys.items():
+            if self.set_kernel(key, value) is not None:
+                success = False
+                continue
+            self.managed[key] = value
+            self._set_conf_line(key, value)
+        for key in remove_keys:
+            self.managed.pop(key, None)
+            self._set_conf_line(key, None)
+        return success
+
+    def run_puppet(self):
+        """
+        Reverts manual edits of the lines of the keys puppet manages.
+        """
+        lines = self.read_lines(SYSCTL_CONF)
+        for key, value in self.managed.items():
+            line = '{0} = {1}'.format(key, value)
+            if line not in lines:
+                self._set_conf_line(key, value)
+
+    def _set_conf_line(self, key, value):
+        """
+        Sets the sysctl.conf line of a key, or removes it if value is None.
+        """
+        lines = []
+        found = False
+        for line in self.read_lines(SYSCTL_CONF):
+            keyvalue = split_keyvalue(line)
+            if keyvalue and keyvalue[0] == key:
+                if value is not None and not found:
+                    lines.append('{0} = {1}'.format(key, value))
+                found = True
+            else:
+                lines.append(line)
+        if value is not None and not found:
+            lines.append('{0} = {1}'.format(key, value))
+        self.write_lines(SYSCTL_CONF, lines)
+
+    def run(self, cmd):
+        """
+        Description:
+            Runs a shell command line on the node.
+        Args:
+            cmd (str): command line
+        Returns:
+            tuple. (stdout lines, stderr lines, rc) of the last command
+        """
+        self.commands_run += 1
+        return self._run_line(cmd)
+
+    def _run_line(self, cmd):
+        """
+        Runs a command line without counting it as a round trip.
+        """
+        stdout, stderr, rc = [], [], 0
+        for operator, command in split_commands(cmd):
+            if operator == '&&' and rc != 0 or operator == '||' and rc == 0:
+                continue
+            stdin = stdout if operator == '|' else None
+            # Output of earlier commands not piped on is still printed
+            printed = stdout if operator not in (None, '|') else []
+            stdout, errors, rc = self._run_one(split_words(command), stdin)
+            stdout = printed + stdout
+            stderr = stderr + errors
+        return stdout, stderr, rc
+
+    def _run_one(self, words, stdin):
+        """
+        Runs a single command.
+        """
+        name = os.path.basename(words[0])
+        handler = getattr(self, '_cmd_' + name.replace('-', '_'), None)
+        if handler is None:
+            return [], ['{0}: command not found'.format(name)], 127
+        return handler(words[1:], stdin)
+
+    def _cmd_hostname(self, _, __):
+        """
+        hostname
+        """
+        return [self.hostname], [], 0
+
+    def _cmd_cat(self, args, stdin):
+        """
+        cat [file...]
+        """
+        if not args:
+            return list(stdin or []), [], 0
+        stdout = []
+        for filepath in args:
+            if not os.path.isfile(self.path(filepath)):
+                return stdout, ['cat: {0}: No such file or directory'
+                                .format(filepath)], 1
+            stdout.extend(self.read_lines(filepath))
+        return stdout, [], 0
+
+    def _cmd_cp(self, args, _):
+        """
+        cp [-p|-f] src dst
+        """
+        src, dst = [arg for arg in args if not arg.startswith('-')]
+        if not os.path.isfile(self.path(src)):
+            return [], ["cp: cannot stat '{0}': No such file or directory"
+                        .format(src)], 1
+        shutil.copy2(self.path(src), self.path(dst))
+        return [], [], 0
+
+    def _cmd_md5sum(self, args, _):
+        """
+        md5sum file
+        """
+        with open(self.path(args[0]), 'rb') as node_file:
+            digest = hashlib.md5(node_file.read()).hexdigest()
+        return ['{0}  {1}'.format(digest, args[0])], [], 0
+
+    def _cmd_stat(self, args, _):
+        """
+        stat -c FORMAT file, with the %y and %s formats
+        """
+        fmt, filepath = args[1], args[2]
+        stat = os.stat(self.path(filepath))
+        mtime = time.strftime('%Y-%m-%d %H:%M:%S',
+                              time.localtime(stat.st_mtime))
+        mtime += '{0:.9f}'.format(stat.st_mtime % 1)[1:]
+        return [fmt.replace('%y', mtime).replace(
+            '%s', str(stat.st_size))], [], 0
+
+    def _cmd_grep(self, args, stdin):
+        """
+        grep [options] pattern [file]
+        """
+        options = [arg for arg in args if arg.startswith('-')]
+        args = [arg for arg in args if not arg.startswith('-')]
+        flags = re.I if '-i' in options else 0
+        regex = re.compile(bre_to_python(args[0]), flags)
+        if len(args) > 1:
+            if not os.path.isfile(self.path(args[1])):
+                return [], ['grep: {0}: No such file or directory'.format(
+                    args[1])], 2
+            lines = self.read_lines(args[1])
+        else:
+            lines = stdin or []
+        matched = [line for line in lines
+                   if bool(regex.search(line)) != ('-v' in options)]
+        return matched, [], 0 if matched else 1
+
+    def _cmd_rm(self, args, _):
+        """
+        rm [-f] file...
+        """
+        for filepath in [arg for arg in args if not arg.startswith('-')]:
+            if os.path.isfile(self.path(filepath)):
+                os.remove(self.path(filepath))
+            elif '-f' not in args:
+                return [], ["rm: cannot remove '{0}': No such file or "
+                            "directory".format(filepath)], 1
+        return [], [], 0
+
+    def _cmd_sed(self, args, _):
+        """
+        sed -i [-e] 's/old/new/[g]' file
+        """
+        args = [arg for arg in args if arg not in ('-i', '-e')]
+        expression, filepath = args
+        try:
+            old, new, flags = parse_sed_substitution(expression)
+        except ValueError as error:
+            return [], ['sed: -e expression #1: {0}'.format(error)], 1
+        regex = re.compile(old)
+        lines = [regex.sub(new, line, count=0 if 'g' in flags else 1)
+                 for line in self.read_lines(filepath)]
+        self.write_lines(filepath, lines)
+        return [], [], 0
+
+    def _cmd_sh(self, args, _):
+        """
+        sh -c script; a command_utils batch script runs its commands one
+        by one, anything else runs as a single command line
+        """
+        if len(args) != 2 or args[0] != '-c':
+            return [], ['sh: only "sh -c script" is supported'], 2
+        batch = split_batch_script(args[1])
+        if batch is None:
+            return self._run_line(args[1])
+        marker, commands = batch
+        return format_batch_output(
+            marker, [self._run_line(cmd) for cmd in commands]), [], 0
+
+    def _cmd_test(self, args, _):
+        """
+        test (-e | -f | -w) file; read-only kernel parameters fail -w
+        """
+        option, filepath = args
+        sandbox_path = self.path(filepath)
+        if option == '-w' and filepath.startswith('/proc/sys/'):
+            key = filepath[len('/proc/sys/'):].replace('/', '.')
+            passed = os.path.isfile(sandbox_path) and \
+                key not in self.read_only_keys
+        elif option == '-w':
+            passed = os.access(sandbox_path, os.W_OK)
+        elif option == '-f':
+            passed = os.path.isfile(sandbox_path)
+        else:
+            passed = os.path.exists(sandbox_path)
+        return [], [], 0 if passed else 1
+
+    def _cmd_sysctl(self, args, _):
+        """
+        sysctl [-e] [-n] (-a | -p [file] | -w key=value... | key...)
+        """
+        options = [arg for arg in args if arg.startswith('-')]
+        args = [arg for arg in args if not arg.startswith('-')]
+        ignore_unknown = '-e' in options
+        stdout, stderr, rc = [], [], 0
+        if '-a' in options:
+            return ['{0} = {1}'.format(key, value)
+                    for key, value in self.kernel_values()], [], 0
+        if '-p' in options:
+            assignments = [split_keyvalue(line)
+                           for line in self.read_lines(
+                               args[0] if args else SYSCTL_CONF)]
+            assignments = [keyvalue for keyvalue in assignments if keyvalue]
+        elif '-w' in options:
+            assignments = [tuple(arg.split('=', 1)) for arg in args]
+        else:
+            for key in args:
+                value = self.kernel_value(key)
+                if value is None:
+                    # The testsets read this message from stdout
+                    stdout.append('sysctl: cannot stat /proc/sys/{0}: No '
+                                  'such file or directory'.format(
+                                      to_dotted_key(key).replace('.', '/')))
+                    rc = 255
+                elif '-n' in options:
+                    stdout.append(value)
+                else:
+                    stdout.append('{0} = {1}'.format(to_dotted_key(key),
+                                                     value))
+            return stdout, stderr, rc
+
+        for key, value in assignments:
+            error = self.set_kernel(key.strip(), value.strip())
+            if error is None:
+                stdout.append('{0} = {1}'.format(key.strip(), value.strip()))
+            elif not (ignore_unknown and 'unknown key' in error):
+                stderr.append(error)
+                rc = 255
+        return stdout, stderr, rc
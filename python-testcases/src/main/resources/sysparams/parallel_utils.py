@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Helpers to fan work out across managed nodes concurrently.
+            Work for a single node is always run serially on one thread so
+            that a node connection is never shared between threads.
+'''
+
+import threading
+import traceback
+
+
+class NodeTaskError(Exception):
+    """
+    Raised in the calling thread when the work for a node failed.
+    """
+
+    def __init__(self, node, trace):
+        super(NodeTaskError, self).__init__(
+            'Work for node "{0}" failed:\n{1}'.format(node, trace))
+        self.node = node
+        self.trace = trace
+
+
+def run_by_node(func, work, max_workers=None):
+    """
+    Description:
+        Runs func(node, args) for every node in work, one thread per node,
+        and waits for all of them to finish.
+    Args:
+        func (callable): function called as func(node, args)
+        work (dict): node filename -> args passed to func for that node
+        max_workers (int): maximum number of nodes worked on at the same
+            time, unlimited when None
+    Returns:
+        dict. node filename -> value returned by func for that node
+    Raises:
+        NodeTaskError if func raised for any node, once all nodes are done
+    """
+    results = {}
+    errors = {}
+    lock = threading.Lock()
+    slots = threading.Semaphore(max_workers) if max_workers else None
+
+    def worker(node, args):
+        """
+        Runs the work of one node and records its outcome.
+        """
+        if slots:
+            slots.acquire()
+        try:
+            value = func(node, args)
+            with lock:
+                results[node] = value
+        except Exception:  # pylint: disable=broad-except
+            with lock:
+                errors[node] = traceback.format_exc()
+        finally:
+            if slots:
+                slots.release()
+
+    # A single node does not need a thread
+    if len(work) == 1:
+        node, args = list(work.items())[0]
+        worker(node, args)
+    else:
+        threads = []
+        for node, args in work.items():
+            thread = threading.Thread(target=worker, args=(node, args),
+                                      name='node-{0}'.format(node))
+            thread.daemon = True
+            threads.append(thread)
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        node = sorted(errors)[0]
+        raise NodeTaskError(node, errors[node])
+    return results
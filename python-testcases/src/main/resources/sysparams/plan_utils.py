@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Helpers for following LITP plans from the sysparams testsets.
+'''
+
+import re
+import test_constants
+
+# "litp show_plan" status of a plan that will not change any more
+TERMINAL_PLAN_STATES = {
+    'Successful': test_constants.PLAN_COMPLETE,
+    'Failed': test_constants.PLAN_FAILED,
+    'Stopped': test_constants.PLAN_STOPPED,
+}
+
+_STATUS_RE = re.compile(r'^\s*Plan Status:\s*(\w+)')
+_SUCCESS_RE = re.compile(r'\bSuccess:\s*(\d+)')
+
+
+def parse_plan_summary(lines):
+    """
+    Description:
+        Reads the summary at the end of "litp show_plan" output.
+    Args:
+        lines (list): show_plan output
+    Returns:
+        tuple. (status, number of successful tasks); status is None and
+        the count 0 when the output has no summary
+    """
+    status = None
+    done = 0
+    for line in lines:
+        match = _STATUS_RE.match(line)
+        if match:
+            status = match.group(1)
+        match = _SUCCESS_RE.search(line)
+        if match:
+            done = int(match.group(1))
+    return status, done
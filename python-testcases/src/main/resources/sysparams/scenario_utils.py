@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Declarative sysparam scenarios. A JSON spec describes the
+            sysparams to create, update and remove in each step of one or
+            more scenarios, and the sysctl.conf, kernel and model state
+            expected after each step. A spec compiles into the steps of a
+            PlanCoalescer, so that scenarios share plans, snapshots and
+            parallel checks; testset_sysparams_scenarios turns each spec
+            into a test method; see scenarios/ for examples.
+            A step lists the sysparams to "create" (node index, item id,
+            key and value), "update" (node index, item id and the new
+            properties) and "remove" (node index and item id).
+            Each "expect" entry names a node index and a key; "file" and
+            "model" are the expected value, null for a key that must not
+            be set, and "file" may also be "@before", the value sysctl.conf
+            had when the test started; "kernel" is the expected value in
+            the running kernel. Node indexes are numbers, every other
+            value is a string.
+'''
+
+from collections import OrderedDict
+import glob
+import json
+import os
+import re
+
+from coalesce_utils import CREATE, REMOVE, UPDATE, ModelChange, ModelCheck
+from sysctl_utils import SysctlCheck, in_file, in_kernel, not_in_file
+
+# Value of "file" standing for the value before the test
+BEFORE = '@before'
+
+# Test method names, as in the other testsets; scenarios are positive
+NAME_RE = re.compile(r'^\d{2}_p_\w+$')
+
+REQUIRED_SPEC_FIELDS = ('name', 'tms_id', 'requirements', 'title',
+                        'scenarios')
+
+# nose attributes of every scenario test, besides its tms_id
+DEFAULT_ATTRS = ('all', 'revert', 'sysparams_scenarios')
+
+# Types of the fields, by name; json gives unicode strings on python 2
+STRING = (type(u''), type(''))
+NULLABLE_STRING = STRING + (type(None),)
+SPEC_TYPES = {'name': STRING, 'tms_id': STRING, 'requirements': list,
+              'title': STRING, 'description': STRING, 'attrs': list,
+              'plans': int, 'scenarios': list}
+SCENARIO_TYPES = {'name': STRING, 'steps': list}
+STEP_TYPES = {CREATE: list, UPDATE: list, REMOVE: list, 'expect': list,
+              'description': STRING}
+CHANGE_TYPES = {'node': int, 'id': STRING, 'key': STRING, 'value': STRING}
+EXPECT_TYPES = {'node': int, 'key': STRING, 'file': NULLABLE_STRING,
+                'kernel': STRING, 'model': NULLABLE_STRING}
+
+
+class ScenarioError(ValueError):
+    """
+    A scenario spec that cannot be compiled.
+    """
+    pass
+
+
+def _check_fields(source, what, entry, types, required=()):
+    """
+    Raises ScenarioError if entry is not a dict with the required fields
+    and only fields of types, each of its type.
+    """
+    allowed = sorted(types)
+    if not isinstance(entry, dict):
+        raise ScenarioError('{0}: {1} must be an object'.format(source, what))
+    unknown = sorted(set(entry) - set(allowed))
+    if unknown:
+        raise ScenarioError('{0}: unknown fields {1} in {2}, expected some '
+                            'of {3}'.format(source, unknown, what, allowed))
+    missing = [field for field in required if field not in entry]
+    if missing:
+        raise ScenarioError('{0}: {1} needs {2}'.format(source, what,
+                                                        missing))
+    for field in sorted(entry):
+        value = entry[field]
+        # bool is an int, but true is not a node index
+        if not isinstance(value, types[field]) or isinstance(value, bool):
+            raise ScenarioError('{0}: "{1}" of {2} must be {3}, not '
+                                '{4}'.format(source, field, what,
+                                             _type_name(types[field]),
+                                             json.dumps(value)))
+        if isinstance(value, list) and field in ('requirements', 'attrs'):
+            if not all(isinstance(item, STRING) for item in value):
+                raise ScenarioError('{0}: "{1}" of {2} must be a list of '
+                                    'strings'.format(source, field, what))
+
+
+def _type_name(types):
+    """
+    Returns the name of a field type in error messages.
+    """
+    return {STRING: 'a string', NULLABLE_STRING: 'a string or null',
+            int: 'a number', list: 'a list'}[types]
+
+
+def validate_spec(spec, source='spec'):
+    """
+    Description:
+        Checks the structure of a scenario spec.
+    Args:
+        spec (dict): the spec
+        source (str): name of the spec in error messages, e.g. its file
+    Raises:
+        ScenarioError if the spec is malformed
+    """
+    _check_fields(source, 'the spec', spec, SPEC_TYPES,
+                  REQUIRED_SPEC_FIELDS)
+    if not NAME_RE.match(spec['name']):
+        raise ScenarioError('{0}: name "{1}" does not match {2}'.format(
+            source, spec['name'], NAME_RE.pattern))
+    if not spec['scenarios']:
+        raise ScenarioError('{0}: no scenarios'.format(source))
+    for scenario in spec['scenarios']:
+        _check_fields(source, 'a scenario', scenario, SCENARIO_TYPES,
+                      ('name', 'steps'))
+        where = '{0} scenario "{1}"'.format(source, scenario['name'])
+        for index, step in enumerate(scenario['steps']):
+            what = 'step {0}'.format(index + 1)
+            _check_fields(where, what, step, STEP_TYPES)
+            if not any(step.get(field)
+                       for field in (CREATE, UPDATE, REMOVE, 'expect')):
+                raise ScenarioError('{0}: {1} neither changes nor checks '
+                                    'anything'.format(where, what))
+            for action in (CREATE, UPDATE, REMOVE):
+                for entry in step.get(action, []):
+                    _check_fields(
+                        where, '{0} of {1}'.format(action, what), entry,
+                        CHANGE_TYPES,
+                        ('node', 'id', 'key', 'value') if action == CREATE
+                        else ('node', 'id'))
+            for entry in step.get('expect', []):
+                _check_fields(where, 'expect of ' + what, entry,
+                              EXPECT_TYPES, ('node', 'key'))
+
+
+def load_spec(path):
+    """
+    Description:
+        Reads and checks a scenario spec.
+    Args:
+        path (str): JSON file of the spec
+    Returns:
+        dict. The spec, with the fields in file order
+    Raises:
+        ScenarioError if the spec is malformed
+    """
+    with open(path) as spec_file:
+        try:
+            spec = json.load(spec_file, object_pairs_hook=OrderedDict)
+        except ValueError as error:
+            raise ScenarioError('{0}: {1}'.format(path, error))
+    validate_spec(spec, os.path.basename(path))
+    return spec
+
+
+def load_specs(directory):
+    """
+    Description:
+        Reads every scenario spec of a directory.
+    Args:
+        directory (str): directory of the *.json specs
+    Returns:
+        list. The specs, in file name order
+    Raises:
+        ScenarioError if a spec is malformed or two specs have the same
+        name
+    """
+    specs = [load_spec(path)
+             for path in sorted(glob.glob(os.path.join(directory, '*.json')))]
+    names = [spec['name'] for spec in specs]
+    duplicates = sorted(set(name for name in names if names.count(name) > 1))
+    if duplicates:
+        raise ScenarioError('{0}: several specs named {1}'.format(
+            directory, duplicates))
+    return specs
+
+
+def spec_nodes(spec):
+    """
+    Returns the sorted node indexes a spec uses.
+    """
+    return sorted(set(
+        entry['node'] for scenario in spec['scenarios']
+        for step in scenario['steps']
+        for field in (CREATE, UPDATE, REMOVE, 'expect')
+        for entry in step.get(field, [])))
+
+
+def spec_attrs(spec):
+    """
+    Returns the nose attributes of the test method of a spec.
+    """
+    return tuple(spec.get('attrs', DEFAULT_ATTRS)) + (spec['tms_id'],)
+
+
+def _describe_step(step):
+    """
+    Returns a one line summary of a step, its description if it has one.
+    """
+    if step.get('description'):
+        return step['description']
+    parts = ['{0} {1}'.format(action.capitalize(), ', '.join(
+        entry['id'] for entry in step[action]))
+        for action in (CREATE, UPDATE, REMOVE) if step.get(action)]
+    if not parts:
+        return 'Check the keys'
+    return '; '.join(parts) + ', create and run the plan'
+
+
+def spec_docstring(spec):
+    """
+    Description:
+        Builds the TMS docstring of the test method of a spec.
+    Args:
+        spec (dict): the spec
+    Returns:
+        str. The docstring
+    """
+    lines = ['',
+             '@tms_id: {0}'.format(spec['tms_id']),
+             '@tms_requirements_id: {0}'.format(
+                 ', '.join(spec['requirements'])),
+             '@tms_title: {0}'.format(spec['title']),
+             '@tms_description: {0}'.format(
+                 spec.get('description', spec['title'])),
+             '@tms_test_steps:']
+    for scenario in spec['scenarios']:
+        for step in scenario['steps']:
+            lines.append('    @step: {0}: {1}'.format(
+                scenario['name'], _describe_step(step)))
+            results = []
+            if any(step.get(action) for action in (CREATE, UPDATE, REMOVE)):
+                results.append('The plan succeeds')
+            if step.get('expect'):
+                results.append('the keys are as expected' if results
+                               else 'The keys are as expected')
+            lines.append('    @result: ' + ' and '.join(results))
+    lines.extend(['@tms_test_precondition:NA',
+                  '@tms_execution_type: Automated'])
+    return '\n        '.join(lines) + '\n        '
+
+
+def _expectation_checks(node, entry, before_value):
+    """
+    Returns the SysctlCheck and ModelCheck tuples of an "expect" entry.
+    """
+    checks = []
+    key = entry['key']
+    if 'file' in entry:
+        value = entry['file']
+        if value == BEFORE:
+            value = before_value(node, key)
+        checks.append(SysctlCheck(node, key, not_in_file() if value is None
+                                  else in_file(value)))
+    if 'kernel' in entry:
+        checks.append(SysctlCheck(node, key, in_kernel(entry['kernel'])))
+    model_checks = []
+    if 'model' in entry:
+        model_checks.append(ModelCheck(node, key, entry['model']))
+    return checks, model_checks
+
+
+def add_spec_steps(coalescer, spec, node_topology, before_value):
+    """
+    Description:
+        Compiles the scenarios of a spec into steps of a PlanCoalescer.
+    Args:
+        coalescer (PlanCoalescer): coalescer to add the steps to
+        spec (dict): the spec, see validate_spec
+        node_topology (callable): returns the NodeTopology of a node
+            index of the spec
+        before_value (callable): returns the value a key has in the
+            sysctl.conf of a node before the test, or None
+    Raises:
+        ScenarioError if a step updates or removes an item no earlier
+        step of the scenario created
+    """
+    for scenario in spec['scenarios']:
+        # Key of each item of the scenario, so removals claim the key
+        keys = {}
+        for index, step in enumerate(scenario['steps']):
+            changes = []
+            for action in (CREATE, UPDATE, REMOVE):
+                for entry in step.get(action, []):
+                    node = node_topology(entry['node'])
+                    if action != CREATE and entry['id'] not in keys:
+                        raise ScenarioError(
+                            '{0} scenario "{1}" step {2}: no item "{3}" to '
+                            '{4}'.format(spec['name'], scenario['name'],
+                                         index + 1, entry['id'], action))
+                    props = dict((name, entry[name])
+                                 for name in ('key', 'value')
+                                 if name in entry)
+                    keys[entry['id']] = props.get('key', keys.get(
+                        entry['id']))
+                    if action == REMOVE:
+                        props = {'key': keys.pop(entry['id'])}
+                    changes.append(ModelChange(action, node.filename,
+                                               node.sysparam_config,
+                                               entry['id'], props))
+            checks, model_checks = [], []
+            for entry in step.get('expect', []):
+                entry_checks, entry_model_checks = _expectation_checks(
+                    node_topology(entry['node']).filename, entry,
+                    before_value)
+                checks.extend(entry_checks)
+                model_checks.extend(entry_model_checks)
+            coalescer.add(scenario['name'], changes, checks, model_checks)
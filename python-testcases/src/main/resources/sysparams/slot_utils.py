@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Lets tests run concurrently, e.g. under nose --processes, on
+            disjoint slots of managed nodes. Each test leases a slot of
+            nodes of its own; the LITP model and plan are shared by all of
+            them, so changing the model and running a plan are serialized
+            with a single plan lock. Locks are flock()ed files in a
+            directory shared by every test process.
+'''
+
+import errno
+import fcntl
+import os
+import time
+
+from timing_utils import Backoff
+
+
+def partition_slots(nodes, slot_size):
+    """
+    Description:
+        Partitions nodes into disjoint slots of slot_size nodes, in order.
+        Nodes left over after the last full slot are not used.
+    Args:
+        nodes (list): node filenames
+        slot_size (int): nodes in each slot
+    Returns:
+        list. Tuples of node filenames
+    """
+    return [tuple(nodes[start:start + slot_size])
+            for start in range(0, len(nodes) - slot_size + 1, slot_size)]
+
+
+class LockTimeout(Exception):
+    """
+    Raised when a lock was not free in time.
+    """
+
+    def __init__(self, path, timeout_secs):
+        super(LockTimeout, self).__init__(
+            'Lock "{0}" not free after {1}s'.format(path, timeout_secs))
+        self.path = path
+
+
+class FileLock(object):
+    """
+    Exclusive lock shared between processes and threads through a file.
+    flock() locks belong to an open file, so two FileLock objects on the
+    same path exclude each other even within one process.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): lock file, created if missing
+        """
+        self.path = path
+        self._fd = None
+
+    @property
+    def held(self):
+        """
+        True while this object holds the lock.
+        """
+        return self._fd is not None
+
+    def try_acquire(self):
+        """
+        Description:
+            Takes the lock if it is free, without waiting.
+        Returns:
+            bool. True if the lock was taken
+        """
+        if self.held:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except IOError as err:
+            os.close(fd)
+            if err.errno in (errno.EAGAIN, errno.EACCES):
+                return False
+            raise
+        self._fd = fd
+        return True
+
+    def acquire(self, timeout_secs=None, backoff=None):
+        """
+        Description:
+            Waits for the lock.
+        Args:
+            timeout_secs (float): how long to wait for, forever if None
+            backoff (Backoff): delays between attempts, the default if
+                None
+        Returns:
+            float. Seconds waited
+        Raises:
+            LockTimeout if the lock was not free within timeout_secs
+        """
+        backoff = backoff or Backoff()
+        start = time.time()
+        while not self.try_acquire():
+            if timeout_secs is not None and \
+                    time.time() - start >= timeout_secs:
+                raise LockTimeout(self.path, timeout_secs)
+            time.sleep(backoff.next_delay())
+        return time.time() - start
+
+    def release(self):
+        """
+        Releases the lock if this object holds it.
+        """
+        if self.held:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class NodeSlotScheduler(object):
+    """
+    Leases slots of nodes to tests, one slot per test at a time.
+    """
+
+    def __init__(self, lock_dir, slots):
+        """
+        Args:
+            lock_dir (str): directory of the lock files, shared by every
+                test process
+            slots (list): tuples of node filenames, see partition_slots
+        """
+        self.lock_dir = lock_dir
+        self.slots = slots
+
+    def plan_lock(self):
+        """
+        Returns a new FileLock on the plan lock.
+        """
+        return FileLock(os.path.join(self.lock_dir, 'sysparams_plan.lock'))
+
+    def lease(self, timeout_secs=None):
+        """
+        Description:
+            Waits for a free slot and takes it. Slots are tried in order,
+            so with fewer tests than slots the same nodes keep being used.
+        Args:
+            timeout_secs (float): how long to wait for, forever if None
+        Returns:
+            tuple. (slot nodes, FileLock to release when done, seconds
+            waited)
+        Raises:
+            ValueError if there are no slots
+            LockTimeout if no slot was free within timeout_secs
+        """
+        if not self.slots:
+            raise ValueError('No slots of nodes to lease')
+        locks = [FileLock(os.path.join(
+            self.lock_dir, 'sysparams_slot_{0}.lock'.format('_'.join(slot))))
+            for slot in self.slots]
+        backoff = Backoff()
+        start = time.time()
+        while True:
+            for slot, lock in zip(self.slots, locks):
+                if lock.try_acquire():
+                    return slot, lock, time.time() - start
+            if timeout_secs is not None and \
+                    time.time() - start >= timeout_secs:
+                raise LockTimeout(self.lock_dir, timeout_secs)
+            time.sleep(backoff.next_delay())
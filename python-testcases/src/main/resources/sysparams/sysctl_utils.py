@@ -0,0 +1,494 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Parsing helpers and expectations for sysctl keys, used to
+            verify /etc/sysctl.conf and kernel values on managed nodes.
+'''
+
+from collections import namedtuple
+
+FILE = 'file'
+KERNEL = 'kernel'
+
+KernelStateDiff = namedtuple('KernelStateDiff',
+                             ['added', 'removed', 'changed'])
+SysctlCheck = namedtuple('SysctlCheck', ['node', 'key', 'expectation'])
+# key is dotted and raw_key as written in the file; value is unquoted and
+# quote is the quote character removed, if any
+SysctlConfEntry = namedtuple('SysctlConfEntry',
+                             ['line_no', 'key', 'raw_key', 'value', 'quote',
+                              'ignore_errors', 'line'])
+CheckResult = namedtuple('CheckResult',
+                         ['node', 'key', 'expectation', 'passed', 'actual'])
+
+
+def normalize_value(value):
+    """
+    Description:
+        Collapses the whitespace of a sysctl value so that values read
+        from sysctl.conf and from the kernel (tab separated) compare equal.
+    Args:
+        value (str): sysctl value
+    Returns:
+        str. The normalized value
+    """
+    return ' '.join(value.split())
+
+
+def to_dotted_key(key):
+    """
+    Description:
+        Converts a slash separated key, e.g. net/ipv4/ip_forward, to the
+        dotted name the kernel reports it under. As sysctl does, dots in
+        a slash separated key are part of a name and become slashes, e.g.
+        net/ipv4/conf/eth0.100/rp_filter is net.ipv4.conf.eth0/100.rp_filter.
+    Args:
+        key (str): sysctl key
+    Returns:
+        str. The dotted key
+    """
+    if '/' not in key:
+        return key
+    return '.'.join(part.replace('.', '/') for part in key.split('/'))
+
+
+def unquote_value(value):
+    """
+    Description:
+        Removes one pair of matching quotes around a value.
+    Args:
+        value (str): stripped value
+    Returns:
+        tuple. (value, quote character or '' if it was not quoted)
+    """
+    if len(value) > 1 and value[0] in '\'"' and value[-1] == value[0]:
+        return value[1:-1], value[0]
+    return value, ''
+
+
+def parse_sysctl_conf_line(line, line_no=None):
+    """
+    Description:
+        Parses one line of sysctl.conf the way sysctl -p reads it: blank
+        lines and lines starting with # or ; are ignored, there are no
+        inline comments, a leading - on the key makes sysctl ignore
+        errors setting it, and the value runs to the end of the line.
+    Args:
+        line (str): line of sysctl.conf or of sysctl output
+        line_no (int): position of the line in its file
+    Returns:
+        SysctlConfEntry. The parsed line, or None when the line sets
+        nothing
+    """
+    stripped = line.strip()
+    if not stripped or stripped[0] in '#;' or '=' not in stripped:
+        return None
+    raw_key, value = stripped.split('=', 1)
+    raw_key = raw_key.strip()
+    ignore_errors = raw_key.startswith('-')
+    if ignore_errors:
+        raw_key = raw_key[1:].strip()
+    if not raw_key:
+        return None
+    value, quote = unquote_value(value.strip())
+    return SysctlConfEntry(line_no, to_dotted_key(raw_key), raw_key,
+                           normalize_value(value), quote, ignore_errors, line)
+
+
+def split_keyvalue(line):
+    """
+    Description:
+        Splits a "key = value" line into its key and value.
+    Args:
+        line (str): line of sysctl.conf or of sysctl output
+    Returns:
+        tuple. (key as written, unquoted value), or None when the line is
+        blank, a comment or not a key = value line
+    """
+    entry = parse_sysctl_conf_line(line)
+    return (entry.raw_key, entry.value) if entry else None
+
+
+def find_value(lines, key):
+    """
+    Description:
+        Finds the value set for key in lines; the last assignment wins,
+        as it does for sysctl -p.
+    Args:
+        lines (list): lines of sysctl.conf or of sysctl output
+        key (str): sysctl key, dotted or slash separated
+    Returns:
+        str. The value, or None if key is not set in lines
+    """
+    return SysctlConf(lines).get_value(key)
+
+
+class SysctlConf(object):
+    """
+    Parsed sysctl.conf, indexed by dotted key so that any number of keys
+    can be looked up in one pass over the file. Lines are kept as they
+    are, so a file rendered after set() or remove() differs from the
+    original only on the lines of the keys changed.
+    """
+
+    def __init__(self, lines):
+        """
+        Args:
+            lines (list): lines of the sysctl.conf file
+        """
+        self.lines = list(lines)
+        self._parse()
+
+    def _parse(self):
+        """
+        Builds the entries and the index from the lines.
+        """
+        self.entries = []
+        self.index = {}
+        for line_no, line in enumerate(self.lines):
+            entry = parse_sysctl_conf_line(line, line_no)
+            if entry:
+                self.entries.append(entry)
+                # The last assignment wins, as it does for sysctl -p
+                self.index[entry.key] = entry
+
+    def __contains__(self, key):
+        return to_dotted_key(key) in self.index
+
+    def keys(self):
+        """
+        Returns the dotted keys set in the file.
+        """
+        return list(self.index)
+
+    def get(self, key):
+        """
+        Description:
+            Returns the assignment of key that sysctl -p applies.
+        Args:
+            key (str): sysctl key, dotted or slash separated
+        Returns:
+            SysctlConfEntry. The last line setting key, None if none does
+        """
+        return self.index.get(to_dotted_key(key))
+
+    def occurrences(self, key):
+        """
+        Description:
+            Returns every assignment of key, in file order.
+        Args:
+            key (str): sysctl key, dotted or slash separated
+        Returns:
+            list. SysctlConfEntry of each line setting key
+        """
+        key = to_dotted_key(key)
+        return [entry for entry in self.entries if entry.key == key]
+
+    def get_line(self, key):
+        """
+        Description:
+            Returns the line that sets key.
+        Args:
+            key (str): sysctl key, dotted or slash separated
+        Returns:
+            str. The "key = value" line, or None if key is not set
+        """
+        entry = self.get(key)
+        return entry.line if entry else None
+
+    def get_value(self, key):
+        """
+        Description:
+            Returns the value set for key.
+        Args:
+            key (str): sysctl key, dotted or slash separated
+        Returns:
+            str. The unquoted, normalized value, or None if key is not set
+        """
+        entry = self.get(key)
+        return entry.value if entry else None
+
+    def get_many(self, keys):
+        """
+        Description:
+            Looks up many keys at once.
+        Args:
+            keys (iterable): sysctl keys, dotted or slash separated
+        Returns:
+            dict. key as given -> value, None for keys not set
+        """
+        return dict((key, self.get_value(key)) for key in keys)
+
+    def set(self, key, value):
+        """
+        Description:
+            Sets key to value on the line sysctl -p applies, keeping the
+            way the key is written there, or appends a line.
+        Args:
+            key (str): sysctl key, dotted or slash separated
+            value (str): new value
+        """
+        entry = self.get(key)
+        if entry is None:
+            self.lines.append('{0} = {1}'.format(key, value))
+        else:
+            self.lines[entry.line_no] = '{0}{1} = {2}{3}{2}'.format(
+                '-' if entry.ignore_errors else '', entry.raw_key,
+                entry.quote, value)
+        self._parse()
+
+    def remove(self, key):
+        """
+        Description:
+            Removes every line setting key.
+        Args:
+            key (str): sysctl key, dotted or slash separated
+        """
+        removed = set(entry.line_no for entry in self.occurrences(key))
+        self.lines = [line for line_no, line in enumerate(self.lines)
+                      if line_no not in removed]
+        self._parse()
+
+    def render(self):
+        """
+        Returns the file content, with a newline after every line.
+        """
+        return ''.join(line + '\n' for line in self.lines)
+
+
+class SysctlConfSnapshot(SysctlConf):
+    """
+    In-memory copy of the sysctl.conf of a node, taken at one point in
+    time.
+    """
+
+    def changed_keys(self, other):
+        """
+        Description:
+            Lists the keys of this snapshot whose value is different, or
+            missing, in another snapshot of the same file.
+        Args:
+            other (SysctlConfSnapshot): the other snapshot
+        Returns:
+            list. The sorted changed keys
+        """
+        return sorted(key for key in self.index
+                      if self.get_value(key) != other.get_value(key))
+
+
+class KernelState(object):
+    """
+    Values of every kernel parameter on a node at one point in time, as
+    reported by a single "sysctl -a".
+    """
+
+    def __init__(self, lines):
+        """
+        Args:
+            lines (list): output lines of sysctl -a
+        """
+        self.values = {}
+        for line in lines:
+            if ' = ' not in line:
+                continue
+            key, value = line.split(' = ', 1)
+            self.values[key.strip()] = value
+
+    def __contains__(self, key):
+        return to_dotted_key(key) in self.values
+
+    def __len__(self):
+        return len(self.values)
+
+    def get_value(self, key):
+        """
+        Description:
+            Returns the kernel value of key.
+        Args:
+            key (str): sysctl key, dotted or slash separated
+        Returns:
+            str. The normalized value, or None if the kernel does not
+            know the key
+        """
+        value = self.values.get(to_dotted_key(key))
+        return normalize_value(value) if value is not None else None
+
+    def get_line(self, key):
+        """
+        Description:
+            Returns key as "sysctl <key>" would print it.
+        Args:
+            key (str): sysctl key, dotted or slash separated
+        Returns:
+            str. The "key = value" line, or None if the kernel does not
+            know the key
+        """
+        key = to_dotted_key(key)
+        if key not in self.values:
+            return None
+        return '{0} = {1}'.format(key, self.values[key])
+
+    def diff(self, other):
+        """
+        Description:
+            Compares this capture with a later one.
+        Args:
+            other (KernelState): the later capture
+        Returns:
+            KernelStateDiff. added and removed map key to value, changed
+            maps key to an (old value, new value) tuple
+        """
+        added = dict((key, other.values[key])
+                     for key in set(other.values) - set(self.values))
+        removed = dict((key, self.values[key])
+                       for key in set(self.values) - set(other.values))
+        changed = {}
+        for key in set(self.values) & set(other.values):
+            old = normalize_value(self.values[key])
+            new = normalize_value(other.values[key])
+            if old != new:
+                changed[key] = (old, new)
+        return KernelStateDiff(added, removed, changed)
+
+
+class DriftReport(namedtuple('DriftReport',
+                             ['node', 'missing', 'mismatched',
+                              'kernel_mismatched', 'extra',
+                              'manually_edited', 'lost'])):
+    """
+    Differences between the sysparams the model holds for a node, its
+    sysctl.conf and its kernel. Each field maps a dotted key to:
+        missing: model value, the key is not in sysctl.conf
+        mismatched: (model value, sysctl.conf value)
+        kernel_mismatched: (model value, kernel value)
+        extra: sysctl.conf value of a key neither the model nor the
+            baseline sets
+        manually_edited: (baseline value, sysctl.conf value) of a key the
+            model does not set
+        lost: baseline value of a key the model does not set and that is
+            no longer in sysctl.conf
+    """
+    __slots__ = ()
+
+    CATEGORIES = ('missing', 'mismatched', 'kernel_mismatched', 'extra',
+                  'manually_edited', 'lost')
+
+    def problems(self):
+        """
+        Returns the non-empty categories as a dict.
+        """
+        return dict((name, getattr(self, name)) for name in self.CATEGORIES
+                    if getattr(self, name))
+
+
+def compute_drift(node, model, conf, kernel=None, baseline=None):
+    """
+    Description:
+        Compares the sysparams of a node in the model with its sysctl.conf
+        and kernel, visiting each key once.
+    Args:
+        node (str): node filename
+        model (dict): key -> value of the sysparams of the node
+        conf (SysctlConf): sysctl.conf of the node
+        kernel (KernelState): kernel capture of the node, None to skip
+            the kernel checks
+        baseline (SysctlConf): sysctl.conf before the session changed it,
+            None to report every unmanaged key as extra
+    Returns:
+        DriftReport. The differences
+    """
+    model = dict((to_dotted_key(key), normalize_value(value))
+                 for key, value in model.items())
+    missing, mismatched, kernel_mismatched = {}, {}, {}
+    for key, value in model.items():
+        file_value = conf.get_value(key)
+        if file_value is None:
+            missing[key] = value
+        elif file_value != value:
+            mismatched[key] = (value, file_value)
+        if kernel is not None and kernel.get_value(key) != value:
+            kernel_mismatched[key] = (value, kernel.get_value(key))
+
+    extra, manually_edited, lost = {}, {}, {}
+    for key in conf.keys():
+        if key in model:
+            continue
+        baseline_value = baseline.get_value(key) if baseline else None
+        if baseline_value is None:
+            extra[key] = conf.get_value(key)
+        elif baseline_value != conf.get_value(key):
+            manually_edited[key] = (baseline_value, conf.get_value(key))
+    for key in baseline.keys() if baseline else []:
+        if key not in model and key not in conf:
+            lost[key] = baseline.get_value(key)
+    return DriftReport(node, missing, mismatched, kernel_mismatched, extra,
+                       manually_edited, lost)
+
+
+class SysctlExpectation(object):
+    """
+    Expected state of a sysctl key, either in /etc/sysctl.conf (FILE) or
+    in the running kernel (KERNEL).
+    """
+
+    def __init__(self, source, present=True, value=None):
+        """
+        Args:
+            source (str): FILE or KERNEL
+            present (bool): whether the key is expected to be set
+            value (str): expected value, None to only check presence
+        """
+        self.source = source
+        self.present = present
+        self.value = normalize_value(value) if value is not None else None
+
+    def evaluate(self, actual):
+        """
+        Description:
+            Checks an observed value against the expectation.
+        Args:
+            actual (str): observed value, None if the key is not set
+        Returns:
+            bool. True if the expectation is met
+        """
+        if actual is None:
+            return not self.present
+        if not self.present:
+            return False
+        return self.value is None or normalize_value(actual) == self.value
+
+    def __repr__(self):
+        if not self.present:
+            return '<not in {0}>'.format(self.source)
+        if self.value is None:
+            return '<in {0}>'.format(self.source)
+        return '<in {0} = "{1}">'.format(self.source, self.value)
+
+
+def in_file(value=None):
+    """
+    Expects the key to be set in sysctl.conf, to value if given.
+    """
+    return SysctlExpectation(FILE, True, value)
+
+
+def not_in_file():
+    """
+    Expects the key not to be set in sysctl.conf.
+    """
+    return SysctlExpectation(FILE, False)
+
+
+def in_kernel(value=None):
+    """
+    Expects the key to be known to the kernel, with value if given.
+    """
+    return SysctlExpectation(KERNEL, True, value)
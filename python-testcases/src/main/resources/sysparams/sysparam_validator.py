@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Local copy of the validation the MS applies to sysparam items,
+            returning the same CLI error lines, so that property sets can
+            be checked without a round trip to the MS. Only a sample of
+            them then needs to be sent to the MS to confirm the two agree.
+'''
+
+from collections import OrderedDict
+import re
+
+from sysparam_xml_utils import parse_cli_props
+
+SYSPARAM_TYPE = 'sysparam'
+SYSPARAM_PROPERTIES = ('key', 'value')
+
+# Property types of the sysparam item type
+KEY_RE = re.compile(r'^[^,=\s]+$')
+VALUE_RE = re.compile(r'^.+$')
+PROPERTY_RES = (('key', KEY_RE), ('value', VALUE_RE))
+
+
+def not_allowed_error(name, item_type):
+    """
+    Returns the error line for a property item_type does not have.
+    """
+    return ('PropertyNotAllowedError in property: "{0}"    '
+            '"{0}" is not an allowed property of {1}'.format(name, item_type))
+
+
+def missing_required_error(name, item_type):
+    """
+    Returns the error line for a required property that is not set.
+    """
+    return ('MissingRequiredPropertyError in property: "{0}"    '
+            'ItemType "{1}" is required to have a property with '
+            'name "{0}"'.format(name, item_type))
+
+
+def invalid_value_error(name, value):
+    """
+    Returns the error line for a value its property type rejects.
+    """
+    return ('ValidationError in property: "{0}"    '
+            'Invalid value \'{1}\'.'.format(name, value))
+
+
+def validate_properties(properties, item_type=SYSPARAM_TYPE,
+                        allowed=SYSPARAM_PROPERTIES):
+    """
+    Description:
+        Validates the properties of an item as "litp create" and
+        "litp update" do.
+    Args:
+        properties (dict): property name -> value
+        item_type (str): item type; required properties and property
+            types are only checked for sysparam
+        allowed (tuple): properties item_type has
+    Returns:
+        list. CLI error lines, empty when the properties are valid
+    """
+    errors = [not_allowed_error(name, item_type) for name in properties
+              if name not in allowed]
+    if item_type != SYSPARAM_TYPE:
+        return errors
+    for name, regex in PROPERTY_RES:
+        if name not in properties:
+            errors.append(missing_required_error(name, item_type))
+        elif not regex.match(properties[name]):
+            errors.append(invalid_value_error(name, properties[name]))
+    return errors
+
+
+def validate_cli_props(props, item_type=SYSPARAM_TYPE,
+                       allowed=SYSPARAM_PROPERTIES):
+    """
+    Description:
+        Validates the properties of a "litp create".
+    Args:
+        props (str): properties as passed to litp create -o, e.g.
+            'key="kernel.msgmnb" value="65535"'
+        item_type (str): item type
+        allowed (tuple): properties item_type has
+    Returns:
+        list. CLI error lines, empty when the properties are valid
+    """
+    return validate_properties(parse_cli_props(props), item_type, allowed)
+
+
+def validate_update(properties, props, action_del=False,
+                    item_type=SYSPARAM_TYPE, allowed=SYSPARAM_PROPERTIES):
+    """
+    Description:
+        Validates a "litp update" of an item.
+    Args:
+        properties (dict): current properties of the item
+        props (str): properties to set, or with action_del a comma
+            separated list of properties to delete
+        action_del (bool): delete the properties in props
+        item_type (str): item type
+        allowed (tuple): properties item_type has
+    Returns:
+        tuple. (properties after the update, CLI error lines)
+    """
+    updated = dict(properties)
+    if action_del:
+        for name in (props or '').split(','):
+            updated.pop(name.strip(), None)
+    else:
+        updated.update(parse_cli_props(props))
+    return updated, validate_properties(updated, item_type, allowed)
+
+
+def validate_plan_params(sysparams):
+    """
+    Description:
+        Runs the create_plan validations of the sysparams plugin on the
+        sysparams of one sysparam-node-config.
+    Args:
+        sysparams (iterable): (path, key, applied key) tuples of the
+            sysparams not ForRemoval; applied key is None for sysparams
+            never applied
+    Returns:
+        list. CLI error lines, each path followed by its message
+    """
+    errors = []
+    by_key = OrderedDict()
+    for path, key, applied_key in sysparams:
+        by_key.setdefault(key, []).append(path)
+        if applied_key and applied_key != key:
+            errors.extend([
+                path, 'ValidationError    Create plan failed: The key '
+                'name "{0}" cannot be updated. Please remove the item and '
+                'recreate it.'.format(applied_key)])
+    for key, paths in by_key.items():
+        if len(paths) > 1:
+            for path in paths:
+                errors.extend([
+                    path, 'ValidationError    Create plan failed: '
+                    'Duplicate sysparam key: {0}'.format(key)])
+    return errors
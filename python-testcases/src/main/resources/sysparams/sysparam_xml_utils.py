@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Builds LITP load XML for sysparam items, so that any number of
+            sysparams can be created with a single "litp load --merge"
+            instead of one "litp create" each. Documents are streamed one
+            element at a time, so files of 100k sysparams never sit in
+            memory, and synthetic sysparams can be generated for them:
+                python sysparam_xml_utils.py out.xml 100000 \
+                    --mix valid=70,read_only=10,unknown=10,slash=10
+'''
+
+from collections import OrderedDict, namedtuple
+from xml.sax.saxutils import escape, quoteattr
+import argparse
+import io
+import random
+import shlex
+import xml.etree.ElementTree as ET
+
+LITP_NS = 'http://www.ericsson.com/litp'
+XSI_NS = 'http://www.w3.org/2001/XMLSchema-instance'
+SCHEMA_LOCATION = 'http://www.ericsson.com/litp litp-xml-schema/litp.xsd'
+
+PARAMS_COLLECTION_TAG = 'sysparam-node-config-params-collection'
+PARAMS_COLLECTION_ID = 'params'
+
+XML_HEADER = "<?xml version='1.0' encoding='utf-8'?>\n"
+
+SYSPARAM_TAG = '{%s}sysparam' % LITP_NS
+NODE_TAG = '{%s}node' % LITP_NS
+
+# added and removed map item id -> (key, value), updated maps item id ->
+# ((old key, old value), (new key, new value))
+SysparamDiff = namedtuple('SysparamDiff', ['added', 'removed', 'updated'])
+
+# Kinds of keys generate_sysparams can produce
+VALID = 'valid'
+READ_ONLY = 'read_only'
+UNKNOWN = 'unknown'
+SLASH = 'slash'
+KEY_KINDS = (VALID, READ_ONLY, UNKNOWN, SLASH)
+
+# Keys settable on every RHEL node
+DEFAULT_VALID_KEYS = (
+    'fs.file-max', 'kernel.msgmax', 'kernel.msgmnb', 'kernel.pid_max',
+    'kernel.shmall', 'kernel.shmmax', 'kernel.threads-max',
+    'net.core.rmem_max', 'net.core.wmem_max', 'net.ipv4.ip_forward',
+    'net.ipv4.ip_local_port_range', 'net.ipv4.tcp_mem',
+    'net.ipv4.tcp_rmem', 'net.ipv4.tcp_wmem', 'kernel.sem',
+    'vm.swappiness',
+)
+
+# Keys the kernel reports but does not let anyone set
+DEFAULT_READ_ONLY_KEYS = (
+    'net.ipv4.conf.default.mc_forwarding', 'net.ipv4.conf.all.mc_forwarding',
+    'fs.dentry-state', 'fs.file-nr', 'fs.inode-nr',
+)
+
+# Number of whitespace separated tokens in the values of multi-token keys
+MULTI_TOKEN_KEYS = {
+    'kernel.sem': 4,
+    'net.ipv4.ip_local_port_range': 2,
+    'net.ipv4.tcp_mem': 3,
+    'net.ipv4.tcp_rmem': 3,
+    'net.ipv4.tcp_wmem': 3,
+}
+
+
+def parse_cli_props(props):
+    """
+    Description:
+        Parses CLI properties, e.g. 'key="a b" value=1'.
+    Args:
+        props (str): properties as passed to litp create/update -o
+    Returns:
+        OrderedDict. property name -> value
+    """
+    properties = OrderedDict()
+    props = props or ''
+    # shlex of Python 2 only splits byte strings
+    encoded = not isinstance(props, str)
+    for token in shlex.split(props.encode('utf-8') if encoded else props):
+        if encoded:
+            token = token.decode('utf-8')
+        name, _, value = token.partition('=')
+        properties[name] = value
+    return properties
+
+
+def write_params_xml(out, params):
+    """
+    Description:
+        Writes a sysparam-node-config params collection, to be loaded
+        with --merge into a sysparam-node-config, one sysparam at a time.
+        The namespaces and schemaLocation are those of "litp export".
+    Args:
+        out (file): binary file object the UTF-8 document is written to
+        params (iterable): (item id, props) tuples, may be a generator;
+            props is a CLI property string, e.g.
+            'key="kernel.msgmnb" value="65535"', or a dict
+    Returns:
+        list. The item ids written
+    """
+    item_ids = []
+    out.write(XML_HEADER.encode('utf-8'))
+    out.write(u'<litp:{0} xmlns:xsi="{1}" xmlns:litp="{2}" '
+              u'xsi:schemaLocation="{3}" id="{4}">\n'.format(
+                  PARAMS_COLLECTION_TAG, XSI_NS, LITP_NS, SCHEMA_LOCATION,
+                  PARAMS_COLLECTION_ID).encode('utf-8'))
+    for item_id, props in params:
+        if not isinstance(props, dict):
+            props = parse_cli_props(props)
+        lines = [u'  <litp:sysparam id={0}>'.format(quoteattr(item_id))]
+        lines.extend(u'    <{0}>{1}</{0}>'.format(name, escape(value))
+                     for name, value in props.items())
+        lines.append(u'  </litp:sysparam>\n')
+        out.write(u'\n'.join(lines).encode('utf-8'))
+        item_ids.append(item_id)
+    out.write(u'</litp:{0}>\n'.format(PARAMS_COLLECTION_TAG).encode('utf-8'))
+    return item_ids
+
+
+def write_params_xml_file(path, params):
+    """
+    Description:
+        Streams a params collection document to a file.
+    Args:
+        path (str): file to write
+        params (iterable): (item id, props) tuples, see write_params_xml
+    Returns:
+        list. The item ids written
+    """
+    with open(path, 'wb') as xml_file:
+        return write_params_xml(xml_file, params)
+
+
+def build_params_xml(params):
+    """
+    Description:
+        Returns a params collection document as a string; use
+        write_params_xml_file for large documents.
+    Args:
+        params (iterable): (item id, props) tuples, see write_params_xml
+    Returns:
+        str. The XML document
+    """
+    out = io.BytesIO()
+    write_params_xml(out, params)
+    return out.getvalue().decode('utf-8')
+
+
+def iter_sysparams(source):
+    """
+    Description:
+        Reads the sysparams of a LITP XML document, whatever item it was
+        exported from, in constant memory: each element is dropped as
+        soon as it has been read.
+    Args:
+        source (str): path of the document, or a file object
+    Returns:
+        generator. (item id, key, value) tuples, in document order
+    """
+    for _, item_id, key, value in iter_node_sysparams(source):
+        yield item_id, key, value
+
+
+def iter_node_sysparams(source, parent_url=''):
+    """
+    Description:
+        Reads the sysparams of a LITP XML document with the URL of the
+        node each belongs to, in constant memory, so one export of
+        /deployments serves every node.
+    Args:
+        source (str): path of the document, or a file object
+        parent_url (str): URL of the parent of the exported item, '' for
+            an export of /deployments
+    Returns:
+        generator. (node URL, item id, key, value) tuples; the node URL
+        is None for sysparams outside any node
+    """
+    parents = []
+    for event, element in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            parents.append(element)
+            continue
+        parents.pop()
+        if element.tag == SYSPARAM_TAG:
+            node_url = None
+            for depth in range(len(parents) - 1, -1, -1):
+                if parents[depth].tag == NODE_TAG:
+                    node_url = parent_url + ''.join(
+                        '/' + parent.get('id')
+                        for parent in parents[:depth + 1])
+                    break
+            yield (node_url, element.get('id'), element.findtext('key'),
+                   element.findtext('value'))
+        elif parents and parents[-1].tag == SYSPARAM_TAG:
+            # Properties of a sysparam are read when the sysparam ends
+            continue
+        # Only the ids of the open elements are needed from here on
+        element.clear()
+        if parents:
+            # Earlier siblings are gone already, so this is O(1)
+            parents[-1].remove(element)
+
+
+def index_sysparams(source):
+    """
+    Description:
+        Indexes the sysparams of a LITP XML document by item id.
+    Args:
+        source (str): path of the document, or a file object
+    Returns:
+        dict. item id -> (key, value)
+    """
+    return dict((item_id, (key, value))
+                for item_id, key, value in iter_sysparams(source))
+
+
+def diff_sysparams(old, new):
+    """
+    Description:
+        Compares two sets of sysparams, e.g. an export and the re-export
+        after a load.
+    Args:
+        old (dict): item id -> (key, value), see index_sysparams
+        new (dict): item id -> (key, value)
+    Returns:
+        SysparamDiff. The sysparams added, removed and updated
+    """
+    added = dict((item_id, new[item_id]) for item_id in new
+                 if item_id not in old)
+    removed = dict((item_id, old[item_id]) for item_id in old
+                   if item_id not in new)
+    updated = dict((item_id, (old[item_id], new[item_id])) for item_id in old
+                   if item_id in new and old[item_id] != new[item_id])
+    return SysparamDiff(added, removed, updated)
+
+
+def generate_sysparams(count, mix=None, valid_keys=DEFAULT_VALID_KEYS,
+                       read_only_keys=DEFAULT_READ_ONLY_KEYS,
+                       value_digits=5, prefix='gen', seed=0):
+    """
+    Description:
+        Generates synthetic sysparams, lazily.
+    Args:
+        count (int): number of sysparams
+        mix (dict): relative weight of each kind of key in KEY_KINDS, all
+            valid if None. valid and read_only keys are taken in turn from
+            valid_keys and read_only_keys, so they repeat once the list is
+            used up; slash keys are valid keys written net/ipv4/ip_forward
+            style; unknown keys are unique names the kernel does not know
+        valid_keys (tuple): keys to use as valid and slash keys
+        read_only_keys (tuple): keys to use as read-only keys
+        value_digits (int): digits in each token of a value; keys in
+            MULTI_TOKEN_KEYS get values of several tokens
+        prefix (str): prefix of the item ids and unknown keys
+        seed (int): seed of the kinds and values; the same seed gives
+            the same document on the same Python version
+    Returns:
+        generator. (item id, OrderedDict of key and value) tuples
+    """
+    mix = mix or {VALID: 1}
+    kinds = [kind for kind in KEY_KINDS if mix.get(kind)]
+    total = float(sum(mix[kind] for kind in kinds))
+    rng = random.Random(seed)
+    low, high = 10 ** (value_digits - 1), 10 ** value_digits - 1
+    for index in range(count):
+        pick = rng.random() * total
+        for kind in kinds:
+            pick -= mix[kind]
+            if pick < 0:
+                break
+        if kind == READ_ONLY:
+            key = read_only_keys[index % len(read_only_keys)]
+        elif kind == UNKNOWN:
+            key = 'kernel.{0}_unknown{1}'.format(prefix, index)
+        else:
+            key = valid_keys[index % len(valid_keys)]
+        tokens = MULTI_TOKEN_KEYS.get(key, 1)
+        if kind == SLASH:
+            key = key.replace('.', '/')
+        value = ' '.join(str(rng.randint(low, high)) for _ in range(tokens))
+        yield '{0}_{1}'.format(prefix, index), \
+            OrderedDict([('key', key), ('value', value)])
+
+
+def generate_duplicate_sysparams(count, duplicate_ratio, group_size=2,
+                                 prefix='dup', seed=0):
+    """
+    Description:
+        Generates sysparams with unknown keys of which a given share are
+        duplicates, lazily.
+    Args:
+        count (int): number of sysparams
+        duplicate_ratio (float): share of the sysparams whose key is also
+            the key of another sysparam, rounded down to whole groups
+        group_size (int): number of sysparams sharing each duplicate key
+        prefix (str): prefix of the item ids and keys
+        seed (int): seed of which sysparams are duplicates
+    Returns:
+        generator. (item id, OrderedDict of key and value) tuples
+    """
+    duplicates = int(round(count * duplicate_ratio)) // group_size
+    indexes = random.Random(seed).sample(range(count),
+                                         duplicates * group_size)
+    groups = dict((index, position // group_size)
+                  for position, index in enumerate(indexes))
+    for index, (item_id, props) in enumerate(generate_sysparams(
+            count, {UNKNOWN: 1}, prefix=prefix, seed=seed)):
+        if index in groups:
+            props['key'] = 'kernel.{0}_duplicate{1}'.format(prefix,
+                                                            groups[index])
+        yield item_id, props
+
+
+def parse_mix(mix):
+    """
+    Description:
+        Parses a key mix such as "valid=70,unknown=30".
+    Args:
+        mix (str): comma separated kind=weight pairs
+    Returns:
+        dict. kind -> weight
+    """
+    weights = {}
+    for pair in mix.split(','):
+        kind, _, weight = pair.partition('=')
+        if kind not in KEY_KINDS:
+            raise ValueError('Unknown key kind "{0}", expected one of {1}'
+                             .format(kind, ', '.join(KEY_KINDS)))
+        weights[kind] = float(weight or 1)
+    return weights
+
+
+if __name__ == '__main__':
+    PARSER = argparse.ArgumentParser(
+        description='Write a synthetic sysparam params collection')
+    PARSER.add_argument('path', help='XML file to write')
+    PARSER.add_argument('count', type=int, help='number of sysparams')
+    PARSER.add_argument('--mix', type=parse_mix, default=None,
+                        help='key kind weights, e.g. valid=90,unknown=10')
+    PARSER.add_argument('--value-digits', type=int, default=5)
+    PARSER.add_argument('--prefix', default='gen')
+    PARSER.add_argument('--seed', type=int, default=0)
+    ARGS = PARSER.parse_args()
+    write_params_xml_file(ARGS.path, generate_sysparams(
+        ARGS.count, ARGS.mix, value_digits=ARGS.value_digits,
+        prefix=ARGS.prefix, seed=ARGS.seed))
@@ -0,0 +1,1289 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Helpers shared by the sysparams testsets. SysparamsMixin is
+            mixed into GenericTest subclasses which set self.redhatutils
+            in their setUp.
+            With $SYSPARAMS_SLOT_SIZE set, e.g. to 2, tests may run
+            concurrently (nosetests --processes=N): each test gets a slot
+            of that many nodes to itself, and model changes and plans are
+            serialized between tests. $SYSPARAMS_LOCK_DIR, the system temp
+            directory by default, must be shared by all test processes.
+'''
+
+from collections import OrderedDict, namedtuple
+from cli_error_utils import CliErrorIndex, parse_cli_errors, \
+    parse_error_line
+from coalesce_utils import CREATE, REMOVE, UPDATE, PlanCoalescer
+from command_utils import CommandBatch
+from parallel_utils import NodeTaskError, run_by_node
+from slot_utils import NodeSlotScheduler, partition_slots
+from timing_utils import RemoteCallStats, StepProfiler, WaitMetrics, \
+    wait_until
+from pipes import quote
+from sysparam_xml_utils import diff_sysparams, index_sysparams, \
+    iter_node_sysparams, write_params_xml_file
+import json
+import os
+import tempfile
+import time
+import plan_utils
+import sysctl_utils
+import test_constants
+
+SysctlBaseline = namedtuple('SysctlBaseline', ['checksum', 'snapshot'])
+NodeTopology = namedtuple('NodeTopology',
+                          ['url', 'filename', 'configs', 'sysparam_config'])
+
+
+class SysparamsMixin(object):
+    """
+    GenericTest helpers for verifying sysparams on managed nodes.
+    """
+
+    PUPPET_RUNONCE_CMD = '/usr/bin/mco puppet runonce -I {0}'
+    STAT_MTIME_CMD = "/usr/bin/stat -c '%y %s' {0}"
+    MD5SUM_CMD = '/usr/bin/md5sum {0}'
+    # Copy of sysctl.conf on a node while a test may change it, one per
+    # test process
+    SYSCTL_BASELINE_FILE = '/tmp/sysctl.conf.sysparams_baseline_{0}'
+    # Files of the test in /tmp on the MS, see _ms_tmp_file
+    DRIFT_EXPORT_FILE = 'drift_export.xml'
+    BATCH_XML_FILE = 'batch.xml'
+    SAVED_PARAMS_FILE = 'saved_params_{0}.xml'
+    # Families of kernel parameters that hold a tunable value which reads
+    # back in the form it is written in and that the kernel leaves alone;
+    # status and counter parameters such as fs.binfmt_misc.status or
+    # kernel.ns_last_pid are not in them
+    SETTABLE_SYSCTL_PREFIXES = (
+        'kernel.msg', 'kernel.sem', 'kernel.shm', 'kernel.pid_max',
+        'kernel.threads-max', 'kernel.panic', 'fs.file-max',
+        'fs.aio-max-nr', 'fs.inotify.', 'vm.', 'net.core.',
+        'net.ipv4.tcp_', 'net.ipv4.udp_', 'net.ipv4.ip_local_port_range',
+        'net.ipv4.conf.all.', 'net.ipv4.conf.default.',
+        'net.ipv4.neigh.default.', 'net.ipv6.conf.all.',
+        'net.ipv6.conf.default.', 'net.unix.')
+    # Parameters of those families that trigger an action when written
+    SYSCTL_ACTION_KEYS = ('vm.drop_caches', 'vm.compact_memory',
+                          'net.ipv4.route.flush', 'net.ipv6.route.flush')
+
+    # sysctl.conf of each node as it was when the session first used it
+    sysctl_baselines = {}
+
+    # NodeTopology of each node of the deployment, found once per session
+    # and dropped only when a test adds, removes or replaces node items
+    topology = None
+    TOPOLOGY_ITEM_TYPES = ('node', 'collection-of-node-config',
+                           'sysparam-node-config')
+
+    # How long a test waits for a slot of nodes or the plan lock
+    LOCK_TIMEOUT_SECS = 4 * 60 * 60
+
+    # Idle waits of every test in the session. The summary is also
+    # written to $SYSPARAMS_METRICS_FILE as JSON when it is set.
+    wait_metrics = WaitMetrics()
+
+    # Latency of every command run in the session, written to
+    # $SYSPARAMS_REMOTE_STATS_FILE as JSON when it is set
+    remote_call_stats = RemoteCallStats()
+
+    def setUp(self):
+        """
+        Starts profiling the numbered steps of the test. The timeline of
+        each test is written to $SYSPARAMS_PROFILE_DIR when it is set.
+        """
+        self.step_profiler = StepProfiler(self._testMethodName)
+        self.remote_calls = RemoteCallStats()
+        # Per-test caches: node -> SysctlConfSnapshot, node -> KernelState
+        # and node -> hostname
+        self._sysctl_conf_snapshots = {}
+        self._kernel_states = {}
+        self._hostnames = {}
+        # Nodes whose sysctl.conf is restored when the test ends
+        self._sysctl_nodes_in_use = []
+        # sysparam-node-config -> export of its params on the MS
+        self._saved_params = OrderedDict()
+        # Filenames of the slot of nodes, and the locks held, while tests
+        # run concurrently
+        self._slot = None
+        self._slot_lock = None
+        self._plan_lock = None
+        super(SysparamsMixin, self).setUp()
+
+    def tearDown(self):
+        """
+        Restores sysctl.conf on the nodes the test saved it on, once
+        GenericTest has removed the items the test created, and logs the
+        idle waits of the session so far and the slowest steps.
+        """
+        self.step_profiler.start_step('teardown', 'clean up after the test')
+        try:
+            try:
+                # Cleaning up changes the model and may run a plan
+                self._acquire_plan_lock()
+                self._restore_params_collections()
+            finally:
+                # GenericTest cleans up the items and collects the logs
+                # even if the params could not be put back
+                try:
+                    self._acquire_plan_lock()
+                finally:
+                    super(SysparamsMixin, self).tearDown()
+        finally:
+            try:
+                self._release_plan_lock()
+                self._restore_sysctl_conf()
+            finally:
+                # A slot kept after a failed restore would block the next
+                # test of the process until the lock timeout
+                self._release_slot()
+            self._report_step_profile()
+            self._report_remote_calls()
+            self.log('info', 'Idle waits so far: {0}'.format(
+                self.wait_metrics.summary()))
+            if os.environ.get('SYSPARAMS_METRICS_FILE'):
+                self.wait_metrics.dump(
+                    os.environ['SYSPARAMS_METRICS_FILE'])
+
+    def _report_step_profile(self):
+        """
+        Logs the slowest steps of the test and writes its timeline as
+        JSON and folded stacks to $SYSPARAMS_PROFILE_DIR when it is set.
+        """
+        self.step_profiler.finish()
+        for step in self.step_profiler.slowest():
+            self.log('info', 'Slow step {0} "{1}": {2}s, {3} commands, '
+                     'waits {4}'.format(step['step'], step['label'],
+                                        step['seconds'], step['round_trips'],
+                                        step['waits']))
+        if os.environ.get('SYSPARAMS_PROFILE_DIR'):
+            self.step_profiler.dump(os.environ['SYSPARAMS_PROFILE_DIR'])
+
+    def _report_remote_calls(self):
+        """
+        Logs the latency of the commands the test ran and writes the
+        session totals to $SYSPARAMS_REMOTE_STATS_FILE when it is set.
+        """
+        summary = self.remote_calls.summary()
+        if summary:
+            self.log('info', 'Remote calls: {0} in {1}s, mean {2}ms, p95 '
+                     '{3}ms, by command {4}'.format(
+                         summary['calls'], summary['seconds'],
+                         summary['mean_ms'], summary['p95_ms'],
+                         dict((name, stats['calls']) for name, stats in
+                              summary['by_command'].items())))
+        if os.environ.get('SYSPARAMS_REMOTE_STATS_FILE'):
+            self.remote_call_stats.dump(
+                os.environ['SYSPARAMS_REMOTE_STATS_FILE'])
+
+    def _write_benchmark(self, data):
+        """
+        Description:
+            Adds the results of a benchmark, under the name of the test,
+            to the JSON file $SYSPARAMS_BENCHMARK_FILE when it is set.
+        Args:
+            data (dict): the results
+        """
+        path = os.environ.get('SYSPARAMS_BENCHMARK_FILE')
+        if not path:
+            return
+        benchmarks = {}
+        if os.path.exists(path):
+            with open(path) as benchmark_file:
+                benchmarks = json.load(benchmark_file)
+        benchmarks[self._testMethodName] = data
+        with open(path, 'w') as benchmark_file:
+            json.dump(benchmarks, benchmark_file, indent=2, sort_keys=True)
+
+    def log(self, level, msg, *args, **kwargs):
+        """
+        Logs msg, starting a new profiled step if it is a numbered step.
+        """
+        self.step_profiler.observe(msg)
+        return super(SysparamsMixin, self).log(level, msg, *args, **kwargs)
+
+    def run_command(self, node, cmd, add_to_cleanup=True, su_root=False,
+                    *args, **kwargs):
+        """
+        Runs a command on a node, counting it in the current step and
+        recording its latency under su_root whether it is passed by
+        position or by name.
+        """
+        self.step_profiler.count_round_trip()
+        start = time.time()
+        try:
+            return super(SysparamsMixin, self).run_command(
+                node, cmd, add_to_cleanup, su_root, *args, **kwargs)
+        finally:
+            seconds = time.time() - start
+            self.remote_calls.record(node, cmd, seconds, su_root)
+            self.remote_call_stats.record(node, cmd, seconds, su_root)
+
+    def _run_command_batch(self, node, cmds, su_root=True):
+        """
+        Description:
+            Runs several commands on a node in one round trip.
+        Args:
+            node (str): node filename
+            cmds (list): command lines, run in order whatever their
+                return codes
+            su_root (bool): run the commands as root
+        Returns:
+            list. CommandResult of each command, which unpacks as the
+            (stdout, stderr, rc) of run_command
+        """
+        batch = CommandBatch()
+        for cmd in cmds:
+            batch.add(cmd)
+        stdout, stderr, rc = self.run_command(node, batch.command(),
+                                              su_root=su_root)
+        self.assertEquals([], stderr)
+        self.assertEquals(0, rc)
+        return batch.parse(stdout)
+
+    def _record_wait(self, kind, seconds):
+        """
+        Records an idle wait in the session metrics and the current step.
+        """
+        self.wait_metrics.record(kind, seconds)
+        self.step_profiler.record_wait(kind, seconds)
+
+    def _get_topology(self):
+        """
+        Description:
+            Returns the nodes of the deployment with their node-config
+            collection and sysparam-node-config, looking them up on the MS
+            only the first time in the session.
+        Returns:
+            list. NodeTopology of each node, in "litp find" order
+        """
+        if SysparamsMixin.topology is None:
+            node_urls = self.find(self.test_ms, '/deployments', 'node', True)
+            configs = self.find(self.test_ms, '/deployments',
+                                'collection-of-node-config')
+            sysparam_configs = self.find(self.test_ms, '/deployments',
+                                         'sysparam-node-config')
+
+            def under(url, paths):
+                """
+                Returns the first of paths below url, None if there is none.
+                """
+                return next((path for path in paths
+                             if path.startswith(url + '/')), None)
+
+            SysparamsMixin.topology = [
+                NodeTopology(url,
+                             self.get_node_filename_from_url(self.test_ms,
+                                                             url),
+                             under(url, configs),
+                             under(url, sysparam_configs))
+                for url in node_urls]
+        return SysparamsMixin.topology
+
+    def _get_node_topology(self, index):
+        """
+        Description:
+            Returns one node of the slot of the test, see _get_slot.
+        Args:
+            index (int): position of the node in the slot
+        Returns:
+            NodeTopology. The node
+        """
+        topology = self._get_slot()
+        self.assertTrue(
+            len(topology) > index,
+            'The LITP Tree has less than {0} nodes defined'.format(index + 1))
+        return topology[index]
+
+    @staticmethod
+    def _slot_size():
+        """
+        Returns the nodes per slot, 0 when tests run one at a time.
+        """
+        return int(os.environ.get('SYSPARAMS_SLOT_SIZE') or 0)
+
+    def _get_scheduler(self):
+        """
+        Returns the NodeSlotScheduler of the nodes of the deployment.
+        """
+        return NodeSlotScheduler(
+            os.environ.get('SYSPARAMS_LOCK_DIR') or tempfile.gettempdir(),
+            partition_slots([node.filename for node in self._get_topology()],
+                            self._slot_size()))
+
+    def _get_slot(self):
+        """
+        Description:
+            Returns the nodes the test may change. When tests run one at a
+            time these are all nodes of the deployment; otherwise the
+            test waits for a free slot of nodes and keeps it until it
+            ends.
+        Returns:
+            list. NodeTopology of each node of the slot
+        """
+        if not self._slot_size():
+            return self._get_topology()
+        if self._slot is None:
+            slot, lock, waited = self._get_scheduler().lease(
+                self.LOCK_TIMEOUT_SECS)
+            self._record_wait('slot', waited)
+            self.log('info', 'Leased nodes {0} after {1:.1f}s'.format(
+                ', '.join(slot), waited))
+            self._slot_lock = lock
+            self._slot = slot
+        # Looked up each time, so the slot follows _invalidate_topology
+        return [node for node in self._get_topology()
+                if node.filename in self._slot]
+
+    def _release_slot(self):
+        """
+        Gives the slot of the test back.
+        """
+        lock, self._slot_lock, self._slot = self._slot_lock, None, None
+        if lock:
+            lock.release()
+
+    def _acquire_plan_lock(self):
+        """
+        Description:
+            Takes the plan lock, when tests run concurrently, before the
+            test changes the model. The model and plan are shared, so the
+            lock is held until a plan of the test has left the model
+            applied, or until the test ends when its plan fails or it
+            leaves changes that are never planned. Does nothing if the
+            test holds the lock already.
+        """
+        if not self._slot_size() or self._plan_lock is not None:
+            return
+        # Slot before plan lock, as everywhere else, so that two tests
+        # never wait on each other's locks
+        self._get_slot()
+        lock = self._get_scheduler().plan_lock()
+        waited = lock.acquire(self.LOCK_TIMEOUT_SECS)
+        self._record_wait('plan_lock', waited)
+        self._plan_lock = lock
+
+    def _release_plan_lock(self):
+        """
+        Releases the plan lock if the test holds it.
+        """
+        lock, self._plan_lock = self._plan_lock, None
+        if lock:
+            lock.release()
+
+    def _release_plan_lock_if_applied(self):
+        """
+        Releases the plan lock once a plan has left the whole model
+        applied. A failed plan leaves items of the test in the shared
+        model that would fail the plans of other tests, so the lock is
+        then kept until tearDown has restored the model.
+        """
+        if self._plan_lock is not None and self.is_all_applied(self.test_ms):
+            self._release_plan_lock()
+
+    def _create_run_plan(self, expected_state=test_constants.PLAN_COMPLETE,
+                         timeout_mins=30):
+        """
+        Description:
+            Creates and runs a plan and waits for it to end.
+        Args:
+            expected_state (int): test_constants plan state expected
+            timeout_mins (int): how long to wait for the plan
+        Returns:
+            bool. True if the plan ended in expected_state
+        """
+        self.execute_cli_createplan_cmd(self.test_ms)
+        self.execute_cli_runplan_cmd(self.test_ms)
+        return self._wait_for_plan(expected_state, timeout_mins)
+
+    @staticmethod
+    def _invalidate_topology():
+        """
+        Drops the topology so that it is looked up again when next used.
+        """
+        SysparamsMixin.topology = None
+
+    def _touches_topology(self, url):
+        """
+        Returns True if url is, or contains, a node item of the topology.
+        """
+        for node in SysparamsMixin.topology or []:
+            for path in (node.url, node.configs, node.sysparam_config):
+                if path is not None and (path + '/').startswith(
+                        url.rstrip('/') + '/'):
+                    return True
+        return False
+
+    @staticmethod
+    def _ms_tmp_file(name):
+        """
+        Returns the path in /tmp on the MS of a file of the test. The
+        model is shared, so the files of tests running concurrently, each
+        in a process of its own, are kept apart by the process id.
+        """
+        return '/tmp/sysparams_{0}_{1}'.format(os.getpid(), name)
+
+    def _copy_params_xml_to_ms(self, params, filename):
+        """
+        Description:
+            Streams a params collection document to a local file and
+            copies it to /tmp on the MS.
+        Args:
+            params (iterable): (item id, props) tuples, may be a generator
+            filename (str): name of the file, see _ms_tmp_file
+        Returns:
+            tuple. (path of the file on the MS, item ids written)
+        """
+        handle, local_path = tempfile.mkstemp(suffix='.xml')
+        os.close(handle)
+        try:
+            item_ids = write_params_xml_file(local_path, params)
+            remote_path = self._ms_tmp_file(filename)
+            self.assertTrue(self.copy_file_to(
+                self.test_ms, local_path, remote_path, root_copy=True))
+        finally:
+            os.remove(local_path)
+        return remote_path, item_ids
+
+    def _export_sysparams(self, url, filename):
+        """
+        Description:
+            Exports an item and indexes the sysparams in the export. The
+            export is parsed incrementally, so its size does not matter.
+        Args:
+            url (str): item to export
+            filename (str): file the export is written to on the MS
+        Returns:
+            dict. item id -> (key, value) of every sysparam in the export
+        """
+        self.execute_cli_export_cmd(self.test_ms, url, filename)
+        handle, local_path = tempfile.mkstemp(suffix='.xml')
+        os.close(handle)
+        try:
+            self.assertTrue(self.download_file_from_node(
+                self.test_ms, filename, local_path, root_copy=True))
+            return index_sysparams(local_path)
+        finally:
+            os.remove(local_path)
+
+    def _assert_cli_errors(self, lines, expected):
+        """
+        Description:
+            Asserts that a litp command reported the expected errors, in
+            any order.
+        Args:
+            lines (list): stderr lines of the command
+            expected (list): dicts of an expected error: 'path' the error
+                is reported on, or None, and 'msg' the error line
+        Returns:
+            CliErrorIndex. The reported errors
+        """
+        index = CliErrorIndex(parse_cli_errors(lines))
+        missing = index.unmatched(parse_error_line(result['msg'],
+                                                   result['path'])
+                                  for result in expected)
+        self.assertEqual(
+            [], missing, 'Expected errors not reported:\n' + '\n'.join(
+                '{0}, found on the path: {1}'.format(
+                    error, index.find(error.path, error.error_type))
+                for error in missing))
+        return index
+
+    def _assert_sysparam_diff(self, old, new, added=(), removed=(),
+                              updated=()):
+        """
+        Description:
+            Asserts exactly which sysparams differ between two indexes.
+        Args:
+            old (dict): item id -> (key, value), see _export_sysparams
+            new (dict): item id -> (key, value)
+            added (iterable): ids expected only in new
+            removed (iterable): ids expected only in old
+            updated (iterable): ids expected in both with another key or
+                value
+        """
+        diff = diff_sysparams(old, new)
+        self.assertEqual(
+            (sorted(added), sorted(removed), sorted(updated)),
+            (sorted(diff.added), sorted(diff.removed), sorted(diff.updated)),
+            'Unexpected sysparam changes (added, removed, updated): '
+            '{0}'.format(diff))
+
+    def _get_model_sysparams(self):
+        """
+        Description:
+            Reads the sysparams of every node from a single export of
+            /deployments.
+        Returns:
+            dict. node filename -> dict of key -> value
+        """
+        filenames = dict((node.url, node.filename)
+                         for node in self._get_topology())
+        model = dict((filename, {}) for filename in filenames.values())
+        export_file = self._ms_tmp_file(self.DRIFT_EXPORT_FILE)
+        self.execute_cli_export_cmd(self.test_ms, '/deployments',
+                                    export_file)
+        handle, local_path = tempfile.mkstemp(suffix='.xml')
+        os.close(handle)
+        try:
+            self.assertTrue(self.download_file_from_node(
+                self.test_ms, export_file, local_path,
+                root_copy=True))
+            for node_url, _, key, value in iter_node_sysparams(local_path):
+                if node_url in filenames:
+                    model[filenames[node_url]][key] = value
+        finally:
+            os.remove(local_path)
+        return model
+
+    def _report_sysctl_drift(self, nodes=None):
+        """
+        Description:
+            Compares the sysparams of the model with sysctl.conf, the
+            kernel and the session baseline of each node. It costs one
+            export on the MS and one sysctl -a and one file read per node,
+            run on all nodes concurrently.
+        Args:
+            nodes (list): node filenames, the nodes of the slot of the
+                test if None
+        Returns:
+            dict. node filename -> DriftReport
+        """
+        if nodes is None:
+            nodes = [node.filename for node in self._get_slot()]
+        model = self._get_model_sysparams()
+        kernel_states = self._capture_kernel_state(nodes)
+        try:
+            confs = run_by_node(
+                lambda node, _: self._get_sysctl_conf_snapshot(node),
+                dict((node, None) for node in nodes))
+        except NodeTaskError as err:
+            self.fail(str(err))
+
+        reports = {}
+        for node in nodes:
+            baseline = self.sysctl_baselines.get(node)
+            reports[node] = sysctl_utils.compute_drift(
+                node, model.get(node, {}), confs[node], kernel_states[node],
+                baseline.snapshot if baseline else None)
+            problems = reports[node].problems()
+            if problems:
+                self.log('info', 'sysctl drift on {0}: {1}'.format(
+                    node, problems))
+        return reports
+
+    def _assert_no_sysctl_drift(self, nodes=None, manually_edited=None):
+        """
+        Description:
+            Asserts that sysctl.conf and the kernel of nodes hold exactly
+            what the model and the session baseline say, apart from the
+            keys the test edited by hand.
+        Args:
+            nodes (list): node filenames, the nodes of the slot of the
+                test if None
+            manually_edited (dict): node filename -> keys the test edited
+                in sysctl.conf by hand
+        """
+        manually_edited = manually_edited or {}
+        for node, report in self._report_sysctl_drift(nodes).items():
+            problems = report.problems()
+            edited = problems.pop('manually_edited', {})
+            self.assertEqual({}, problems,
+                             'sysctl drift on {0}: {1}'.format(node, problems))
+            self.assertEqual(
+                sorted(sysctl_utils.to_dotted_key(key)
+                       for key in manually_edited.get(node, [])),
+                sorted(edited),
+                'Unexpected manual edits on {0}: {1}'.format(node, edited))
+
+    def _save_params_collection(self, sysparam_config):
+        """
+        Description:
+            Exports the params of a sysparam-node-config to the MS, once
+            per test, so that _reset_params_collection can put them back.
+        Args:
+            sysparam_config (str): sysparam-node-config path
+        """
+        saved = self._saved_params
+        if sysparam_config not in saved:
+            filename = self._ms_tmp_file(
+                self.SAVED_PARAMS_FILE.format(len(saved)))
+            self.execute_cli_export_cmd(
+                self.test_ms, sysparam_config + '/params', filename)
+            saved[sysparam_config] = filename
+
+    def _reset_params_collection(self, sysparam_config):
+        """
+        Description:
+            Puts back the params saved by _save_params_collection with a
+            single --replace load. Sysparams created since are removed.
+        Args:
+            sysparam_config (str): sysparam-node-config path
+        """
+        self.execute_cli_load_cmd(
+            self.test_ms, sysparam_config,
+            self._saved_params[sysparam_config], '--replace')
+
+    def _restore_params_collections(self):
+        """
+        Resets every params collection the test saved, running a plan if
+        sysparams that had been applied are now ForRemoval.
+        """
+        if not self._saved_params:
+            return
+        for sysparam_config in self._saved_params:
+            self._reset_params_collection(sysparam_config)
+        self._saved_params = OrderedDict()
+        if not self.is_all_applied(self.test_ms):
+            self.assertTrue(self._create_run_plan())
+
+    def _create_system_params(self, sysparam_config, params):
+        """
+        Description:
+            Creates any number of sysparams under a sysparam-node-config
+            with one "litp load --merge" rather than one "litp create"
+            each. The params of the sysparam-node-config are put back
+            when the test ends.
+        Args:
+            sysparam_config (str): sysparam-node-config path
+            params (iterable): (item id, props) tuples, props as for
+                "litp create", e.g. 'key="kernel.msgmnb" value="65535"',
+                or a dict; may be a generator
+        Returns:
+            list. The paths of the sysparams
+        """
+        self._save_params_collection(sysparam_config)
+        xml_path, item_ids = self._copy_params_xml_to_ms(
+            params, self.BATCH_XML_FILE)
+        self.execute_cli_load_cmd(self.test_ms, sysparam_config, xml_path,
+                                  '--merge')
+        return ['{0}/params/{1}'.format(sysparam_config, item_id)
+                for item_id in item_ids]
+
+    def _apply_model_changes(self, changes):
+        """
+        Description:
+            Applies model changes, with a single "litp load --merge" per
+            sysparam-node-config for all the sysparams created.
+        Args:
+            changes (list): coalesce_utils.ModelChange tuples
+        """
+        creates = OrderedDict()
+        for change in changes:
+            path = '{0}/params/{1}'.format(change.sysparam_config,
+                                           change.item_id)
+            if change.action == CREATE:
+                creates.setdefault(change.sysparam_config, []).append(
+                    (change.item_id, change.props))
+            elif change.action == UPDATE:
+                self.execute_cli_update_cmd(
+                    self.test_ms, path, ' '.join(
+                        '{0}="{1}"'.format(name, value)
+                        for name, value in sorted(change.props.items())))
+            elif change.action == REMOVE:
+                self.execute_cli_remove_cmd(self.test_ms, path)
+            else:
+                raise ValueError('Unknown model change "{0}"'.format(
+                    change.action))
+        for sysparam_config, params in creates.items():
+            self._create_system_params(sysparam_config, params)
+
+    def _run_coalesced(self, coalescer):
+        """
+        Description:
+            Runs the steps gathered in a PlanCoalescer with one plan per
+            batch of compatible steps instead of one per step, verifies
+            the checks of each batch together and fails once, naming the
+            scenario that owns each failed sysctl or model check.
+        Args:
+            coalescer (PlanCoalescer): the steps to run
+        Returns:
+            int. The number of plans run
+        """
+        failures = OrderedDict()
+        batches = coalescer.batches()
+        self.log('info', 'Coalesced {0} steps into {1} plans'.format(
+            len(coalescer.steps), len(batches)))
+        for index, batch in enumerate(batches):
+            owners = sorted(set(step.owner for step in batch))
+            self.log('info', '{0}. Plan for {1}'.format(
+                index + 1, ', '.join(owners)))
+            changes = [change for step in batch for change in step.changes]
+            if changes:
+                self._apply_model_changes(changes)
+                if not self._create_run_plan():
+                    # Later batches build on this one, so stop here
+                    for owner in owners:
+                        failures.setdefault(owner, []).append(
+                            'plan {0} failed'.format(index + 1))
+                    break
+            results = self._verify_sysctl_checks(
+                [check for step in batch for check in step.checks])
+            for owner, failed in PlanCoalescer.attribute(
+                    batch, results).items():
+                failures.setdefault(owner, []).extend(
+                    '{0}: {1} expected {2}, found "{3}"'.format(
+                        result.node, result.key, result.expectation,
+                        result.actual) for result in failed)
+            model_checks = [(step.owner, check) for step in batch
+                            for check in step.model_checks]
+            if model_checks:
+                # One export of the model serves every check of the batch
+                model = dict(
+                    (node, dict((sysctl_utils.to_dotted_key(key), value)
+                                for key, value in sysparams.items()))
+                    for node, sysparams in self._get_model_sysparams().items())
+                for owner, check in model_checks:
+                    actual = model.get(check.node, {}).get(
+                        sysctl_utils.to_dotted_key(check.key))
+                    if actual != check.value:
+                        failures.setdefault(owner, []).append(
+                            '{0}: {1} expected "{2}" in the model, found '
+                            '"{3}"'.format(check.node, check.key,
+                                           check.value, actual))
+        self.assertEqual(OrderedDict(), failures, 'Failed scenarios:\n' +
+                         '\n'.join('{0}: {1}'.format(owner, msgs)
+                                   for owner, msgs in failures.items()))
+        return len(batches)
+
+    def _get_sysctl_conf_snapshot(self, node):
+        """
+        Description:
+            Returns the sysctl.conf snapshot of a node, reading the file
+            from the node only if there is no valid snapshot yet.
+        Args:
+            node (str): node filename
+        Returns:
+            SysctlConfSnapshot. The parsed file
+        """
+        snapshots = self._sysctl_conf_snapshots
+        if node not in snapshots:
+            # sysctl.conf is world readable, so no su round trip
+            lines = self.get_file_contents(
+                node, test_constants.SYSCTL_CONFIG_FILE)
+            snapshots[node] = sysctl_utils.SysctlConfSnapshot(lines)
+        return snapshots[node]
+
+    def _capture_kernel_state(self, nodes):
+        """
+        Description:
+            Captures the kernel parameters of nodes with a single
+            "sysctl -a" per node, run on all nodes concurrently. Kernel
+            checks are served from the capture until it is invalidated.
+        Args:
+            nodes (list): node filenames
+        Returns:
+            dict. node filename -> KernelState
+        """
+        states = self._kernel_states
+        cmd = self.redhatutils.get_sysctl_cmd('-a')
+
+        def capture(node, _):
+            """
+            Runs sysctl -a on one node.
+            """
+            # sysctl -a reports keys it may not read on stderr
+            stdout, _, rc = self.run_command(node, cmd, su_root=True)
+            return rc, sysctl_utils.KernelState(stdout)
+
+        try:
+            captured = run_by_node(capture, dict((node, None)
+                                                 for node in nodes))
+        except NodeTaskError as err:
+            self.fail(str(err))
+        for node, (rc, state) in captured.items():
+            self.assertEquals(0, rc, 'sysctl -a failed on ' + node)
+            states[node] = state
+        return dict((node, states[node]) for node in nodes)
+
+    def _find_settable_sysctl_keys(self, nodes, count):
+        """
+        Description:
+            Picks kernel parameters that can be set to their current value
+            without effect, for benchmarks that need many real keys. Only
+            keys of SETTABLE_SYSCTL_PREFIXES whose /proc/sys file is
+            writable are considered; nothing is written to the kernel.
+            Keys set in sysctl.conf are left out.
+        Args:
+            nodes (list): node filenames
+            count (int): number of keys wanted per node
+        Returns:
+            dict. node filename -> OrderedDict of at most count keys ->
+            current kernel value
+        """
+        states = self._capture_kernel_state(nodes)
+        candidates = {}
+        for node in nodes:
+            snapshot = self._get_sysctl_conf_snapshot(node)
+            # Keys are taken as sysctl -a names them rather than from
+            # /proc/sys paths; a slash in one stands for a dot in an
+            # interface name, and such keys are left out
+            candidates[node] = [
+                (key, sysctl_utils.normalize_value(value))
+                for key, value in sorted(states[node].values.items())
+                if value.strip() and '/' not in key
+                and key.startswith(self.SETTABLE_SYSCTL_PREFIXES)
+                and key not in self.SYSCTL_ACTION_KEYS
+                and key not in snapshot]
+
+        def check_writable(node, node_candidates):
+            """
+            Tests the mode of the /proc/sys file of each candidate of one
+            node.
+            """
+            return self._run_command_batch(node, [
+                'test -w ' + quote('/proc/sys/' + key.replace('.', '/'))
+                for key, _ in node_candidates])
+
+        try:
+            writable = run_by_node(check_writable, candidates)
+        except NodeTaskError as err:
+            self.fail(str(err))
+
+        keys = {}
+        for node in nodes:
+            keys[node] = OrderedDict(
+                (key, value) for (key, value), (_, _, rc)
+                in zip(candidates[node], writable[node]) if rc == 0)
+            keys[node] = OrderedDict(list(keys[node].items())[:count])
+        return keys
+
+    def _get_kernel_state(self, node):
+        """
+        Description:
+            Returns the kernel parameters of a node from its last capture,
+            capturing them if there is no valid capture.
+        Args:
+            node (str): node filename
+        Returns:
+            KernelState. The captured kernel parameters
+        """
+        states = self._kernel_states
+        if node not in states:
+            self._capture_kernel_state([node])
+        return states[node]
+
+    def _invalidate_sysctl_snapshots(self, node=None):
+        """
+        Description:
+            Drops the sysctl.conf snapshot and kernel capture of a node
+            after the suite has changed the file or the kernel values.
+        Args:
+            node (str): node filename, all nodes when None
+        """
+        for snapshots in (self._sysctl_conf_snapshots, self._kernel_states):
+            if node is None:
+                snapshots.clear()
+            else:
+                snapshots.pop(node, None)
+
+    def _get_sysctl_conf_checksum(self, node):
+        """
+        Returns the md5sum of sysctl.conf on a node.
+        """
+        stdout, stderr, rc = self.run_command(
+            node, self.MD5SUM_CMD.format(test_constants.SYSCTL_CONFIG_FILE))
+        self.assertEquals([], stderr)
+        self.assertEquals(0, rc)
+        return stdout[0].split()[0]
+
+    @staticmethod
+    def _sysctl_baseline_file():
+        """
+        Returns the path of the copy of sysctl.conf on the nodes. Tests
+        running concurrently, or a run retried while an earlier one left
+        its copy, are kept apart by the process id.
+        """
+        return SysparamsMixin.SYSCTL_BASELINE_FILE.format(os.getpid())
+
+    def _save_sysctl_conf(self, nodes):
+        """
+        Description:
+            Registers nodes whose sysctl.conf the test changes so that it
+            is restored when the test ends, and copies the file aside
+            until then. The checksum and parsed content of the file are
+            captured only the first time the session sees a node; later
+            tests reuse that baseline, and fail if the file no longer
+            matches it.
+        Args:
+            nodes (list): node filenames
+        """
+        in_use = self._sysctl_nodes_in_use
+        cmds = [self.MD5SUM_CMD.format(test_constants.SYSCTL_CONFIG_FILE),
+                '/bin/cp -p {0} {1}'.format(test_constants.SYSCTL_CONFIG_FILE,
+                                            self._sysctl_baseline_file())]
+
+        def save(node, _):
+            """
+            Copies sysctl.conf of one node aside, capturing its baseline
+            the first time.
+            """
+            md5sum, copy = self._run_command_batch(node, cmds)
+            self.assertEquals(([], 0), (md5sum.stderr, md5sum.rc))
+            self.assertEquals(([], [], 0), copy)
+            checksum = md5sum.stdout[0].split()[0]
+            baseline = self.sysctl_baselines.get(node)
+            if baseline is None:
+                return SysctlBaseline(checksum,
+                                      self._get_sysctl_conf_snapshot(node))
+            self.assertEquals(
+                baseline.checksum, checksum,
+                'sysctl.conf on {0} changed since the session '
+                'baseline'.format(node))
+            return baseline
+
+        new_nodes = [node for node in nodes if node not in in_use]
+        if new_nodes:
+            try:
+                saved = run_by_node(save, dict((node, None)
+                                               for node in new_nodes))
+            except NodeTaskError as err:
+                self.fail(str(err))
+            self.sysctl_baselines.update(saved)
+        in_use.extend(new_nodes)
+
+    def _restore_sysctl_conf(self):
+        """
+        Description:
+            Restores sysctl.conf on every node registered by
+            _save_sysctl_conf, but only where its checksum drifted from
+            the baseline, and re-applies to the kernel only the keys whose
+            value changed instead of reloading the whole file. The copy of
+            the file is removed either way.
+        """
+        in_use = self._sysctl_nodes_in_use
+
+        def restore(node, _):
+            """
+            Restores one node if it drifted.
+            """
+            baseline = self.sysctl_baselines[node]
+            remove_copy = 'rm -f ' + self._sysctl_baseline_file()
+            if self._get_sysctl_conf_checksum(node) == baseline.checksum:
+                self._run_command_batch(node, [remove_copy])
+                return None
+            self._invalidate_sysctl_snapshots(node)
+            changed = baseline.snapshot.changed_keys(
+                self._get_sysctl_conf_snapshot(node))
+            cmds = ['/bin/cp -p {0} {1}'.format(
+                self._sysctl_baseline_file(),
+                test_constants.SYSCTL_CONFIG_FILE)]
+            cmds.extend(self.redhatutils.get_sysctl_cmd('-e -w {0}'.format(
+                quote('{0}={1}'.format(sysctl_utils.to_dotted_key(key),
+                                       baseline.snapshot.get_value(key)))))
+                        for key in changed)
+            cmds.append(remove_copy)
+            results = self._run_command_batch(node, cmds)
+            self._invalidate_sysctl_snapshots(node)
+            for cmd, (_, stderr, rc) in zip(cmds, results):
+                self.assertEquals(([], 0), (stderr, rc),
+                                  '"{0}" failed on {1}'.format(cmd, node))
+            return changed
+
+        try:
+            restored = run_by_node(restore, dict((node, None)
+                                                 for node in in_use))
+        except NodeTaskError as err:
+            self.fail(str(err))
+        finally:
+            del in_use[:]
+        for node, changed in restored.items():
+            if changed is None:
+                self.log('info', 'sysctl.conf unchanged on ' + node)
+            else:
+                self.log('info', 'sysctl.conf restored on {0}, keys '
+                         're-applied: {1}'.format(node, changed))
+
+    def _get_sysctl_file_value(self, node, key):
+        """
+        Description:
+            Reads the value of a key from the sysctl.conf snapshot of a node.
+        Args:
+            node (str): node filename
+            key (str): sysctl key
+        Returns:
+            str. The value, or None if the key is not in the file
+        """
+        return self._get_sysctl_conf_snapshot(node).get_value(key)
+
+    def _get_sysctl_kernel_value(self, node, key):
+        """
+        Description:
+            Reads the value of a key from the kernel capture of a node.
+        Args:
+            node (str): node filename
+            key (str): sysctl key
+        Returns:
+            str. The value, or None if the kernel does not know the key
+        """
+        return self._get_kernel_state(node).get_value(key)
+
+    def _verify_sysctl_checks(self, checks):
+        """
+        Description:
+            Verifies a list of sysctl expectations, running the checks of
+            different nodes concurrently.
+        Args:
+            checks (list): SysctlCheck(node, key, expectation) tuples
+        Actions:
+            1. Group the checks by node
+            2. Run the checks of every node on its own thread
+        Returns:
+            list. CheckResult for each check, in the order of checks
+        """
+        by_node = OrderedDict()
+        for index, check in enumerate(checks):
+            by_node.setdefault(check.node, []).append((index, check))
+
+        readers = {sysctl_utils.FILE: self._get_sysctl_file_value,
+                   sysctl_utils.KERNEL: self._get_sysctl_kernel_value}
+
+        def verify_node(node, node_checks):
+            """
+            Runs the checks of a single node.
+            """
+            node_results = []
+            for index, check in node_checks:
+                actual = readers[check.expectation.source](node, check.key)
+                node_results.append((index, sysctl_utils.CheckResult(
+                    node, check.key, check.expectation,
+                    check.expectation.evaluate(actual), actual)))
+            return node_results
+
+        try:
+            by_node_results = run_by_node(verify_node, by_node)
+        except NodeTaskError as err:
+            self.fail(str(err))
+
+        results = [None] * len(checks)
+        for node_results in by_node_results.values():
+            for index, result in node_results:
+                results[index] = result
+        return results
+
+    def _wait_for_plan(self, expected_state, timeout_mins=30):
+        """
+        Description:
+            Follows the plan with "litp show_plan" and returns as soon as
+            it reaches a terminal state. Polls back off while the plan
+            makes no progress and speed up again whenever a task finishes.
+        Args:
+            expected_state (int): test_constants plan state expected
+            timeout_mins (int): how long to wait for the plan
+        Returns:
+            bool. True if the plan ended in expected_state
+        """
+        progress = {'done': -1, 'state': None}
+
+        def poll():
+            """
+            Reads the plan status once.
+            """
+            stdout, _, _ = self.execute_cli_showplan_cmd(self.test_ms)
+            status, done = plan_utils.parse_plan_summary(stdout)
+            if status is None:
+                state = self.get_current_plan_state(self.test_ms)
+            else:
+                state = plan_utils.TERMINAL_PLAN_STATES.get(status)
+            progressed = done != progress['done']
+            progress['done'] = done
+            progress['state'] = state
+            return (state in plan_utils.TERMINAL_PLAN_STATES.values(),
+                    progressed)
+
+        try:
+            finished, waited = wait_until(poll, timeout_mins * 60)
+        finally:
+            self._invalidate_sysctl_snapshots()
+            self._release_plan_lock_if_applied()
+        self._record_wait('plan', waited)
+        if finished and progress['state'] == test_constants.PLAN_COMPLETE \
+                and os.environ.get('SYSPARAMS_DRIFT_AFTER_PLAN'):
+            self._report_sysctl_drift()
+        self.log('info', 'Plan finished: {0}, state {1}, waited {2:.1f}s'
+                 .format(finished, progress['state'], waited))
+        return finished and progress['state'] == expected_state
+
+    def _trigger_puppet_run(self, node):
+        """
+        Description:
+            Asks puppet on a node to run now rather than at its next
+            interval.
+        Args:
+            node (str): node filename
+        """
+        hostnames = self._hostnames
+        if node not in hostnames:
+            stdout, _, rc = self.run_command(node, 'hostname')
+            self.assertEquals(0, rc)
+            hostnames[node] = stdout[0].strip()
+        # A run already in progress makes runonce fail, which is fine
+        _, stderr, rc = self.run_command(
+            self.test_ms, self.PUPPET_RUNONCE_CMD.format(hostnames[node]),
+            su_root=True)
+        if rc != 0:
+            self.log('info', 'Puppet runonce on {0} returned {1}: {2}'
+                     .format(node, rc, stderr))
+
+    def _wait_for_sysctl_conf_convergence(self, node, key, value=None,
+                                          present=True, timeout_mins=10):
+        """
+        Description:
+            Triggers a puppet run on a node and watches sysctl.conf until
+            key is set to value, or is gone when present is False. Only the
+            modification time is polled; the file is read again only when
+            it has changed.
+        Args:
+            node (str): node filename
+            key (str): sysctl key
+            value (str): expected value, None to only check presence
+            present (bool): whether key is expected in the file
+            timeout_mins (int): how long to wait for puppet
+        Returns:
+            float. Seconds from the puppet trigger until the file
+            converged, or None if it did not converge in time
+        """
+        expectation = sysctl_utils.SysctlExpectation(
+            sysctl_utils.FILE, present, value)
+        stat_cmd = self.STAT_MTIME_CMD.format(
+            test_constants.SYSCTL_CONFIG_FILE)
+        seen = {'mtime': None}
+
+        def poll():
+            """
+            Re-reads the file if its modification time changed.
+            """
+            stdout, _, rc = self.run_command(node, stat_cmd)
+            mtime = stdout[0] if rc == 0 and stdout else None
+            changed = mtime != seen['mtime']
+            if changed:
+                seen['mtime'] = mtime
+                self._invalidate_sysctl_snapshots(node)
+            actual = self._get_sysctl_file_value(node, key)
+            return expectation.evaluate(actual), changed
+
+        start = time.time()
+        self._trigger_puppet_run(node)
+        converged, _ = wait_until(poll, timeout_mins * 60)
+        latency = time.time() - start
+        self._record_wait('puppet', latency)
+        self.log('info', 'sysctl.conf on {0} {1} {2} after {3:.1f}s'.format(
+            node, 'converged to' if converged else 'did not converge to',
+            expectation, latency))
+        return latency if converged else None
+
+    def execute_cli_create_cmd(self, ms_node, url, class_type, *args,
+                               **kwargs):
+        """
+        Runs "litp create", dropping the topology if a node item is added.
+        """
+        self._acquire_plan_lock()
+        if class_type in self.TOPOLOGY_ITEM_TYPES:
+            self._invalidate_topology()
+        return super(SysparamsMixin, self).execute_cli_create_cmd(
+            ms_node, url, class_type, *args, **kwargs)
+
+    def execute_cli_remove_cmd(self, ms_node, url, *args, **kwargs):
+        """
+        Runs "litp remove", dropping the topology if a node item goes.
+        """
+        self._acquire_plan_lock()
+        if self._touches_topology(url):
+            self._invalidate_topology()
+        return super(SysparamsMixin, self).execute_cli_remove_cmd(
+            ms_node, url, *args, **kwargs)
+
+    def execute_cli_load_cmd(self, ms_node, url, filename, args='',
+                             *more_args, **kwargs):
+        """
+        Runs "litp load". A --replace load may recreate the node items
+        below url, so it drops the topology.
+        """
+        self._acquire_plan_lock()
+        if '--replace' in args and self._touches_topology(url):
+            self._invalidate_topology()
+        return super(SysparamsMixin, self).execute_cli_load_cmd(
+            ms_node, url, filename, args, *more_args, **kwargs)
+
+    def execute_cli_update_cmd(self, *args, **kwargs):
+        """
+        Runs "litp update" under the plan lock.
+        """
+        self._acquire_plan_lock()
+        return super(SysparamsMixin, self).execute_cli_update_cmd(
+            *args, **kwargs)
+
+    def execute_cli_createplan_cmd(self, *args, **kwargs):
+        """
+        Creates the plan under the plan lock.
+        """
+        self._acquire_plan_lock()
+        return super(SysparamsMixin, self).execute_cli_createplan_cmd(
+            *args, **kwargs)
+
+    def execute_cli_runplan_cmd(self, *args, **kwargs):
+        """
+        Runs the plan. Puppet rewrites sysctl.conf and reloads it as the
+        plan runs so all snapshots are dropped.
+        """
+        self._invalidate_sysctl_snapshots()
+        return super(SysparamsMixin, self).execute_cli_runplan_cmd(
+            *args, **kwargs)
+
+    def wait_for_plan_state(self, *args, **kwargs):
+        """
+        Waits for a plan state, dropping snapshots taken while it ran.
+        """
+        try:
+            return super(SysparamsMixin, self).wait_for_plan_state(
+                *args, **kwargs)
+        finally:
+            self._invalidate_sysctl_snapshots()
+            self._release_plan_lock_if_applied()
+
+    def wait_for_puppet_action(self, ms_node, node, *args, **kwargs):
+        """
+        Waits for puppet to act on a node, dropping its snapshots.
+        """
+        try:
+            return super(SysparamsMixin, self).wait_for_puppet_action(
+                ms_node, node, *args, **kwargs)
+        finally:
+            self._invalidate_sysctl_snapshots(node)
+
+    def cp_file_on_node(self, node, *args, **kwargs):
+        """
+        Copies a file on a node, dropping its snapshots in case the copy
+        was onto sysctl.conf.
+        """
+        try:
+            return super(SysparamsMixin, self).cp_file_on_node(
+                node, *args, **kwargs)
+        finally:
+            self._invalidate_sysctl_snapshots(node)
+
+    def _assert_sysctl_checks(self, checks):
+        """
+        Description:
+            Verifies a list of sysctl expectations and asserts once that
+            all of them were met.
+        Args:
+            checks (list): SysctlCheck(node, key, expectation) tuples
+        Returns:
+            list. CheckResult for each check, in the order of checks
+        """
+        results = self._verify_sysctl_checks(checks)
+        failed = ['{0}: {1} expected {2}, found "{3}"'.format(
+            result.node, result.key, result.expectation, result.actual)
+            for result in results if not result.passed]
+        self.assertEqual([], failed,
+                         'Unexpected sysctl values:\n' + '\n'.join(failed))
+        return results
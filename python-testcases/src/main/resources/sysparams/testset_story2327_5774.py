@@ -20,11 +20,17 @@ program(s) have been supplied.
 
 from redhat_cmd_utils import RHCmdUtils
 from litp_generic_test import GenericTest, attr
+from sysparams_mixin import SysparamsMixin
+from sysctl_utils import SysctlCheck, in_file, not_in_file, in_kernel, \
+    split_keyvalue
+from sysparam_xml_utils import index_sysparams
+from sysparam_validator import validate_cli_props, validate_plan_params, \
+    validate_update
 import test_constants
 import os
 
 
-class Story2327Story5774(GenericTest):
+class Story2327Story5774(SysparamsMixin, GenericTest):
 
     '''
     As a LITP User, I want a model extension for system parameters,
@@ -134,19 +140,21 @@ class Story2327Story5774(GenericTest):
 
         """
 
-        # Replace the existing value with new value
-        cmd = self.redhatutils.get_replace_str_in_file_cmd(
-            old_value, new_value, test_constants.SYSCTL_CONFIG_FILE,
-            sed_args='-i')
-        std_out, std_err, rc = self.run_command(node, cmd, su_root=True)
+        # Replace the existing value with new value and load the
+        # sysctl.conf file, in one round trip
+        replace, load = self._run_command_batch(node, [
+            self.redhatutils.get_replace_str_in_file_cmd(
+                old_value, new_value, test_constants.SYSCTL_CONFIG_FILE,
+                sed_args='-i'),
+            self.redhatutils.get_sysctl_cmd(
+                '-e -p {0}'.format(test_constants.SYSCTL_CONFIG_FILE))])
+        self._invalidate_sysctl_snapshots(node)
+        std_out, std_err, rc = replace
         self.assertEquals([], std_err)
         self.assertEqual([], std_out)
         self.assertEquals(0, rc)
 
-        # Load the sysctl.conf file
-        cmd = self.redhatutils.get_sysctl_cmd(
-            '-e -p {0}'.format(test_constants.SYSCTL_CONFIG_FILE))
-        stdout, stderr, rc = self.run_command(node, cmd, su_root=True)
+        stdout, stderr, rc = load
         self.assertEquals([], stderr)
         self.assertNotEqual([], stdout)
         self.assertEquals(0, rc)
@@ -155,28 +163,30 @@ class Story2327Story5774(GenericTest):
         """
         Description:
             Function to find a specific key = value
-            in the sysctl.conf file.
+            in the sysctl.conf file. The file is read once per node and
+            later lookups are served from the snapshot. Dotted and slash
+            separated keys are the same key, as they are for sysctl -p.
         Args:
             node (str) : The node to find the file on.
             option (str): parameter name
         Actions:
-            1. finds the key in the file
+            1. finds the key in the file snapshot
         Results:
-             Successfully checked the parameter and returns key=value
+             Successfully checked the parameter and returns the
+             SysctlConfEntry of the line sysctl -p applies
 
         """
-        cmd = self.redhatutils.get_grep_file_cmd(
-            test_constants.SYSCTL_CONFIG_FILE, option)
-        std_out, std_err, rc = self.run_command(node, cmd, su_root=True)
+        entry = self._get_sysctl_conf_snapshot(node).get(option)
         if positive is True:
-            self.assertEquals([], std_err)
-            self.assertNotEqual([], std_out)
-            self.assertEquals(0, rc)
-            return std_out[0]
+            self.assertNotEqual(
+                None, entry, '"{0}" not found in {1} on {2}'.format(
+                    option, test_constants.SYSCTL_CONFIG_FILE, node))
+            return entry
         else:
-            self.assertEquals([], std_err)
-            self.assertEquals([], std_out)
-            self.assertEquals(1, rc)
+            self.assertEqual(
+                None, entry, '"{0}" unexpectedly found in {1} on {2}: {3}'
+                .format(option, test_constants.SYSCTL_CONFIG_FILE, node,
+                        entry and entry.line))
 
     def _find_values_sysctl(self, node, option):
         """
@@ -187,18 +197,16 @@ class Story2327Story5774(GenericTest):
             node (str) : The node to find the file on.
             option (str): parameter name
         Actions:
-            1. finds the key in the file
+            1. finds the key in the kernel capture of the node
         Results:
-             Successfully checked the parameter and returns key=value
+             Successfully checked the parameter and returns its value
 
         """
-        # Find key values in sysctl.conf file
-        cmd = "/sbin/sysctl '{0}'".format(option)
-        stdout, stderr, rc = self.run_command(node, cmd, su_root=True)
-        self.assertEquals([], stderr)
-        self.assertFalse([], stdout)
-        self.assertEquals(0, rc)
-        return stdout[0]
+        value = self._get_kernel_state(node).get_value(option)
+        self.assertNotEqual(None, value,
+                            '"{0}" not found in sysctl on {1}'.format(
+                                option, node))
+        return value
 
     def _check_memory_values(self, node, option):
         """
@@ -209,47 +217,16 @@ class Story2327Story5774(GenericTest):
             node (str) : The node to find the file on.
             option (str): parameter name
         Actions:
-            1. finds the key in the memory
+            1. finds the key in the kernel capture of the node
         Results:
-             Successfully checked the parameter and returns key=value
+             Successfully checked the parameter and returns its value
 
         """
-        cmd = self.redhatutils.get_sysctl_cmd(
-            '{0}'.format(option))
-        stdout, stderr, rc = self.run_command(node, cmd, su_root=True)
-        self.assertEquals([], stderr)
-        self.assertNotEqual([], stdout)
-        self.assertEquals(0, rc)
-        return stdout[0]
-
-    def _assert_err_msg_list(self, err_list, results):
-        """
-        Description:
-            Function that checks that each error message in a list, of size
-        n,is associated with a unique path which precedes the error message
-        in the list of error messages generated
-        Args:
-            err_list (list): list of error messages and paths
-            results (dict):  dictionary of error data
-        """
-        # Validate error message path
-        index = results['index']
-        if results['path'] == None:
-            msg_index = index
-        else:
-            msg_index = index + 1
-
-        if results['path'] != None:
-            self.assertEqual(
-                err_list[index], results['path'],
-                'Expected path "{0}", found "{1}"'
-                .format(results['path'], err_list[index]))
-
-        # Validate error message
-        self.assertEqual(
-            err_list[msg_index], results['msg'],
-            'Expected msg "{0}", found "{1}"'
-            .format(results['msg'], err_list[msg_index]))
+        value = self._get_kernel_state(node).get_value(option)
+        self.assertNotEqual(None, value,
+                            '"{0}" not found in memory on {1}'.format(
+                                option, node))
+        return value
 
     @attr('all', 'revert', 'story2327_5774', 'story2327_5774_tc01',
           'cdb_priority1')
@@ -308,15 +285,11 @@ class Story2327Story5774(GenericTest):
         @tms_execution_type: Automated
         """
 
-        # Find the desired collection on nodes
-        nodes_path = self.find(self.test_ms, "/deployments", "node", True)
-        self.assertTrue(
-            len(nodes_path) > 1,
-            "The LITP Tree has less than 2 nodes defined")
-        node1_path = nodes_path[0]
-        node2_path = nodes_path[1]
-        test_node1 = self.get_node_filename_from_url(self.test_ms, node1_path)
-        test_node2 = self.get_node_filename_from_url(self.test_ms, node2_path)
+        # Find the nodes and their sysparam-node-configs
+        node1 = self._get_node_topology(0)
+        node2 = self._get_node_topology(1)
+        test_node1 = node1.filename
+        test_node2 = node2.filename
 
         # Create sysctl keys required for test
         sysctl_key1 = "fs.suid_dumpable"
@@ -328,215 +301,168 @@ class Story2327Story5774(GenericTest):
         sysctl_value2 = "/var/coredumps/core.%h.%e.pid%p.usr%u.sig%s.tim%t"
         sysctl_value3 = "22"
 
-        # copy sysctl.conf file to tmp_location
-        local_config_filepath = test_constants.SYSCTL_CONFIG_FILE
-        config_filepath = "/tmp/sysctl"
-        self.assertTrue(self.cp_file_on_node(
-            test_node1, local_config_filepath, config_filepath,
-            su_root=True))
-        self.assertTrue(self.cp_file_on_node(
-            test_node2, local_config_filepath, config_filepath,
-            su_root=True))
+        # Save sysctl.conf, it is restored when the test ends
+        self._save_sysctl_conf([test_node1, test_node2])
 
-        try:
-            self.log('info', '1. Find the sysparam-node-config'
-                             ' already on node1')
-            sysparam_node1_config = self.find(
-                self.test_ms, "/deployments", "sysparam-node-config")[0]
-
-            self.log('info', '2. Check file for the preexisting'
-                             ' key(a) on both nodes and find its value')
-            node1_key1_val = self._find_keyvalue_in_sysctl_conf(
-                test_node1, sysctl_key1)
-            node2_key1_val = self._find_keyvalue_in_sysctl_conf(
-                test_node2, sysctl_key1)
-
-            # check to ensure that the value returned is not equal to
-            # the value you intend to set.
-            check_value_is_valid = sysctl_key1 + " = " + sysctl_value1
-            self.assertNotEqual(node1_key1_val, check_value_is_valid)
-
-            self.log('info', '3. Create system-param on '
-                             'node1 with preexisting key(a) '
-                             'in the file')
-            props = 'key="{0}" value="{1}"'.format(sysctl_key1, sysctl_value1)
-            system_param1 = self._create_system_param(
-                sysparam_node1_config, "sysctltest01a", props)
-
-            self.log('info', '4. Find the sysparam-node-config '
-                             'already on node2')
-            sysparam_node2_config = self.find(
-                self.test_ms, "/deployments", "sysparam-node-config")[1]
-
-            self.log('info', '5.  Check file for the '
-                             'preexisting key(b) on both '
-                             'nodes and find its value')
-            node2_key2_val = self._find_keyvalue_in_sysctl_conf(
-                test_node2, sysctl_key2)
-            node1_key2_val = self._find_keyvalue_in_sysctl_conf(
-                test_node1, sysctl_key2)
-
-            # check to ensure that the value returned is not equal to
-            # the value you intend to set.
-            check_value_created = sysctl_key2 + " = " + sysctl_value2
-            self.assertNotEqual(node2_key2_val, check_value_created)
-
-            self.log('info', '6. Create another '
-                             'system-param with key(b) in the file  '
-                             'on node2')
-            props = ('key="{0}" value="{1}"'.format(sysctl_key2,
-                                                    sysctl_value2))
-            system_param2 = self._create_system_param(
-                sysparam_node2_config, "sysctltest01b", props)
-
-            # Find pre-existing key(c) in sysctl.conf file on node1
-            orig_key3_val = self._find_keyvalue_in_sysctl_conf(
-                test_node1, sysctl_key3)
-
-            self.log('info', '7. Update another '
-                             'pre-existing key(c) in the file manually')
-            updated_key3_val = "{0} = '{1}'".format(sysctl_key3, sysctl_value3)
-            self._update_keyvalue_in_sysctl_conf(
-                test_node1, orig_key3_val, updated_key3_val)
-
-            self.log('info', '8. Create plan')
-            self.execute_cli_createplan_cmd(self.test_ms)
+        self.log('info', '1. Find the sysparam-node-config'
+                         ' already on node1')
+        sysparam_node1_config = node1.sysparam_config
 
-            self.log('info', '9. Run plan')
-            self.execute_cli_runplan_cmd(self.test_ms)
-
-            # Wait for plan to complete
-            self.assertTrue(self.wait_for_plan_state(
-                self.test_ms, test_constants.PLAN_COMPLETE))
-
-            self.log('info', '10. Check sysctl.conf file '
-                             'contains updated preexisting key(a)'
-                             'to the value on node1')
-            updated_key1_val = self._find_keyvalue_in_sysctl_conf(
-                test_node1, sysctl_key1)
-            self.assertNotEqual(node1_key1_val, updated_key1_val)
-
-            self.log('info', '11.  Check the value is '
-                             'not updated on node2 config file')
-            get_key1_val = self._find_keyvalue_in_sysctl_conf(
-                test_node2, sysctl_key1)
-            self.assertEqual(node2_key1_val, get_key1_val)
-
-            self.log('info', '12. Check sysctl.conf '
-                             'file contains updated key(b) '
-                             'to the value on node2')
-            updated_key2_val = self._find_keyvalue_in_sysctl_conf(
-                test_node2, sysctl_key2)
-            self.assertNotEqual(updated_key2_val, node2_key2_val)
-
-            self.log('info', '13.  Check the value is '
-                             'not updated on node1 config file')
-            get_key2_val = self._find_keyvalue_in_sysctl_conf(
-                test_node1, sysctl_key2)
-            self.assertEqual(node1_key2_val, get_key2_val)
-
-            self.log('info', '14. Check that puppet '
-                             'has not overridden the updated '
-                             'value for key(c) in the sysctl.conf file')
-            self.assertEqual(self._find_keyvalue_in_sysctl_conf(
-                test_node1, sysctl_key3), updated_key3_val.replace("'", ""))
-
-            self.log('info', '15. Manually update the key '
-                             '(a) in the sysctl.conf file')
-            manual_update_key1_val = "{0} = '5535'".format(
-                sysctl_key1)
-            self._update_keyvalue_in_sysctl_conf(
-                test_node1, updated_key1_val, manual_update_key1_val)
-
-            self.log('info', '16. Check that when the '
-                             'value of a param under puppet '
-                             'control is reverte')
-            cmd_to_run = \
-                "/bin/cat {0} | /bin/grep '{1} = {2}'".format(
-                    test_constants.SYSCTL_CONFIG_FILE, sysctl_key1,
-                    sysctl_value1)
-            self.assertTrue(self.wait_for_puppet_action(
-                self.test_ms, test_node1, cmd_to_run, 0, su_root=True))
-
-            self.log('info', '17. Remove the system-param'
-                             ' item-types that have been created '
-                             'and remove manually updated key(c)')
-            self.execute_cli_remove_cmd(self.test_ms, system_param1)
-            self.execute_cli_remove_cmd(self.test_ms, system_param2)
-            remove_key3_manualy = " "
-            self._update_keyvalue_in_sysctl_conf(
-                test_node1, updated_key3_val, remove_key3_manualy)
-
-            self.log('info', '18. Check their states are, "ForRemoval"')
-            state_value = self.execute_show_data_cmd(
-                self.test_ms, system_param1, "state")
-            self.assertEqual(state_value, "ForRemoval")
-
-            state_value = self.execute_show_data_cmd(
-                self.test_ms, system_param2, "state")
-            self.assertEqual(state_value, "ForRemoval")
-
-            self.log('info', '19. Create plan')
-            self.execute_cli_createplan_cmd(self.test_ms)
-
-            self.log('info', '22. Run plan')
-            self.execute_cli_runplan_cmd(self.test_ms)
+        self.log('info', '2. Check file for the preexisting'
+                         ' key(a) on both nodes and find its value')
+        node1_key1_val = self._find_keyvalue_in_sysctl_conf(
+            test_node1, sysctl_key1)
+        node2_key1_val = self._find_keyvalue_in_sysctl_conf(
+            test_node2, sysctl_key1)
+
+        # check to ensure that the value returned is not equal to
+        # the value you intend to set.
+        self.assertNotEqual(sysctl_value1, node1_key1_val.value)
+
+        self.log('info', '3. Create system-param on '
+                         'node1 with preexisting key(a) '
+                         'in the file')
+        props = 'key="{0}" value="{1}"'.format(sysctl_key1, sysctl_value1)
+        system_param1 = self._create_system_param(
+            sysparam_node1_config, "sysctltest01a", props)
+
+        self.log('info', '4. Find the sysparam-node-config '
+                         'already on node2')
+        sysparam_node2_config = node2.sysparam_config
+
+        self.log('info', '5.  Check file for the '
+                         'preexisting key(b) on both '
+                         'nodes and find its value')
+        node2_key2_val = self._find_keyvalue_in_sysctl_conf(
+            test_node2, sysctl_key2)
+        node1_key2_val = self._find_keyvalue_in_sysctl_conf(
+            test_node1, sysctl_key2)
+
+        # check to ensure that the value returned is not equal to
+        # the value you intend to set.
+        self.assertNotEqual(sysctl_value2, node2_key2_val.value)
+
+        self.log('info', '6. Create another '
+                         'system-param with key(b) in the file  '
+                         'on node2')
+        props = ('key="{0}" value="{1}"'.format(sysctl_key2,
+                                                sysctl_value2))
+        system_param2 = self._create_system_param(
+            sysparam_node2_config, "sysctltest01b", props)
+
+        # Find pre-existing key(c) in sysctl.conf file on node1
+        orig_key3_val = self._find_keyvalue_in_sysctl_conf(
+            test_node1, sysctl_key3)
+
+        self.log('info', '7. Update another '
+                         'pre-existing key(c) in the file manually')
+        updated_key3_val = "{0} = '{1}'".format(sysctl_key3, sysctl_value3)
+        self._update_keyvalue_in_sysctl_conf(
+            test_node1, orig_key3_val.line, updated_key3_val)
+
+        # Capture the kernel values before the plan
+        states_before = self._capture_kernel_state(
+            [test_node1, test_node2])
 
-            self.log('info', 'Wait for plan to complete')
-            self.assertTrue(self.wait_for_plan_state(
-                self.test_ms, test_constants.PLAN_COMPLETE,
-                seconds_increment=0.5))
+        self.log('info', '8. Create plan')
+        self.execute_cli_createplan_cmd(self.test_ms)
 
-            self.log('info', '23.Check the keys, (a),(b) and (c) has '
-                             'removed from sysctl.conf file')
-            cmd_to_run = self.redhatutils.get_grep_file_cmd(
-                test_constants.SYSCTL_CONFIG_FILE, sysctl_key1)
-            self.assertTrue(self.wait_for_puppet_action(
-               self.test_ms, test_node1, cmd_to_run, 1))
+        self.log('info', '9. Run plan')
+        self.execute_cli_runplan_cmd(self.test_ms)
 
-            # self._find_keyvalue_in_sysctl_conf(
-            #    test_node1, sysctl_key1, positive=False)
-            self._find_keyvalue_in_sysctl_conf(
-                test_node2, sysctl_key2, positive=False)
-            self._find_keyvalue_in_sysctl_conf(
-                test_node1, sysctl_key3, positive=False)
+        # Wait for plan to complete
+        self.assertTrue(self._wait_for_plan(
+            test_constants.PLAN_COMPLETE))
+
+        # Check which kernel values the plan changed
+        states_after = self._capture_kernel_state(
+            [test_node1, test_node2])
+        for test_node in (test_node1, test_node2):
+            changed = states_before[test_node].diff(
+                states_after[test_node]).changed
+            self.log('info', 'Kernel values changed by plan on '
+                             '{0}: {1}'.format(test_node, changed))
+
+        # Steps 10 to 14 are checked together, in one pass over the
+        # sysctl.conf files, and are profiled as a single step
+        self.log('info', '10-14. Check sysctl.conf file '
+                         'contains updated preexisting key(a) '
+                         'to the value on node1 (10) and the value is '
+                         'not updated on node2 config file (11), '
+                         'sysctl.conf file contains updated key(b) '
+                         'to the value on node2 (12) and the value is '
+                         'not updated on node1 config file (13), and '
+                         'puppet has not overridden the updated '
+                         'value for key(c) in the sysctl.conf file (14)')
+        self._assert_sysctl_checks([
+            SysctlCheck(test_node1, sysctl_key1, in_file(sysctl_value1)),
+            SysctlCheck(test_node2, sysctl_key1,
+                        in_file(node2_key1_val.value)),
+            SysctlCheck(test_node2, sysctl_key2, in_file(sysctl_value2)),
+            SysctlCheck(test_node1, sysctl_key2,
+                        in_file(node1_key2_val.value)),
+            SysctlCheck(test_node1, sysctl_key3, in_file(sysctl_value3))])
+        # Nothing else in sysctl.conf or the kernel has changed
+        self._assert_no_sysctl_drift(
+            [test_node1, test_node2],
+            manually_edited={test_node1: [sysctl_key3]})
+        updated_key1_val = self._find_keyvalue_in_sysctl_conf(
+            test_node1, sysctl_key1).line
+
+        self.log('info', '15. Manually update the key '
+                         '(a) in the sysctl.conf file')
+        manual_update_key1_val = "{0} = '5535'".format(
+            sysctl_key1)
+        self._update_keyvalue_in_sysctl_conf(
+            test_node1, updated_key1_val, manual_update_key1_val)
+
+        self.log('info', '16. Check that when the '
+                         'value of a param under puppet '
+                         'control is reverte')
+        self.assertNotEqual(None, self._wait_for_sysctl_conf_convergence(
+            test_node1, sysctl_key1, sysctl_value1))
+
+        self.log('info', '17. Remove the system-param'
+                         ' item-types that have been created '
+                         'and remove manually updated key(c)')
+        self.execute_cli_remove_cmd(self.test_ms, system_param1)
+        self.execute_cli_remove_cmd(self.test_ms, system_param2)
+        remove_key3_manualy = " "
+        self._update_keyvalue_in_sysctl_conf(
+            test_node1, updated_key3_val, remove_key3_manualy)
+
+        self.log('info', '18. Check their states are, "ForRemoval"')
+        state_value = self.execute_show_data_cmd(
+            self.test_ms, system_param1, "state")
+        self.assertEqual(state_value, "ForRemoval")
 
-            self.log('info', '24.Check the keys, '
-                             '(a) and (c) is not removed from memory')
-            self._check_memory_values(test_node1, sysctl_key1)
-            self._check_memory_values(test_node2, sysctl_key2)
-            self._check_memory_values(test_node1, sysctl_key3)
+        state_value = self.execute_show_data_cmd(
+            self.test_ms, system_param2, "state")
+        self.assertEqual(state_value, "ForRemoval")
 
-        finally:
+        self.log('info', '19. Create plan')
+        self.execute_cli_createplan_cmd(self.test_ms)
 
-            # copy  back sysctl.conf
-            local_config_filepath = test_constants.SYSCTL_CONFIG_FILE
-            config_filepath = "/tmp/sysctl"
-            self.assertTrue(self.cp_file_on_node(
-                test_node1, config_filepath, local_config_filepath,
-                su_root=True))
+        self.log('info', '22. Run plan')
+        self.execute_cli_runplan_cmd(self.test_ms)
 
-            self.assertTrue(self.cp_file_on_node(
-                test_node2, config_filepath, local_config_filepath,
-                su_root=True))
+        self.log('info', 'Wait for plan to complete')
+        self.assertTrue(self._wait_for_plan(
+            test_constants.PLAN_COMPLETE))
 
-            # Load the sysctl.conf file on node1
-            cmd = self.redhatutils.get_sysctl_cmd(
-                '-e -p {0}'.format(test_constants.SYSCTL_CONFIG_FILE))
-            stdout, stderr, rc = self.run_command(test_node1,
-                                                  cmd, su_root=True)
-            self.assertEquals([], stderr)
-            self.assertNotEqual([], stdout)
-            self.assertEquals(0, rc)
+        self.log('info', '23.Check the keys, (a),(b) and (c) has '
+                         'removed from sysctl.conf file')
+        self.assertNotEqual(None, self._wait_for_sysctl_conf_convergence(
+            test_node1, sysctl_key1, present=False))
 
-            # Load the sysctl.conf file on node2
-            cmd = self.redhatutils.get_sysctl_cmd(
-                '-e -p {0}'.format(test_constants.SYSCTL_CONFIG_FILE))
-            stdout, stderr, rc = self.run_command(test_node2,
-                                                  cmd, su_root=True)
-            self.assertEquals([], stderr)
-            self.assertNotEqual([], stdout)
-            self.assertEquals(0, rc)
+        self.log('info', '24.Check the keys, '
+                         '(a) and (c) is not removed from memory')
+        self._assert_sysctl_checks([
+            SysctlCheck(test_node2, sysctl_key2, not_in_file()),
+            SysctlCheck(test_node1, sysctl_key3, not_in_file()),
+            SysctlCheck(test_node1, sysctl_key1, in_kernel()),
+            SysctlCheck(test_node2, sysctl_key2, in_kernel()),
+            SysctlCheck(test_node1, sysctl_key3, in_kernel())])
 
     @attr('all', 'revert', 'story2327_5774', 'story2327_5774_tc02')
     def test_02_n_check_system_parameter_validation_negative(self):
@@ -577,8 +503,7 @@ class Story2327Story5774(GenericTest):
         @tms_execution_type: Automated
         """
         self.log('info', '1. Find the sysparam-node-config already on node1')
-        sysparam_node_config = self.find(
-            self.test_ms, "/deployments", "sysparam-node-config")[0]
+        sysparam_node_config = self._get_node_topology(0).sysparam_config
 
         sysparam_path = sysparam_node_config + "/params/sysctltest02a"
 
@@ -592,7 +517,6 @@ class Story2327Story5774(GenericTest):
         'results':
         [
          {
-          'index': 0,
           'path': None,
           'msg': 'ValidationError in property: "key"    Invalid value \'\'.'
           }
@@ -607,7 +531,6 @@ class Story2327Story5774(GenericTest):
         'results':
         [
          {
-          'index': 0,
           'path': None,
           'msg': 'ValidationError in property: "key"    '
                  'Invalid value \'kernel.,test02\'.'
@@ -624,7 +547,6 @@ class Story2327Story5774(GenericTest):
         'results':
         [
          {
-          'index': 0,
           'path': None,
           'msg': 'ValidationError in property: "key"    '
                  'Invalid value \'kernel=test02\'.'
@@ -642,7 +564,6 @@ class Story2327Story5774(GenericTest):
         'results':
         [
          {
-          'index': 0,
           'path': None,
           'msg': 'ValidationError in property: "value"    Invalid value \'\'.'
           }
@@ -659,7 +580,6 @@ class Story2327Story5774(GenericTest):
         'results':
         [
          {
-          'index': 0,
           'path': None,
           'msg': 'PropertyNotAllowedError in property: "name"    '
                  '"name" is not an allowed property of sysparam'
@@ -677,7 +597,6 @@ class Story2327Story5774(GenericTest):
         'results':
         [
          {
-          'index': 0,
           'path': None,
           'msg': 'MissingRequiredPropertyError in property: "value"    '
                  'ItemType "sysparam" is required to have a property with '
@@ -696,7 +615,6 @@ class Story2327Story5774(GenericTest):
         'results':
         [
          {
-          'index': 0,
           'path': None,
           'msg': 'MissingRequiredPropertyError in property: "key"    '
                  'ItemType "sysparam" is required to have a property with '
@@ -715,8 +633,14 @@ class Story2327Story5774(GenericTest):
                   self.test_ms, sysparam_path, "sysparam", rule['param'],
                   expect_positive=False)
 
-            for result in rule['results']:
-                self._assert_err_msg_list(stderr, result)
+            self._assert_cli_errors(stderr, rule['results'])
+
+            # The MS is the reference; a local validator that predicts
+            # other errors is only reported
+            predicted = validate_cli_props(rule['param'])
+            if predicted != [result['msg'] for result in rule['results']]:
+                self.log('info', 'Local validation of {0} differs from the '
+                         'MS: {1}'.format(rule['param'], predicted))
 
         self.log('info', '9. Check the same key '
                          'cannot be specified more than once for a node')
@@ -736,7 +660,6 @@ class Story2327Story5774(GenericTest):
         'results':
         [
          {
-          'index': 0,
           'path': sysparam_node_config + '/params/sysctltest02b',
           'msg': 'ValidationError    Create plan failed: '
                  'Duplicate sysparam key: kernel.samekey'
@@ -750,12 +673,18 @@ class Story2327Story5774(GenericTest):
                      "rules data set : {0}"
                      .format(rule['description']))
 
+            # The local check reports the duplicate on sysctltest02b too
+            self._assert_cli_errors(validate_plan_params([
+                (sysparam_node_config + '/params/' + item_id,
+                 'kernel.samekey', None)
+                for item_id in ('sysctltest02b', 'sysctltest02c')]),
+                rule['results'])
+
              # Create plan fails with error
             _, stderr, _ = self.execute_cli_createplan_cmd(
                  self.test_ms, expect_positive=False)
 
-            for result in rule['results']:
-                self._assert_err_msg_list(stderr, result)
+            self._assert_cli_errors(stderr, rule['results'])
 
         self.log('info', '10. Attempt to remove the key')
         props = ('key="kernel.newkey02" value="2345"')
@@ -771,7 +700,6 @@ class Story2327Story5774(GenericTest):
         'results':
         [
          {
-          'index': 0,
           'path': None,
           'msg': 'MissingRequiredPropertyError in property: "key"    '
                  'ItemType "sysparam" is required to have a property with '
@@ -790,7 +718,6 @@ class Story2327Story5774(GenericTest):
         'results':
         [
          {
-          'index': 0,
           'path': None,
           'msg':'MissingRequiredPropertyError in property: "value"    '
                 'ItemType "sysparam" is required to have a property with '
@@ -805,12 +732,16 @@ class Story2327Story5774(GenericTest):
                      "rules data set : {0}"
                      .format(rule['description']))
 
+            self.assertEqual(
+                [result['msg'] for result in rule['results']],
+                validate_update({'key': 'kernel.newkey02', 'value': '2345'},
+                                rule['param'], action_del=True)[1])
+
             _, stderr, _ = self.execute_cli_update_cmd(
                  self.test_ms, system_param, rule['param'], action_del=True,
                  expect_positive=False)
 
-            for result in rule['results']:
-                self._assert_err_msg_list(stderr, result)
+            self._assert_cli_errors(stderr, rule['results'])
 
         self.log('info', '12. Attempt to remove non existing system-param')
         invalid_param = sysparam_node_config + "/params/invaliditem"
@@ -822,7 +753,6 @@ class Story2327Story5774(GenericTest):
         'results':
         [
          {
-          'index': 0,
           'path': invalid_param,
           'msg': 'InvalidLocationError    Path not found'
           }
@@ -838,8 +768,7 @@ class Story2327Story5774(GenericTest):
             _, stderr, _ = self.execute_cli_remove_cmd(
                    self.test_ms, invalid_param, expect_positive=False)
 
-            for result in rule['results']:
-                self._assert_err_msg_list(stderr, result)
+            self._assert_cli_errors(stderr, rule['results'])
 
         self.log('info', '13. Attempt to remove non '
                          'existing "system-param node config" '
@@ -853,7 +782,6 @@ class Story2327Story5774(GenericTest):
         'results':
         [
          {
-          'index': 0,
           'path': invalid_node_config,
           'msg': 'InvalidLocationError    Path not found'
           }
@@ -868,8 +796,7 @@ class Story2327Story5774(GenericTest):
             _, stderr, _ = self.execute_cli_remove_cmd(
                    self.test_ms, invalid_node_config, expect_positive=False)
 
-            for result in rule['results']:
-                self._assert_err_msg_list(stderr, result)
+            self._assert_cli_errors(stderr, rule['results'])
 
     @attr('all', 'revert', 'story2327_5774', 'story2327_5774_tc03')
     def test_03_p_update_system_parameter_positive(self):
@@ -922,21 +849,14 @@ class Story2327Story5774(GenericTest):
         @tms_execution_type: Automated
         """
 
-        # Find the path to node1
-        n1_path = self.find(
-            self.test_ms, "/deployments", "node")[0]
-
         # Get node1 filename
-        test_node1 = self.get_node_filename_from_url(
-            self.test_ms, n1_path)
+        test_node1 = self._get_node_topology(0).filename
 
-        # Backup sysctl.conf file to tmp_location
-        self.assertTrue(self.backup_file(
-            test_node1, test_constants.SYSCTL_CONFIG_FILE))
+        # Save sysctl.conf, it is restored when the test ends
+        self._save_sysctl_conf([test_node1])
 
         self.log('info', '1. Find the sysparam-node-config already on node1')
-        sysparam_node_config = self.find(
-            self.test_ms, "/deployments", "sysparam-node-config")[0]
+        sysparam_node_config = self._get_node_topology(0).sysparam_config
 
         # Create sysctl keys required for test
         sysctl_key1 = "kernel.threads-max"
@@ -991,8 +911,8 @@ class Story2327Story5774(GenericTest):
         self.execute_cli_runplan_cmd(self.test_ms)
 
         # Wait for plan to complete
-        self.assertTrue(self.wait_for_plan_state(
-            self.test_ms, test_constants.PLAN_COMPLETE))
+        self.assertTrue(self._wait_for_plan(
+            test_constants.PLAN_COMPLETE))
 
         self.log('info', '10.  Check the sysparams '
                          'states are in Applied state.')
@@ -1030,7 +950,6 @@ class Story2327Story5774(GenericTest):
         'results':
         [
          {
-          'index': 0,
           'path': sysparam_node_config + '/params/sysctltest03c',
           'msg': 'ValidationError    Create plan failed: '
                  'The key name "net.ipv4.ip_forward" cannot be'
@@ -1050,9 +969,8 @@ class Story2327Story5774(GenericTest):
             _, stderr, _ = self.execute_cli_createplan_cmd(
                  self.test_ms, expect_positive=False)
 
-            for result in rule['results']:
-                self.log('info', '14. Check the Error message')
-                self._assert_err_msg_list(stderr, result)
+            self.log('info', '14. Check the Error message')
+            self._assert_cli_errors(stderr, rule['results'])
 
         self.log('info', '15. remove sysparam3')
         self.execute_cli_remove_cmd(self.test_ms, sysparam3)
@@ -1064,20 +982,20 @@ class Story2327Story5774(GenericTest):
         self.execute_cli_runplan_cmd(self.test_ms)
 
         # Wait for plan to complete
-        self.assertTrue(self.wait_for_plan_state(
-            self.test_ms, test_constants.PLAN_COMPLETE))
+        self.assertTrue(self._wait_for_plan(
+            test_constants.PLAN_COMPLETE))
 
         self.log('info', '18. Check the value of the sysparam1 is updated in')
         # the sysctl.conf file
         updated_key1_val = self._find_keyvalue_in_sysctl_conf(
             test_node1, sysctl_key1)
-        self.assertNotEqual(orig_key1_val, updated_key1_val)
+        self.assertNotEqual(orig_key1_val.value, updated_key1_val.value)
 
         self.log('info', '19. check syaparam1 value is '
                          'updated in memory on the target node')
         updated_memory_value = self._check_memory_values(test_node1,
                                                          sysctl_key1)
-        self.assertEqual(updated_key1_val, updated_memory_value)
+        self.assertEqual(updated_key1_val.value, updated_memory_value)
 
         self.log('info', '20. Check sysparam3 key(3) '
                          'is removed in sysctl.conf')
@@ -1137,19 +1055,13 @@ class Story2327Story5774(GenericTest):
         @tms_execution_type: Automated
         """
         # Find the desired collection on node1
-        collection_type = "collection-of-node-config"
-        n1_config_path = self.find(
-            self.test_ms, "/deployments", collection_type)[0]
-        n1_path = self.find(
-            self.test_ms, "/deployments", "node")[0]
+        n1_config_path = self._get_node_topology(0).configs
 
         # Get node1 filename
-        test_node1 = self.get_node_filename_from_url(
-            self.test_ms, n1_path)
+        test_node1 = self._get_node_topology(0).filename
 
-        # Backup sysctl.conf file to tmp_location
-        self.assertTrue(self.backup_file(
-            test_node1, test_constants.SYSCTL_CONFIG_FILE))
+        # Save sysctl.conf, it is restored when the test ends
+        self._save_sysctl_conf([test_node1])
 
         # Create sysctl keys required for test
         sysctl_key1 = "fs.file-max"
@@ -1158,12 +1070,18 @@ class Story2327Story5774(GenericTest):
         sysctl_key4 = "kernel.pid_max"
 
         self.log('info', '1. Find the sysparam-node-config already on node1')
-        sysparam_node_config = self.find(
-            self.test_ms, "/deployments", "sysparam-node-config")[0]
+        sysparam_node_config = self._get_node_topology(0).sysparam_config
+
+        # Exports are written to, and loaded from, /tmp on the MS, under
+        # names of this process so concurrent tests keep them apart
+        xml_init = self._ms_tmp_file("xml_init_story2327.xml")
+        xml_04a = self._ms_tmp_file("xml_04a_story2327.xml")
+        xml_04b = self._ms_tmp_file("xml_04b_story2327.xml")
+        xml_check = self._ms_tmp_file("xml_check_story2327.xml")
+        xml_fixture = self._ms_tmp_file("xml_sysparams_story2327.xml")
 
         self.log('info', '1. Export the sysparam-node-config')
-        self.execute_cli_export_cmd(
-            self.test_ms, sysparam_node_config, "xml_init_story2327.xml")
+        init_params = self._export_sysparams(sysparam_node_config, xml_init)
 
         try:
             self.log('info', '2. Create system-param')
@@ -1172,32 +1090,38 @@ class Story2327Story5774(GenericTest):
                                                  "sysctltest04", props)
 
             self.log('info', '3. Export the sysparam-node-config')
-            self.execute_cli_export_cmd(
-                self.test_ms, sysparam_node_config, "xml_04a_story2327.xml")
+            params_04a = self._export_sysparams(sysparam_node_config, xml_04a)
+            self._assert_sysparam_diff(init_params, params_04a,
+                                       added=["sysctltest04"])
 
             self.log('info', '4. Load the sysparam-node-config'
                              ' into model using --merge')
             self.execute_cli_load_cmd(
-                self.test_ms, n1_config_path, "xml_04a_story2327.xml",
-                "--merge")
+                self.test_ms, n1_config_path, xml_04a, "--merge")
+            self._assert_sysparam_diff(params_04a, self._export_sysparams(
+                sysparam_node_config, xml_check))
 
             self.log('info', '5. Load the sysparam-node-config'
                              ' into model using --replace')
             self.execute_cli_load_cmd(
-                self.test_ms, n1_config_path, "xml_04a_story2327.xml",
-                "--replace")
+                self.test_ms, n1_config_path, xml_04a, "--replace")
+            self._assert_sysparam_diff(params_04a, self._export_sysparams(
+                sysparam_node_config, xml_check))
 
             self.log('info', '6. Export the system-param')
-            self.execute_cli_export_cmd(
-                self.test_ms, system_param, "xml_04b_story2327.xml")
+            params_04b = self._export_sysparams(system_param, xml_04b)
+            self.assertEqual({"sysctltest04": (sysctl_key1, "798264")},
+                             params_04b)
 
             self.log('info', '7. Remove system-param')
             self.execute_cli_remove_cmd(self.test_ms, system_param)
 
             self.log('info', '8. Load the system-param into the model')
             self.execute_cli_load_cmd(
-                self.test_ms, sysparam_node_config + "/params",
-                "xml_04b_story2327.xml")
+                self.test_ms, sysparam_node_config + "/params", xml_04b)
+            before_merge = self._export_sysparams(sysparam_node_config,
+                                                  xml_check)
+            self._assert_sysparam_diff(params_04a, before_merge)
 
             self.log('info', '9. Copy xml files onto the MS')
             # XML file contains
@@ -1205,21 +1129,27 @@ class Story2327Story5774(GenericTest):
             #       been updated
             #   ==> sysctl param item that is in model and not in file
             #   ==> an additional sysctl param item that is not in model
-            xml_filenames = \
-                ['xml_sysparams_story2327.xml']
             local_filepath = os.path.dirname(__file__)
-            for xml_filename in xml_filenames:
-                local_xml_filepath = local_filepath + "/xml_file/" + \
-                    xml_filename
-                xml_filepath = "/tmp/" + xml_filename
-                self.assertTrue(self.copy_file_to(
-                    self.test_ms, local_xml_filepath, xml_filepath,
-                    root_copy=True))
+            self.assertTrue(self.copy_file_to(
+                self.test_ms,
+                local_filepath + "/xml_file/xml_sysparams_story2327.xml",
+                xml_fixture, root_copy=True))
+
+            fixture_params = index_sysparams(
+                local_filepath + "/xml_file/xml_sysparams_story2327.xml")
 
             self.log('info', '10. Load xml file using the --merge')
             self.execute_cli_load_cmd(
-                self.test_ms, sysparam_node_config,
-                "/tmp/xml_sysparams_story2327.xml", "--merge")
+                self.test_ms, sysparam_node_config, xml_fixture, "--merge")
+            # --merge adds and updates the fixture items, removes nothing
+            self._assert_sysparam_diff(
+                before_merge,
+                self._export_sysparams(sysparam_node_config, xml_check),
+                added=[item_id for item_id in fixture_params
+                       if item_id not in before_merge],
+                updated=[item_id for item_id in fixture_params
+                         if item_id in before_merge and
+                         before_merge[item_id] != fixture_params[item_id]])
 
             self.log('info', '11. Check the created '
                              'sysparam state is "initial"')
@@ -1229,8 +1159,8 @@ class Story2327Story5774(GenericTest):
 
             self.log('info', '12. Load xml file using the --replace')
             self.execute_cli_load_cmd(
-                self.test_ms, sysparam_node_config,
-                "/tmp/xml_sysparams_story2327.xml", "--replace")
+                self.test_ms, sysparam_node_config, xml_fixture,
+                "--replace")
 
             self.log('info', '13. Create plan')
             self.execute_cli_createplan_cmd(self.test_ms)
@@ -1239,12 +1169,16 @@ class Story2327Story5774(GenericTest):
             self.execute_cli_runplan_cmd(self.test_ms)
 
             # Wait for plan to complete
-            self.assertTrue(self.wait_for_plan_state(
-                self.test_ms, test_constants.PLAN_COMPLETE))
+            self.assertTrue(self._wait_for_plan(
+                test_constants.PLAN_COMPLETE))
 
             self.execute_cli_removeplan_cmd(self.test_ms)
             self.log('info', '15. Check state of items in tree')
             self.assertTrue(self.is_all_applied(self.test_ms))
+            # --replace leaves exactly the fixture items in the model
+            self._assert_sysparam_diff(
+                fixture_params,
+                self._export_sysparams(sysparam_node_config, xml_check))
 
             self.log('info', '16. Check all parameters '
                              'in xml file exist in conf file')
@@ -1261,8 +1195,7 @@ class Story2327Story5774(GenericTest):
 
             self.log('info', '17. Load original exported config')
             self.execute_cli_load_cmd(
-                self.test_ms, n1_config_path, "xml_init_story2327.xml",
-                "--replace")
+                self.test_ms, n1_config_path, xml_init, "--replace")
 
             self.log('info', 'Create plan')
             self.execute_cli_createplan_cmd(self.test_ms)
@@ -1271,8 +1204,8 @@ class Story2327Story5774(GenericTest):
             self.execute_cli_runplan_cmd(self.test_ms)
 
             self.log('info', ' Wait for plan to complete')
-            self.assertTrue(self.wait_for_plan_state(
-                self.test_ms, test_constants.PLAN_COMPLETE))
+            self.assertTrue(self._wait_for_plan(
+                test_constants.PLAN_COMPLETE))
 
     @attr('all', 'revert', 'story2327_5774', 'story2327_5774_tc05')
     def test_05_n_update_invalid_parameter_negative(self):
@@ -1306,21 +1239,15 @@ class Story2327Story5774(GenericTest):
         @tms_test_precondition:NA
         @tms_execution_type: Automated
         """
-        n1_path = self.find(
-            self.test_ms, "/deployments", "node")[0]
-
         # Get node1 filename
-        test_node1 = self.get_node_filename_from_url(
-            self.test_ms, n1_path)
+        test_node1 = self._get_node_topology(0).filename
 
-        # Backup sysctl.conf file to tmp_location
-        self.assertTrue(self.backup_file(
-            test_node1, test_constants.SYSCTL_CONFIG_FILE))
+        # Save sysctl.conf, it is restored when the test ends
+        self._save_sysctl_conf([test_node1])
 
         self.log('info', '1. Find the sysparam-node-config '
                          'already on node1')
-        sysparam_node_config = self.find(
-            self.test_ms, "/deployments", "sysparam-node-config")[0]
+        sysparam_node_config = self._get_node_topology(0).sysparam_config
 
         self.log('info', '2. Create system-param with new key')
         sysctl_new_key = "kernel.newkey"
@@ -1335,8 +1262,8 @@ class Story2327Story5774(GenericTest):
         self.execute_cli_runplan_cmd(self.test_ms)
 
         self.log('info', '5. Check the plan should fail')
-        self.assertTrue(self.wait_for_plan_state(
-            self.test_ms, test_constants.PLAN_FAILED))
+        self.assertTrue(self._wait_for_plan(
+            test_constants.PLAN_FAILED))
 
         self.log('info', '6. Check sysctl.con file does not concatins key')
         self._find_keyvalue_in_sysctl_conf(
@@ -1354,7 +1281,6 @@ class Story2327Story5774(GenericTest):
         'results':
         [
          {
-          'index': 0,
           'path': None,
           'msg': 'sysctl: cannot stat /proc/sys/kernel/newkey:'\
                                         ' No such file or directory',
@@ -1375,8 +1301,7 @@ class Story2327Story5774(GenericTest):
             self.assertNotEqual([], stdout)
             self.assertEquals(255, rc)
 
-            for result in rule['results']:
-                self._assert_err_msg_list(stdout, result)
+            self._assert_cli_errors(stdout, rule['results'])
 
         # Create sysctl keys required for test
         sysctl_key = "net.ipv4.conf.default.mc_forwarding"
@@ -1401,8 +1326,8 @@ class Story2327Story5774(GenericTest):
         self.execute_cli_runplan_cmd(self.test_ms)
 
         self.log('info', '12. Check the plan should fail')
-        self.assertTrue(self.wait_for_plan_state(
-            self.test_ms, test_constants.PLAN_FAILED))
+        self.assertTrue(self._wait_for_plan(
+            test_constants.PLAN_FAILED))
 
         self.log('info', '13. Check sysctl.conf file failed to updated value')
         updated_sysctl_key = self._find_values_sysctl(test_node1, sysctl_key)
@@ -1415,7 +1340,7 @@ class Story2327Story5774(GenericTest):
         self.assertEquals([], stderr)
         self.assertFalse([], stdout)
         self.assertEquals(0, rc)
-        self.assertEqual(orig_sysctl_key, stdout[0])
+        self.assertEqual(orig_sysctl_key, split_keyvalue(stdout[0])[1])
 
     @attr('all', 'revert', 'story2327_5774', 'story2327_5774_tc06')
     def test_06_p_create_remove_system_param_with_slash(self):
@@ -1444,10 +1369,9 @@ class Story2327Story5774(GenericTest):
         @tms_execution_type: Automated
         """
 
-        # Find the desired collection on nodes
-        nodes_path = self.find(self.test_ms, "/deployments", "node", True)
-        node1_path = nodes_path[0]
-        test_node1 = self.get_node_filename_from_url(self.test_ms, node1_path)
+        # Find node1 and its sysparam-node-config
+        node1 = self._get_node_topology(0)
+        test_node1 = node1.filename
 
         # Create sysctl keys required for test
         sysctl_key1 = "net/ipv4/ip_forward"
@@ -1456,80 +1380,61 @@ class Story2327Story5774(GenericTest):
         # Create sysctl values required for test
         sysctl_value1 = "599"
 
-        # copy sysctl.conf file to tmp_location
-        local_config_filepath = test_constants.SYSCTL_CONFIG_FILE
-        config_filepath = "/tmp/sysctl"
-        self.assertTrue(self.cp_file_on_node(
-            test_node1, local_config_filepath, config_filepath,
-            su_root=True))
+        # Save sysctl.conf, it is restored when the test ends
+        self._save_sysctl_conf([test_node1])
 
-        try:
-            self.log('info', '1. Find the sysparam-node-config'
-                             ' already on node1')
-            sysparam_node1_config = self.find(
-                self.test_ms, "/deployments", "sysparam-node-config")[0]
-
-            self.log('info', '2.  Create system-param'
-                             ' on node1 with preexisting '
-                             'key(a) in the file')
-            props = 'key="{0}" value="{1}"'.format(sysctl_key1, sysctl_value1)
-            system_param1 = self._create_system_param(
-                sysparam_node1_config, "sysctltest06a", props)
-
-            self.log('info', '3. Create plan')
-            self.execute_cli_createplan_cmd(self.test_ms)
+        self.log('info', '1. Find the sysparam-node-config'
+                         ' already on node1')
+        sysparam_node1_config = node1.sysparam_config
 
-            self.log('info', '4. Run plan')
-            self.execute_cli_runplan_cmd(self.test_ms)
+        self.log('info', '2.  Create system-param'
+                         ' on node1 with preexisting '
+                         'key(a) in the file')
+        props = 'key="{0}" value="{1}"'.format(sysctl_key1, sysctl_value1)
+        system_param1 = self._create_system_param(
+            sysparam_node1_config, "sysctltest06a", props)
 
-            # Wait for plan to complete
-            self.assertTrue(self.wait_for_plan_state(
-                self.test_ms, test_constants.PLAN_COMPLETE))
-
-            self.log('info', '5. Check sysctl.conf file'
-                             ' contains updated preexisting key(a)'
-                             ' to the value on node1')
-            key1_val = self._find_keyvalue_in_sysctl_conf(
-                test_node1, sysctl_key1)
-            self.assertEqual(key1_val, sysctl_key1 + " = " + sysctl_value1)
-
-            self.log('info', '6. Remove the system-param'
-                             ' item-types that have been created'
-                             ' and remove manually updated key(c)')
-            self.execute_cli_remove_cmd(self.test_ms, system_param1)
-
-            self.log('info', '7. Create plan')
-            self.execute_cli_createplan_cmd(self.test_ms)
+        self.log('info', '3. Create plan')
+        self.execute_cli_createplan_cmd(self.test_ms)
 
-            self.log('info', '8. Run plan')
-            self.execute_cli_runplan_cmd(self.test_ms)
+        self.log('info', '4. Run plan')
+        self.execute_cli_runplan_cmd(self.test_ms)
 
-            # Wait for plan to complete
-            self.assertTrue(self.wait_for_plan_state(
-                self.test_ms, test_constants.PLAN_COMPLETE))
+        # Wait for plan to complete
+        self.assertTrue(self._wait_for_plan(
+            test_constants.PLAN_COMPLETE))
 
-            self.log('info', '9.Check the key has been removed'
-                             ' from sysctl.conf file')
-            self._find_keyvalue_in_sysctl_conf(
-                test_node1, sysctl_key1, positive=False)
+        self.log('info', '5. Check sysctl.conf file'
+                         ' contains updated preexisting key(a)'
+                         ' to the value on node1')
+        key1_val = self._find_keyvalue_in_sysctl_conf(
+            test_node1, sysctl_key1)
+        self.assertEqual((sysctl_key1, sysctl_value1),
+                         (key1_val.raw_key, key1_val.value))
 
-            self.log('info', '10.Check the key is not removed from memory')
-            self._check_memory_values(test_node1, sysctl_filekey1)
+        self.log('info', '6. Remove the system-param'
+                         ' item-types that have been created'
+                         ' and remove manually updated key(c)')
+        self.execute_cli_remove_cmd(self.test_ms, system_param1)
 
-        finally:
+        self.log('info', '7. Create plan')
+        self.execute_cli_createplan_cmd(self.test_ms)
 
-            # copy  back sysctl.conf
-            local_config_filepath = test_constants.SYSCTL_CONFIG_FILE
-            config_filepath = "/tmp/sysctl"
-            self.assertTrue(self.cp_file_on_node(
-                test_node1, config_filepath, local_config_filepath,
-                su_root=True))
-
-            # Load the sysctl.conf file on node1
-            cmd = self.redhatutils.get_sysctl_cmd(
-                '-e -p {0}'.format(test_constants.SYSCTL_CONFIG_FILE))
-            stdout, stderr, rc = self.run_command(
-                test_node1, cmd, su_root=True)
-            self.assertEquals([], stderr)
-            self.assertNotEqual([], stdout)
-            self.assertEquals(0, rc)
+        self.log('info', '8. Run plan')
+        self.execute_cli_runplan_cmd(self.test_ms)
+
+        # Wait for plan to complete
+        self.assertTrue(self._wait_for_plan(
+            test_constants.PLAN_COMPLETE))
+
+        self.log('info', '9.Check the key has been removed'
+                         ' from sysctl.conf file')
+        # Only the slash separated line puppet wrote goes; a dotted line
+        # for the same key that was in the file before stays
+        self.assertEqual([], [
+            entry.line for entry in self._get_sysctl_conf_snapshot(
+                test_node1).occurrences(sysctl_key1)
+            if entry.raw_key == sysctl_key1])
+
+        self.log('info', '10.Check the key is not removed from memory')
+        self._check_memory_values(test_node1, sysctl_filekey1)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Fuzzing of the sysparam properties. Generated property sets
+            are all validated locally with sysparam_validator, and a
+            sample of them is created on the MS to check that the MS
+            agrees; disagreements are shrunk to minimal reproducers. Not
+            part of the "all" runs; run it with -a sysparams_fuzz.
+            Tune it with $SYSPARAMS_FUZZ_CASES, $SYSPARAMS_FUZZ_SAMPLE,
+            $SYSPARAMS_FUZZ_BATCH_SIZES and $SYSPARAMS_FUZZ_SEED.
+'''
+
+from redhat_cmd_utils import RHCmdUtils
+from litp_generic_test import GenericTest, attr
+from sysparams_mixin import SysparamsMixin
+from cli_error_utils import parse_cli_errors
+from command_utils import CommandBatch
+from fuzz_utils import generate_cases, shrink
+from sysparam_validator import validate_cli_props
+from collections import Counter
+import itertools
+import os
+import random
+import time
+
+
+class SysparamsFuzz(SysparamsMixin, GenericTest):
+
+    '''
+    Property-based testing of the sysparam item type validation.
+    '''
+
+    LITP_CREATE_CMD = '/usr/bin/litp create -p {0} -t sysparam'
+
+    def setUp(self):
+        """
+        Description:
+            Runs before every single test
+        Actions:
+            1. Call the super class setup method
+            2. Set up variables used in the tests
+        Results:
+            The super class prints out diagnostics and variables
+            common to all tests are available.
+        """
+        super(SysparamsFuzz, self).setUp()
+        self.test_ms = self.get_management_node_filename()
+        self.redhatutils = RHCmdUtils()
+        self.fuzz_cases = int(os.environ.get('SYSPARAMS_FUZZ_CASES', '5000'))
+        self.fuzz_sample = int(os.environ.get('SYSPARAMS_FUZZ_SAMPLE',
+                                              '200'))
+        # Cases created on the MS per round trip, one share of the
+        # sample each, to find the batch size the MS copes with best
+        self.batch_sizes = [
+            int(size) for size in os.environ.get(
+                'SYSPARAMS_FUZZ_BATCH_SIZES', '10,25,50').split(',')]
+        self.fuzz_seed = int(os.environ.get('SYSPARAMS_FUZZ_SEED', '0'))
+        self.max_shrunk = 3
+        self.item_ids = itertools.count()
+
+    def tearDown(self):
+        """
+        Description:
+            Runs after every single test
+        Actions:
+            1. Call the super class teardown method
+        Results:
+            Items used in the test are cleaned up and the
+            super class prints out diagnostics and variables
+        """
+        super(SysparamsFuzz, self).tearDown()
+
+    def _create_cases_on_ms(self, sysparam_config, cases):
+        """
+        Description:
+            Creates a sysparam for each case with one "litp create" each,
+            all run concurrently in a single round trip, then removes the
+            sysparams that were created.
+        Args:
+            sysparam_config (str): sysparam-node-config path
+            cases (list): FuzzCase tuples
+        Returns:
+            list. CommandResult of each case
+        """
+        batch = CommandBatch(parallel=True)
+        for case in cases:
+            cmd = self.LITP_CREATE_CMD.format('{0}/params/fuzz{1}'.format(
+                sysparam_config, next(self.item_ids)))
+            props = case.cli_props()
+            batch.add(cmd + ' -o ' + props if props else cmd)
+        stdout, stderr, rc = self.run_command(self.test_ms, batch.command())
+        self.assertEquals([], stderr)
+        self.assertEquals(0, rc)
+        results = batch.parse(stdout)
+        if any(result.rc == 0 for result in results):
+            self._reset_params_collection(sysparam_config)
+        return results
+
+    @staticmethod
+    def _agrees(expected, result):
+        """
+        Returns True if the MS reported exactly the expected errors.
+        """
+        reported = [error for error in parse_cli_errors(result.stderr)
+                    if error.error_type]
+        return (result.rc == 0) == (not expected) and \
+            Counter(reported) == Counter(parse_cli_errors(expected))
+
+    @attr('fuzz', 'revert', 'sysparams_fuzz', 'sysparams_fuzz_tc01')
+    def test_01_n_fuzz_sysparam_properties(self):
+        """
+        @tms_id: sysparams_fuzz_tc01
+        @tms_requirements_id: LITPCDS-2327
+        @tms_title: Fuzz the sysparam property validation
+        @tms_description: Generate sysparam property sets around the
+            validation boundaries, validate them all locally and check on
+            the MS that a sample is validated the same way
+        @tms_test_steps:
+            @step: Generate the cases and validate them locally
+            @result: The throughput of the local validation is reported
+            @step: Create a sample of the cases on the MS, in batches
+            @result: The MS reports the same errors as the local
+                validation for every case; the throughput of each batch
+                size is reported
+            @step: Shrink the cases the MS disagrees on
+            @result: Minimal reproducers are reported
+        @tms_test_precondition:NA
+        @tms_execution_type: Automated
+        """
+        sysparam_config = self._get_node_topology(0).sysparam_config
+        self._save_params_collection(sysparam_config)
+        throughput = {}
+
+        self.log('info', '1. Generate {0} cases and validate them locally'
+                 .format(self.fuzz_cases))
+        start = time.time()
+        cases = list(generate_cases(self.fuzz_cases, self.fuzz_seed))
+        expected = [validate_cli_props(case.cli_props()) for case in cases]
+        local_secs = max(time.time() - start, 1e-6)
+        throughput['local'] = round(len(cases) / local_secs, 1)
+        self.log('info', '{0} cases validated locally in {1:.2f}s, {2} '
+                 'invalid'.format(len(cases), local_secs,
+                                  sum(1 for errors in expected if errors)))
+
+        self.log('info', '2. Create {0} of the cases on the MS'.format(
+            self.fuzz_sample))
+        sample = random.Random(self.fuzz_seed).sample(
+            range(len(cases)), min(self.fuzz_sample, len(cases)))
+        share = len(sample) // len(self.batch_sizes) or len(sample)
+        failing = []
+        for position, batch_size in enumerate(self.batch_sizes):
+            indexes = sample[position * share:(position + 1) * share]
+            start = time.time()
+            for first in range(0, len(indexes), batch_size):
+                chunk = indexes[first:first + batch_size]
+                results = self._create_cases_on_ms(
+                    sysparam_config, [cases[index] for index in chunk])
+                failing.extend(index for index, result in zip(chunk, results)
+                               if not self._agrees(expected[index], result))
+            if indexes:
+                throughput['batch_{0}'.format(batch_size)] = round(
+                    len(indexes) / max(time.time() - start, 1e-6), 1)
+        self.log('info', 'Cases per second: {0}'.format(throughput))
+
+        self.log('info', '3. Shrink the {0} cases the MS disagrees on'
+                 .format(len(failing)))
+
+        def first_failing(candidates):
+            """
+            Returns the index of the first candidate the MS disagrees on.
+            """
+            results = self._create_cases_on_ms(sysparam_config, candidates)
+            for index, (candidate, result) in enumerate(
+                    zip(candidates, results)):
+                if not self._agrees(
+                        validate_cli_props(candidate.cli_props()), result):
+                    return index
+            return None
+
+        reproducers = []
+        for index in failing[:self.max_shrunk]:
+            case, rounds = shrink(cases[index], first_failing)
+            reproducers.append('{0} (shrunk in {1} rounds from case {2}): '
+                               'expected {3}'.format(
+                                   case.cli_props(), rounds, index,
+                                   validate_cli_props(case.cli_props())))
+
+        self._write_benchmark({'cases': len(cases), 'sample': len(sample),
+                               'disagreements': len(failing),
+                               'cases_per_sec': throughput})
+        self.assertEqual([], reproducers,
+                         '{0} of {1} cases validated differently by the MS, '
+                         'minimal reproducers:\n{2}'.format(
+                             len(failing), len(sample),
+                             '\n'.join(reproducers)))
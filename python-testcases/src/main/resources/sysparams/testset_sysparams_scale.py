@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Benchmarks of the sysparams model at production scale, where a
+            sysparam-node-config holds hundreds of sysparams. They are not
+            part of the "all" runs; run them with -a sysparams_scale.
+            Results are logged and, when $SYSPARAMS_BENCHMARK_FILE is set,
+            added there as JSON under the name of the test.
+'''
+
+from redhat_cmd_utils import RHCmdUtils
+from litp_generic_test import GenericTest, attr
+from sysparams_mixin import SysparamsMixin
+from sysctl_utils import SysctlCheck, in_file
+from sysparam_xml_utils import UNKNOWN, generate_duplicate_sysparams, \
+    generate_sysparams
+from sysparam_validator import validate_plan_params
+from timing_utils import scaling_exponents, text_plot
+import os
+import test_constants
+import time
+
+
+class SysparamsScale(SysparamsMixin, GenericTest):
+
+    '''
+    Benchmarks of creating and applying large numbers of sysparams.
+    '''
+
+    def setUp(self):
+        """
+        Description:
+            Runs before every single test
+        Actions:
+            1. Call the super class setup method
+            2. Set up variables used in the tests
+        Results:
+            The super class prints out diagnostics and variables
+            common to all tests are available.
+        """
+        super(SysparamsScale, self).setUp()
+        self.test_ms = self.get_management_node_filename()
+        self.redhatutils = RHCmdUtils()
+        # Numbers of sysparams to benchmark, e.g. "10,100,1000"
+        self.batch_sizes = [
+            int(size) for size in os.environ.get(
+                'SYSPARAMS_BENCHMARK_SIZES', '10,100,1000').split(',')]
+        # Numbers of sysparams per node and of nodes for the scaling curve
+        self.scale_sizes = [
+            int(size) for size in os.environ.get(
+                'SYSPARAMS_SCALE_KEYS', '10,100,500').split(',')]
+        self.scale_nodes = int(os.environ.get('SYSPARAMS_SCALE_NODES', '0'))
+        # Numbers of sysparams in the config and share of them with a
+        # duplicate key for the duplicate key validation benchmark
+        self.duplicate_sizes = [
+            int(size) for size in os.environ.get(
+                'SYSPARAMS_DUPLICATE_SIZES', '100,1000,5000').split(',')]
+        self.duplicate_ratio = float(os.environ.get(
+            'SYSPARAMS_DUPLICATE_RATIO', '0.1'))
+        self.benchmark_results = []
+        self.scaling = {}
+
+    def tearDown(self):
+        """
+        Description:
+            Runs after every single test
+        Actions:
+            1. Write the benchmark results
+            2. Call the super class teardown method
+        Results:
+            Items used in the test are cleaned up and the
+            super class prints out diagnostics and variables
+        """
+        if self.benchmark_results:
+            self._write_benchmark({'results': self.benchmark_results,
+                                   'scaling': self.scaling})
+        super(SysparamsScale, self).tearDown()
+
+    def _get_sysparam_config(self, node):
+        """
+        Description:
+            Returns the sysparam-node-config of a node the benchmark
+            creates its sysparams in.
+        Args:
+            node (NodeTopology): the node
+        Returns:
+            str. Path of the sysparam-node-config
+        """
+        self.assertNotEqual(None, node.sysparam_config,
+                            'No sysparam-node-config on {0}'.format(
+                                node.filename))
+        return node.sysparam_config
+
+    @attr('scale', 'revert', 'sysparams_scale', 'sysparams_scale_tc01')
+    def test_01_p_batch_create_benchmark(self):
+        """
+        @tms_id: sysparams_scale_tc01
+        @tms_requirements_id: LITPCDS-2327
+        @tms_title: Benchmark batched sysparam creation
+        @tms_description: Compare creating 10, 100 and 1000 sysparams with
+            one "litp create" each against a single "litp load --merge"
+        @tms_test_steps:
+            @step: Create N sysparams, one litp create each
+            @result: The sysparams are created in the time reported
+            @step: Create N sysparams with one litp load --merge
+            @result: The sysparams are created in the time reported
+        @tms_test_precondition:NA
+        @tms_execution_type: Automated
+        """
+        sysparam_config = self._get_sysparam_config(
+            self._get_node_topology(0))
+        self._save_params_collection(sysparam_config)
+
+        for size in self.batch_sizes:
+            # Unknown keys are unique, and never reach a node here
+            params = list(generate_sysparams(size, {UNKNOWN: 1},
+                                             prefix='bench'))
+
+            self.log('info', '1. Create {0} sysparams, one litp create each'
+                     .format(size))
+            start = time.time()
+            for item_id, props in params:
+                self.execute_cli_create_cmd(
+                    self.test_ms,
+                    '{0}/params/{1}'.format(sysparam_config, item_id),
+                    'sysparam', 'key="{key}" value="{value}"'.format(**props),
+                    add_to_cleanup=False)
+            per_item_secs = time.time() - start
+            self._reset_params_collection(sysparam_config)
+
+            self.log('info', '2. Create {0} sysparams with one litp load'
+                     .format(size))
+            start = time.time()
+            paths = self._create_system_params(sysparam_config, params)
+            batch_secs = time.time() - start
+            self.assertEqual('Initial', self.execute_show_data_cmd(
+                self.test_ms, paths[-1], 'state'))
+            self._reset_params_collection(sysparam_config)
+
+            self.benchmark_results.append({
+                'items': size,
+                'per_item_secs': round(per_item_secs, 3),
+                'batch_secs': round(batch_secs, 3),
+                'speedup': round(per_item_secs / max(batch_secs, 1e-6), 1)})
+            self.log('info', 'Creating {0} sysparams: {1:.1f}s one by one, '
+                     '{2:.1f}s batched'.format(size, per_item_secs,
+                                               batch_secs))
+
+    @attr('scale', 'revert', 'sysparams_scale', 'sysparams_scale_tc02')
+    def test_02_p_plan_scaling_benchmark(self):
+        """
+        @tms_id: sysparams_scale_tc02
+        @tms_requirements_id: LITPCDS-2327
+        @tms_title: Scaling curve of sysparam plans
+        @tms_description: Load N sysparams on each of M nodes and time the
+            load, create_plan, run_plan and puppet convergence for
+            growing N, to catch superlinear growth in the plugin
+        @tms_test_steps:
+            @step: Load N sysparams per node, set to their current kernel
+                values
+            @result: The sysparams are loaded in the time reported
+            @step: Create and run the plan
+            @result: The plan succeeds in the time reported
+            @step: Run puppet and check sysctl.conf on every node
+            @result: Every key is in sysctl.conf
+            @step: Remove the sysparams and run the plan
+            @result: The plan succeeds in the time reported
+        @tms_test_precondition:NA
+        @tms_execution_type: Automated
+        """
+        # Only the nodes of the slot, other tests may be using the rest
+        topology = self._get_slot()
+        if self.scale_nodes:
+            topology = topology[:self.scale_nodes]
+        nodes = [node.filename for node in topology]
+        self._save_sysctl_conf(nodes)
+
+        # Real keys at their current values, so the plans change nothing
+        keys = self._find_settable_sysctl_keys(nodes, max(self.scale_sizes))
+        for node in topology:
+            self._save_params_collection(self._get_sysparam_config(node))
+
+        for size in sorted(self.scale_sizes):
+            size = min([size] + [len(keys[node]) for node in nodes])
+            if any(result['keys'] == size
+                   for result in self.benchmark_results):
+                self.log('info', 'Only {0} settable keys, skipping larger '
+                         'sizes'.format(size))
+                break
+            timings = {'keys': size, 'nodes': len(nodes)}
+
+            self.log('info', '1. Load {0} sysparams on each of {1} nodes'
+                     .format(size, len(nodes)))
+            start = time.time()
+            for node in topology:
+                node_keys = list(keys[node.filename].items())[:size]
+                self._create_system_params(
+                    node.sysparam_config,
+                    [('scale_{0}'.format(index),
+                      {'key': key, 'value': value})
+                     for index, (key, value) in enumerate(node_keys)])
+            timings['load'] = time.time() - start
+
+            self.log('info', '2. Create plan')
+            start = time.time()
+            self.execute_cli_createplan_cmd(self.test_ms)
+            timings['create_plan'] = time.time() - start
+
+            self.log('info', '3. Run plan')
+            start = time.time()
+            self.execute_cli_runplan_cmd(self.test_ms)
+            self.assertTrue(self._wait_for_plan(test_constants.PLAN_COMPLETE))
+            timings['run_plan'] = time.time() - start
+
+            self.log('info', '4. Run puppet and check sysctl.conf on '
+                             'every node')
+            start = time.time()
+            for node in nodes:
+                last_key, last_value = list(keys[node].items())[size - 1]
+                self.assertNotEqual(None,
+                                    self._wait_for_sysctl_conf_convergence(
+                                        node, last_key, last_value))
+            self._assert_sysctl_checks([
+                SysctlCheck(node, key, in_file(value))
+                for node in nodes
+                for key, value in list(keys[node].items())[:size]])
+            timings['puppet'] = time.time() - start
+
+            self.log('info', '5. Remove the sysparams and run the plan')
+            start = time.time()
+            for node in topology:
+                self._reset_params_collection(node.sysparam_config)
+            self.execute_cli_createplan_cmd(self.test_ms)
+            self.execute_cli_runplan_cmd(self.test_ms)
+            self.assertTrue(self._wait_for_plan(test_constants.PLAN_COMPLETE))
+            timings['remove'] = time.time() - start
+
+            self.benchmark_results.append(dict(
+                (name, round(value, 3) if isinstance(value, float) else value)
+                for name, value in timings.items()))
+
+        for phase in ('load', 'create_plan', 'run_plan', 'puppet', 'remove'):
+            exponents = scaling_exponents([
+                (result['keys'], result[phase])
+                for result in self.benchmark_results])
+            self.scaling[phase] = exponents
+            self.log('info', 'Scaling of {0} with keys per node: {1}'.format(
+                phase, ', '.join('{0} keys ~n^{1}'.format(size, exponent)
+                                 for size, exponent in exponents)))
+            if any(exponent is not None and exponent > 1.5
+                   for _, exponent in exponents):
+                self.log('warning', '{0} grows faster than linearly with '
+                                    'the number of sysparams'.format(phase))
+
+    @attr('scale', 'revert', 'sysparams_scale', 'sysparams_scale_tc03')
+    def test_03_n_duplicate_key_validation_benchmark(self):
+        """
+        @tms_id: sysparams_scale_tc03
+        @tms_requirements_id: LITPCDS-2327
+        @tms_title: Benchmark the duplicate key validation of create_plan
+        @tms_description: Load sysparam-node-configs of growing size where
+            a fixed share of the sysparams have a duplicate key, and time
+            the create_plan that fails on them
+        @tms_test_steps:
+            @step: Load N sysparams, a share of them with duplicate keys
+            @result: The sysparams are loaded
+            @step: Create plan
+            @result: create_plan fails in the time reported, with a
+                duplicate key error on every sysparam with a duplicate key
+                and on no other
+            @step: Remove the sysparams
+            @result: The sysparams are removed
+        @tms_test_precondition:NA
+        @tms_execution_type: Automated
+        """
+        sysparam_config = self._get_sysparam_config(
+            self._get_node_topology(0))
+        self._save_params_collection(sysparam_config)
+
+        for size in sorted(self.duplicate_sizes):
+            params = list(generate_duplicate_sysparams(
+                size, self.duplicate_ratio, prefix='dup{0}'.format(size)))
+
+            self.log('info', '1. Load {0} sysparams, {1:.0%} with duplicate '
+                     'keys'.format(size, self.duplicate_ratio))
+            paths = self._create_system_params(sysparam_config, params)
+            start = time.time()
+            expected = validate_plan_params(
+                (path, props['key'], None)
+                for path, (_, props) in zip(paths, params))
+            local_secs = time.time() - start
+            # Error lines alternate between a path and its message
+            expected = [{'path': path, 'msg': msg}
+                        for path, msg in zip(expected[::2], expected[1::2])]
+
+            self.log('info', '2. Create plan')
+            start = time.time()
+            _, stderr, _ = self.execute_cli_createplan_cmd(
+                self.test_ms, expect_positive=False)
+            create_plan_secs = time.time() - start
+            errors = self._assert_cli_errors(stderr, expected)
+            self.assertEqual(
+                sorted(result['path'] for result in expected),
+                sorted(path for path in errors.paths('ValidationError')
+                       if path.startswith(sysparam_config + '/')),
+                'Duplicate key errors on sysparams without duplicate keys')
+
+            self.log('info', '3. Remove the sysparams')
+            self._reset_params_collection(sysparam_config)
+
+            self.benchmark_results.append({
+                'items': size,
+                'duplicates': len(expected),
+                'create_plan_secs': round(create_plan_secs, 3),
+                'local_secs': round(local_secs, 3)})
+            self.log('info', '{0} sysparams, {1} duplicates: create_plan '
+                     'failed in {2:.1f}s'.format(size, len(expected),
+                                                 create_plan_secs))
+
+        points = [(result['items'], result['create_plan_secs'])
+                  for result in self.benchmark_results]
+        self.scaling['create_plan'] = scaling_exponents(points)
+        self.log('info', 'create_plan latency by number of sysparams:\n' +
+                 '\n'.join(text_plot(points)))
+        if any(exponent is not None and exponent > 1.5
+               for _, exponent in self.scaling['create_plan']):
+            self.log('warning', 'Duplicate key validation grows faster than '
+                                'linearly with the number of sysparams')
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Sysparam scenarios written as JSON specs in scenarios/, see
+            scenario_utils. Each spec becomes a test method named after
+            it; the scenarios of a spec share their plans, the sysctl.conf
+            snapshots of the nodes and the parallel checks of each plan.
+            Agile: STORY LITPCDS-2327 and LITPCDS-5774
+'''
+
+from redhat_cmd_utils import RHCmdUtils
+from litp_generic_test import GenericTest, attr
+from sysparams_mixin import SysparamsMixin
+from coalesce_utils import PlanCoalescer
+from scenario_utils import add_spec_steps, load_specs, spec_attrs, \
+    spec_docstring, spec_nodes
+import os
+
+SCENARIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'scenarios')
+
+
+class SysparamsScenarios(SysparamsMixin, GenericTest):
+
+    '''
+    Declarative sysparam scenarios, one test per spec.
+    '''
+
+    def setUp(self):
+        """
+        Description:
+            Runs before every single test
+        Actions:
+            1. Call the super class setup method
+            2. Set up variables used in the tests
+        Results:
+            The super class prints out diagnostics and variables
+            common to all tests are available.
+        """
+        super(SysparamsScenarios, self).setUp()
+        self.test_ms = self.get_management_node_filename()
+        self.redhatutils = RHCmdUtils()
+
+    def tearDown(self):
+        """
+        Description:
+            Runs after every single test
+        Actions:
+            1. Call the super class teardown method
+        Results:
+            Items used in the test are cleaned up and the
+            super class prints out diagnostics and variables
+        """
+        super(SysparamsScenarios, self).tearDown()
+
+    def _run_spec(self, spec):
+        """
+        Description:
+            Runs the scenarios of a spec with shared plans and checks them.
+        Args:
+            spec (dict): the spec, see scenario_utils
+        """
+        nodes = [self._get_node_topology(index).filename
+                 for index in spec_nodes(spec)]
+        # Save sysctl.conf, it is restored when the test ends; the
+        # snapshots taken also give the "@before" values
+        self._save_sysctl_conf(nodes)
+
+        coalescer = PlanCoalescer()
+        add_spec_steps(
+            coalescer, spec, self._get_node_topology,
+            lambda node, key: self._get_sysctl_conf_snapshot(node)
+            .get_value(key))
+        plans = self._run_coalesced(coalescer)
+        if 'plans' in spec:
+            self.assertEqual(spec['plans'], plans)
+
+
+def _spec_test(spec):
+    """
+    Returns the test method of a spec.
+    """
+    def test(self):
+        self._run_spec(spec)
+    test.__name__ = str('test_' + spec['name'])
+    test.__doc__ = spec_docstring(spec)
+    return attr(*spec_attrs(spec))(test)
+
+
+for _spec in load_specs(SCENARIO_DIR):
+    setattr(SysparamsScenarios, str('test_' + _spec['name']),
+            _spec_test(_spec))
@@ -0,0 +1,378 @@
+#!/usr/bin/env python
+
+'''
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     Oct 2026
+@summary:   Waiting and timing helpers for the sysparams testsets.
+'''
+
+import json
+import math
+import re
+import threading
+import time
+
+
+class Backoff(object):
+    """
+    Adaptive delay between two polls. The delay grows while nothing
+    changes and drops back to the initial delay when progress is seen.
+    """
+
+    def __init__(self, initial=0.25, factor=1.5, maximum=5.0):
+        """
+        Args:
+            initial (float): first delay in seconds
+            factor (float): growth of the delay after each idle poll
+            maximum (float): upper bound of the delay in seconds
+        """
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+        self.delay = initial
+
+    def next_delay(self):
+        """
+        Returns the delay to sleep before the next poll and grows it.
+        """
+        delay = self.delay
+        self.delay = min(self.delay * self.factor, self.maximum)
+        return delay
+
+    def reset(self):
+        """
+        Drops the delay back to the initial delay.
+        """
+        self.delay = self.initial
+
+
+class WaitMetrics(object):
+    """
+    Accumulates the time spent idle waiting, by kind of wait, across the
+    tests of a session.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.totals = {}
+        self.counts = {}
+
+    def record(self, kind, seconds):
+        """
+        Description:
+            Records one wait.
+        Args:
+            kind (str): what was waited on, e.g. "plan"
+            seconds (float): time spent waiting
+        """
+        with self._lock:
+            self.totals[kind] = self.totals.get(kind, 0.0) + seconds
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+
+    def summary(self):
+        """
+        Returns the totals as a dict of kind -> {"waits", "seconds"}.
+        """
+        with self._lock:
+            return dict((kind, {'waits': self.counts[kind],
+                                'seconds': round(self.totals[kind], 3)})
+                        for kind in self.totals)
+
+    def dump(self, path):
+        """
+        Writes the summary to path as JSON.
+        """
+        with open(path, 'w') as metrics_file:
+            json.dump(self.summary(), metrics_file, indent=2,
+                      sort_keys=True)
+
+
+def wait_until(poll, timeout_secs, backoff=None):
+    """
+    Description:
+        Polls until poll() reports it is done or timeout_secs elapse.
+    Args:
+        poll (callable): returns a (done, progressed) tuple; progressed
+            resets the backoff
+        timeout_secs (float): how long to wait for
+        backoff (Backoff): delays between polls, the default if None
+    Returns:
+        tuple. (done, seconds waited)
+    """
+    backoff = backoff or Backoff()
+    start = time.time()
+    while True:
+        done, progressed = poll()
+        waited = time.time() - start
+        if done or waited >= timeout_secs:
+            return done, waited
+        if progressed:
+            backoff.reset()
+        time.sleep(min(backoff.next_delay(), timeout_secs - waited))
+
+
+def scaling_exponents(points):
+    """
+    Description:
+        Estimates how a duration grows with size between consecutive
+        measurements: about 1 for linear growth, 2 for quadratic.
+    Args:
+        points (list): (size, seconds) tuples
+    Returns:
+        list. (size, exponent) tuples, one per point after the first;
+        the exponent is None when a duration is too small to tell
+    """
+    points = sorted(points)
+    exponents = []
+    for (size1, secs1), (size2, secs2) in zip(points, points[1:]):
+        if size1 <= 0 or size2 <= size1 or min(secs1, secs2) < 0.001:
+            exponents.append((size2, None))
+        else:
+            exponents.append((size2, round(
+                math.log(secs2 / secs1) / math.log(float(size2) / size1),
+                2)))
+    return exponents
+
+
+def text_plot(points, width=50, unit='s'):
+    """
+    Description:
+        Draws measurements as a horizontal bar chart, for the logs.
+    Args:
+        points (list): (size, value) tuples
+        width (int): characters of the longest bar
+        unit (str): unit printed after each value
+    Returns:
+        list. One line per point, smallest size first
+    """
+    points = sorted(points)
+    top = max([value for _, value in points] + [1e-9])
+    label = max([len(str(size)) for size, _ in points] + [1])
+    return ['{0} |{1} {2:.3f}{3}'.format(
+        str(size).rjust(label), '#' * int(round(width * value / top)),
+        value, unit) for size, value in points]
+
+
+class StepProfiler(object):
+    """
+    Splits a test into the numbered steps it logs, e.g. "8. Create plan",
+    or "10-14. Check ..." for steps checked together, and records for
+    each step its wall time, the number of commands sent to the MS or
+    nodes, and the time spent waiting on plans and puppet.
+    """
+
+    STEP_RE = re.compile(r'^\s*(\d+[a-z]?(?:-\d+[a-z]?)?)\.\s*(\D.*)$',
+                         re.S)
+
+    def __init__(self, test_name):
+        """
+        Args:
+            test_name (str): name of the test being profiled
+        """
+        self.test_name = test_name
+        self._lock = threading.Lock()
+        self._origin = time.time()
+        self.steps = []
+        self._open('setup', 'before the first step')
+
+    def _open(self, step, label):
+        """
+        Closes the current step and starts a new one.
+        """
+        now = time.time()
+        if self.steps and self.steps[-1]['seconds'] is None:
+            self.steps[-1]['seconds'] = round(
+                now - self._origin - self.steps[-1]['start'], 3)
+        self.steps.append({'step': step, 'label': label,
+                           'start': round(now - self._origin, 3),
+                           'seconds': None, 'round_trips': 0, 'waits': {}})
+
+    def observe(self, msg):
+        """
+        Description:
+            Starts a new step if msg is a numbered step message.
+        Args:
+            msg (str): message the test logged
+        """
+        match = self.STEP_RE.match(msg)
+        if match:
+            self.start_step(match.group(1), ' '.join(match.group(2).split()))
+
+    def start_step(self, step, label):
+        """
+        Description:
+            Closes the current step and starts a new one.
+        Args:
+            step (str): step number or name
+            label (str): what the step does
+        """
+        with self._lock:
+            self._open(step, label)
+
+    def count_round_trip(self):
+        """
+        Counts one command sent to the MS or a node in the current step.
+        """
+        with self._lock:
+            self.steps[-1]['round_trips'] += 1
+
+    def record_wait(self, kind, seconds):
+        """
+        Description:
+            Records time the current step spent waiting.
+        Args:
+            kind (str): what was waited on, e.g. "plan"
+            seconds (float): time spent waiting
+        """
+        with self._lock:
+            waits = self.steps[-1]['waits']
+            waits[kind] = round(waits.get(kind, 0.0) + seconds, 3)
+
+    def finish(self):
+        """
+        Closes the last step. Returns the timeline.
+        """
+        with self._lock:
+            if self.steps[-1]['seconds'] is None:
+                self.steps[-1]['seconds'] = round(
+                    time.time() - self._origin - self.steps[-1]['start'], 3)
+            return self.timeline()
+
+    def timeline(self):
+        """
+        Returns the closed steps as a list of dicts.
+        """
+        return [dict(step) for step in self.steps
+                if step['seconds'] is not None]
+
+    def slowest(self, count=3):
+        """
+        Returns the count closed steps that took longest.
+        """
+        return sorted(self.timeline(), key=lambda step: step['seconds'],
+                      reverse=True)[:count]
+
+    def folded(self):
+        """
+        Description:
+            Renders the timeline in the folded stack format read by
+            flamegraph.pl and speedscope: one "frame;frame milliseconds"
+            line per step, with waits as child frames of their step.
+        Returns:
+            list. The folded lines
+        """
+        lines = []
+        for step in self.timeline():
+            # Only the last space separates the count, ";" separates frames
+            frame = '{0};{1}. {2}'.format(
+                self.test_name, step['step'],
+                step['label'].replace(';', ','))
+            waited = 0.0
+            for kind, seconds in sorted(step['waits'].items()):
+                waited += seconds
+                lines.append('{0};wait_{1} {2}'.format(
+                    frame, kind, int(seconds * 1000)))
+            lines.append('{0} {1}'.format(
+                frame, int(max(step['seconds'] - waited, 0) * 1000)))
+        return lines
+
+    def dump(self, directory):
+        """
+        Writes <test name>.json and <test name>.folded to directory.
+        """
+        base = '{0}/{1}'.format(directory, self.test_name)
+        with open(base + '.json', 'w') as json_file:
+            json.dump({'test': self.test_name, 'steps': self.timeline()},
+                      json_file, indent=2, sort_keys=True)
+        with open(base + '.folded', 'w') as folded_file:
+            folded_file.write(''.join(line + '\n' for line in self.folded()))
+
+
+class RemoteCallStats(object):
+    """
+    Latency of the commands run on the MS and nodes, by node and by
+    command, so that the cost of a round trip, and of the su to root it
+    may include, can be compared before and after a change.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = []
+
+    @staticmethod
+    def command_name(cmd, su_root=False):
+        """
+        Description:
+            Names a command after its program, e.g. "md5sum" for
+            "/usr/bin/md5sum /etc/sysctl.conf", with "+su" added when it
+            is run as root.
+        Args:
+            cmd (str): command line
+            su_root (bool): whether the command was run through su
+        Returns:
+            str. The name
+        """
+        words = cmd.split()
+        name = words[0].rsplit('/', 1)[-1] if words else ''
+        return name + '+su' if su_root else name
+
+    def record(self, node, cmd, seconds, su_root=False):
+        """
+        Description:
+            Records one command.
+        Args:
+            node (str): node filename the command ran on
+            cmd (str): command line
+            seconds (float): time until its output was back
+            su_root (bool): whether the command was run through su
+        """
+        with self._lock:
+            self.calls.append((node, self.command_name(cmd, su_root),
+                               seconds))
+
+    @staticmethod
+    def _stats(latencies):
+        """
+        Returns the count, total, mean and 95th percentile of latencies.
+        """
+        latencies = sorted(latencies)
+        total = sum(latencies)
+        return {'calls': len(latencies),
+                'seconds': round(total, 3),
+                'mean_ms': round(1000 * total / len(latencies), 1),
+                'p95_ms': round(1000 * latencies[
+                    int(math.ceil(0.95 * len(latencies))) - 1], 1)}
+
+    def summary(self):
+        """
+        Returns the overall, per node and per command statistics, each a
+        dict of "calls", "seconds", "mean_ms" and "p95_ms".
+        """
+        with self._lock:
+            calls = list(self.calls)
+        if not calls:
+            return {}
+        by_node, by_command = {}, {}
+        for node, name, seconds in calls:
+            by_node.setdefault(node, []).append(seconds)
+            by_command.setdefault(name, []).append(seconds)
+        summary = self._stats([seconds for _, _, seconds in calls])
+        summary['by_node'] = dict((node, self._stats(latencies))
+                                  for node, latencies in by_node.items())
+        summary['by_command'] = dict((name, self._stats(latencies))
+                                     for name, latencies in
+                                     by_command.items())
+        return summary
+
+    def dump(self, path):
+        """
+        Writes the summary to path as JSON.
+        """
+        with open(path, 'w') as stats_file:
+            json.dump(self.summary(), stats_file, indent=2, sort_keys=True)